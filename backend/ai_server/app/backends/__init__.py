@@ -0,0 +1,20 @@
+from app.backends.base import InferenceBackend
+from common.core.config import settings
+
+
+def create_backend(kind: str = None) -> InferenceBackend:
+    """settings.INFERENCE_BACKEND 에 따라 추론 백엔드 생성 (hf / openai)"""
+    kind = (kind or settings.INFERENCE_BACKEND).lower()
+    if kind == "hf":
+        # torch/transformers 는 hf 백엔드에서만 필요
+        from app.backends.hf import HFBackend
+
+        return HFBackend()
+    if kind == "openai":
+        from app.backends.openai_compat import OpenAICompatibleBackend
+
+        return OpenAICompatibleBackend()
+    raise ValueError(f"알 수 없는 INFERENCE_BACKEND: {kind}")
+
+
+__all__ = ["InferenceBackend", "create_backend"]
@@ -0,0 +1,60 @@
+"""
+사용법 참고:
+
+InferenceBackend 는 LLMEngine 이 모델 호출에 사용하는 인터페이스다.
+프롬프트 구성/결과 파싱/청킹은 LLMEngine 이 담당하고, 백엔드는 토큰화·생성·임베딩만 담당한다.
+
+구현체
+    HFBackend               : 현재 프로세스에서 transformers 모델 실행 (hf)
+    OpenAICompatibleBackend : vLLM/TGI 등 OpenAI 호환 서버에 HTTP 요청 (openai)
+선택은 settings.INFERENCE_BACKEND 로 한다 (app.backends.create_backend).
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Optional
+
+
+class InferenceBackend(ABC):
+    """LLM 추론 백엔드 인터페이스"""
+
+    name: str = ""
+    model_name: str = ""
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """모델 토크나이저 기준 토큰 수"""
+
+    @abstractmethod
+    async def generate_batch(
+        self, prefix: str, suffixes: list[str], max_new_tokens: int
+    ) -> list[str]:
+        """prefix + suffix 프롬프트 여러 개를 greedy 생성 (새로 생성된 텍스트만, 입력 순서 유지)"""
+
+    @abstractmethod
+    async def generate_json(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> tuple[str, int]:
+        """JSON 생성 - (새로 생성된 텍스트, 생성 토큰 수)"""
+
+    @abstractmethod
+    def stream(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool = False,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """생성 텍스트를 조각 단위로 스트리밍 (constrained 면 JSON 제약 디코딩)"""
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """텍스트 임베딩"""
+
+    async def close(self):
+        """연결/리소스 정리"""
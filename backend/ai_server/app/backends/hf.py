@@ -0,0 +1,232 @@
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import torch
+from sentence_transformers import SentenceTransformer
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    LogitsProcessorList,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextStreamer,
+)
+
+from app.backends.base import InferenceBackend
+from app.inference_executor import CancelToken, InferenceExecutor, current_token
+from app.json_constraint import JsonLogitsProcessor
+from app.prefix_cache import PrefixCache
+from common.core.config import settings
+
+
+class AsyncTextStreamer(TextStreamer):
+    """
+    TextIteratorStreamer 의 asyncio 버전
+    생성 스레드에서 확정된 텍스트 조각을 이벤트 루프의 asyncio.Queue 로 넘긴다.
+    """
+
+    def __init__(self, tokenizer, loop: asyncio.AbstractEventLoop):
+        super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    def on_finalized_text(self, text: str, stream_end: bool = False):
+        if text:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, text)
+
+
+class CancelStoppingCriteria(StoppingCriteria):
+    """매 생성 스텝마다 CancelToken 확인 - 취소/마감 시각 초과 시 배치 전체 생성 중단"""
+
+    def __init__(self, token: CancelToken):
+        self.token = token
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full(
+            (input_ids.shape[0],), self.token.should_stop(), dtype=torch.bool, device=input_ids.device
+        )
+
+
+class HFBackend(InferenceBackend):
+    """현재 프로세스에서 transformers 모델을 실행하는 백엔드"""
+
+    name = "hf"
+
+    def __init__(self):
+        self.model_name = settings.LLM_MODEL_NAME
+        print(f"{settings.LLM_MODEL_NAME} 모델 로딩 중")
+        self.tokenizer = AutoTokenizer.from_pretrained(settings.LLM_MODEL_NAME)
+        # 배치 생성은 왼쪽 패딩 (프롬프트 끝이 정렬되어야 이어서 생성됨)
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model = AutoModelForCausalLM.from_pretrained(
+            settings.LLM_MODEL_NAME,
+            device_map="auto",
+            torch_dtype=torch.float16 if torch.cuda.is_available() else torch.float32,
+            load_in_8bit=settings.LLM_LOAD_IN_8BIT,
+            attn_implementation="eager",
+        )
+        print(f"{settings.LLM_MODEL_NAME} 로드 완료")
+
+        print("임베딩 모델 로딩 중")
+        self.embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
+        print("임베딩 모델 로드 완료")
+
+        # 고정 지시문의 KV cache 재사용 (prefix 등록은 LLMEngine 에서)
+        self.prefix_cache = PrefixCache(
+            self.model,
+            self.tokenizer,
+            max_bytes=settings.PREFIX_CACHE_MAX_MB * 1024 * 1024,
+            min_free_ratio=settings.PREFIX_CACHE_MIN_FREE_RATIO,
+        )
+
+        # 추론 전용 스레드 풀 (대기열 한도 + 호출별 마감 시각)
+        self._executor = InferenceExecutor()
+
+    def register_prefix(self, name: str, prefix: str):
+        if settings.PREFIX_CACHE_ENABLED:
+            self.prefix_cache.register(name, prefix)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer.encode(text, add_special_tokens=False))
+
+    async def _run(self, func, *args):
+        # CPU/GPU-bound 작업을 추론 전용 스레드 풀에서 실행
+        return await self._executor.run(func, *args)
+
+    @staticmethod
+    def _stopping_criteria() -> tuple[Optional[CancelToken], StoppingCriteriaList]:
+        token = current_token()
+        criteria = StoppingCriteriaList()
+        if token is not None:
+            criteria.append(CancelStoppingCriteria(token))
+        return token, criteria
+
+    @staticmethod
+    def _raise_if_stopped(token: Optional[CancelToken]):
+        """생성이 취소/만료로 멈췄으면 GPU 캐시를 비우고 예외 (부분 결과는 버림)"""
+        if token is None or not token.should_stop():
+            return
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        token.raise_if_stopped()
+
+    # ------------------------------------------------------------------
+    async def generate_batch(
+        self, prefix: str, suffixes: list[str], max_new_tokens: int
+    ) -> list[str]:
+        return await self._run(self._generate_batch, prefix, suffixes, max_new_tokens)
+
+    def _generate_batch(self, prefix: str, suffixes: list[str], max_new_tokens: int) -> list[str]:
+        """
+        배치 greedy 생성 후 새로 생성된 부분만 디코딩
+        단건이면 prefix KV cache 를 사용하고, 여러 건이면 왼쪽 패딩 배치로 생성한다.
+        """
+        if len(suffixes) == 1:
+            inputs = self.prefix_cache.build_inputs(prefix, suffixes[0])
+        else:
+            inputs = self.tokenizer(
+                [prefix + suffix for suffix in suffixes], return_tensors="pt", padding=True
+            ).to(self.model.device)
+
+        token, stopping_criteria = self._stopping_criteria()
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=self.tokenizer.pad_token_id,
+                stopping_criteria=stopping_criteria,
+            )
+        self._raise_if_stopped(token)
+        new_tokens = outputs[:, inputs["input_ids"].shape[1]:]
+        return self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+
+    # ------------------------------------------------------------------
+    async def generate_json(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> tuple[str, int]:
+        return await self._run(self._generate_json, prefix, suffix, max_tokens, constrained, schema)
+
+    def _generate_json(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool,
+        schema: Optional[dict[str, Any]],
+        streamer: Optional[TextStreamer] = None,
+    ) -> tuple[str, int]:
+        """생성 후 (새로 생성된 텍스트, 새 토큰 수) 반환 (streamer 가 있으면 생성 중 조각 전달)"""
+        # 토큰화 (고정 지시문은 prefix KV cache 재사용)
+        inputs = self.prefix_cache.build_inputs(prefix, suffix)
+        prompt_length = inputs["input_ids"].shape[1]
+        logits_processor = LogitsProcessorList()
+        if constrained:
+            logits_processor.append(
+                JsonLogitsProcessor(self.tokenizer, prompt_length, schema=schema)
+            )
+
+        token, stopping_criteria = self._stopping_criteria()
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_tokens,
+                temperature=0.1,
+                top_p=0.9,
+                do_sample=True,
+                pad_token_id=self.tokenizer.eos_token_id,
+                logits_processor=logits_processor,
+                streamer=streamer,
+                stopping_criteria=stopping_criteria,
+            )
+        self._raise_if_stopped(token)
+
+        new_tokens = outputs[0, prompt_length:]
+        return (
+            self.tokenizer.decode(new_tokens, skip_special_tokens=True).strip(),
+            int((new_tokens != self.tokenizer.eos_token_id).sum()),
+        )
+
+    # ------------------------------------------------------------------
+    async def stream(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool = False,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        streamer = AsyncTextStreamer(self.tokenizer, asyncio.get_running_loop())
+        future = asyncio.ensure_future(
+            self._run(self._generate_json, prefix, suffix, max_tokens, constrained, schema, streamer)
+        )
+        # 생성이 끝나거나 실패하면 종료 신호 (조각들보다 뒤에 큐에 들어감)
+        future.add_done_callback(lambda _: streamer.queue.put_nowait(None))
+
+        try:
+            while True:
+                text = await streamer.queue.get()
+                if text is None:
+                    break
+                yield text
+            await future
+        finally:
+            # 소비자가 중간에 멈추면 생성도 중단 (토큰 취소 → 다음 스텝에서 멈춤)
+            if not future.done():
+                future.cancel()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        def _embed():
+            return self.embedding_model.encode(texts, convert_to_numpy=True).tolist()
+
+        return await self._run(_embed)
+
+    async def close(self):
+        self._executor.shutdown()
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from app.backends.base import InferenceBackend
+from app.inference_executor import cancel_scope
+from common.core.config import settings
+
+
+class OpenAICompatibleBackend(InferenceBackend):
+    """
+    OpenAI 호환 서버(vLLM, TGI 등)의 /completions, /embeddings 를 호출하는 백엔드
+
+    - httpx.AsyncClient 하나로 keep-alive 연결 풀 사용 (INFERENCE_MAX_CONNECTIONS)
+    - 여러 프롬프트는 동시에 요청하고 세마포어로 동시 요청 수 제한 (INFERENCE_CONCURRENCY)
+      (배치는 서버의 continuous batching 에 맡김)
+    - stream 은 SSE(data: ...) 응답을 조각 단위로 전달
+    - 토큰 수는 로컬 토크나이저로 계산 (모델 가중치는 로드하지 않음)
+    - 작업 CancelToken 이 취소/만료되면 진행 중인 요청을 끊는다 (서버가 연결 종료를 보고 생성 중단)
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.model = model or settings.INFERENCE_MODEL or settings.LLM_MODEL_NAME
+        self.model_name = self.model
+        self.embedding_model = settings.EMBEDDING_MODEL_NAME
+
+        headers = {}
+        if settings.INFERENCE_API_KEY:
+            headers["Authorization"] = f"Bearer {settings.INFERENCE_API_KEY}"
+
+        self.client = httpx.AsyncClient(
+            base_url=(base_url or settings.INFERENCE_BASE_URL).rstrip("/"),
+            headers=headers,
+            timeout=httpx.Timeout(settings.INFERENCE_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.INFERENCE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.INFERENCE_MAX_CONNECTIONS,
+            ),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(settings.INFERENCE_CONCURRENCY)
+        self._tokenizer = self._load_tokenizer()
+
+    def _load_tokenizer(self):
+        try:
+            from transformers import AutoTokenizer
+
+            return AutoTokenizer.from_pretrained(settings.INFERENCE_TOKENIZER or self.model)
+        except Exception as e:
+            print(f"토크나이저 로드 실패 → 바이트 길이로 토큰 수 추정: {e}")
+            return None
+
+    def count_tokens(self, text: str) -> int:
+        if self._tokenizer is None:
+            return max(1, len(text.encode("utf-8")) // 4)
+        return len(self._tokenizer.encode(text, add_special_tokens=False))
+
+    # ------------------------------------------------------------------
+    async def _complete(self, prompt: str, max_tokens: int, **options) -> dict[str, Any]:
+        body = {"model": self.model, "prompt": prompt, "max_tokens": max_tokens, **options}
+        async with cancel_scope(settings.INFERENCE_CALL_TIMEOUT):
+            async with self._semaphore:
+                response = await self.client.post("/completions", json=body)
+        response.raise_for_status()
+        return response.json()
+
+    async def generate_batch(
+        self, prefix: str, suffixes: list[str], max_new_tokens: int
+    ) -> list[str]:
+        responses = await asyncio.gather(
+            *(self._complete(prefix + suffix, max_new_tokens, temperature=0.0) for suffix in suffixes)
+        )
+        return [response["choices"][0]["text"] for response in responses]
+
+    async def generate_json(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> tuple[str, int]:
+        options: dict[str, Any] = {"temperature": 0.1, "top_p": 0.9}
+        if constrained and settings.INFERENCE_GUIDED_JSON:
+            # vLLM guided decoding 확장 필드 (지원하지 않는 서버는 무시)
+            options["guided_json"] = schema or {"type": "object"}
+
+        response = await self._complete(prefix + suffix, max_tokens, **options)
+        text = response["choices"][0]["text"].strip()
+        usage = response.get("usage") or {}
+        return text, int(usage.get("completion_tokens") or self.count_tokens(text))
+
+    async def stream(
+        self,
+        prefix: str,
+        suffix: str,
+        max_tokens: int,
+        constrained: bool = False,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        body = {
+            "model": self.model,
+            "prompt": prefix + suffix,
+            "max_tokens": max_tokens,
+            "temperature": 0.1,
+            "top_p": 0.9,
+            "stream": True,
+        }
+        if constrained and settings.INFERENCE_GUIDED_JSON:
+            body["guided_json"] = schema or {"type": "object"}
+        queue: asyncio.Queue = asyncio.Queue()
+        future = asyncio.ensure_future(self._stream_completions(body, queue))
+        # 요청이 끝나거나 실패/취소되면 종료 신호 (조각들보다 뒤에 큐에 들어감)
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                text = await queue.get()
+                if text is None:
+                    break
+                yield text
+            await future
+        finally:
+            # 소비자가 중간에 멈추면 요청도 중단 (연결 종료 → 서버 측 생성 중단)
+            if not future.done():
+                future.cancel()
+
+    async def _stream_completions(self, body: dict[str, Any], queue: asyncio.Queue):
+        """
+        SSE 응답을 읽어 조각을 queue 에 넣음 (별도 asyncio 작업)
+        cancel_scope 로 작업 토큰에 묶여 있어 취소/TASK_TIMEOUT 마감 시 응답을 기다리는 중이어도 연결을 끊는다.
+        """
+        async with cancel_scope():
+            async with self._semaphore:
+                async with self.client.stream("POST", "/completions", json=body) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        chunk = json.loads(data)
+                        text = chunk["choices"][0].get("text")
+                        if text:
+                            queue.put_nowait(text)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        body = {"model": self.embedding_model, "input": texts}
+        async with cancel_scope(settings.INFERENCE_CALL_TIMEOUT):
+            async with self._semaphore:
+                response = await self.client.post("/embeddings", json=body)
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,73 @@
+"""
+사용법 참고:
+
+ChunkingService는 마크다운 청킹을 워커 이벤트 루프 밖에서 수행한다.
+청킹은 common.markdown_chunker 의 헤더 기반 스트리밍 청커를 사용하고,
+일정 크기 이상의 문서는 프로세스 풀에서 처리한다.
+토큰 예산 조정(fit)은 토크나이저를 쓰므로 전용 스레드에서 처리한다.
+결과는 원문 텍스트 대신 (seq, start, end, header_path) span 목록으로만 돌려받는다.
+
+이 모듈은 자식 프로세스에서 import 되므로 engine(torch, transformers)을 import 하지 않는다.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from common.core.config import settings
+from common.markdown_chunker import Span, chunk_markdown, fit_spans_to_budget
+
+
+class ChunkingService:
+    """프로세스 풀 기반 청킹 서비스 (threshold 미만 문서는 현재 프로세스에서 바로 처리)"""
+
+    def __init__(
+        self,
+        max_workers: int = settings.CHUNK_POOL_SIZE,
+        threshold: int = settings.CHUNK_POOL_THRESHOLD,
+    ):
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._fit_pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 워커 프로세스는 CUDA 를 초기화한 상태이므로 fork 대신 spawn 사용
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def chunk(self, text: str) -> list[Span]:
+        if len(text) < self.threshold or self.max_workers < 1:
+            return chunk_markdown(text)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), chunk_markdown, text)
+
+    async def fit(
+        self,
+        text: str,
+        spans: list[Span],
+        count_tokens: Callable[[str], int],
+        min_tokens: int,
+        max_tokens: int,
+    ) -> list[Span]:
+        if self._fit_pool is None:
+            self._fit_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-fit")
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._fit_pool, fit_spans_to_budget, text, spans, count_tokens, min_tokens, max_tokens
+        )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._fit_pool is not None:
+            self._fit_pool.shutdown(wait=False, cancel_futures=True)
+            self._fit_pool = None
@@ -1,18 +1,66 @@
 import asyncio
-from typing import Any, List, Optional
+import json
+import re
+from typing import Any, AsyncIterator, List, Optional
+
+from app.backends import InferenceBackend, create_backend
+from app.chunking import ChunkingService
+from common.core.config import settings
+from common.markdown_chunker import (
+    Span,
+    chunk_hash,
+    rechunk_incremental,
+)
+
+# 섹션 색인 프롬프트 - 모든 섹션이 공유하는 지시문 + 섹션별 본문
+INDEX_PROMPT_PREFIX = """You index sections of a markdown document.
+For the given section, answer with ONE JSON object and nothing else:
+{"index": "<category path joined by '.', e.g. 기술문서.개요.기술스택>", "essence": "<one-sentence summary>", "reasoning": "<why this index>"}
+Write index/essence/reasoning in Korean.
+
+"""
+INDEX_PROMPT_SECTION = """Header path: {header_path}
+Section:
+{text}
+
+JSON:"""
+
+# 문서 생성 프롬프트 - 고정 지시문 + 원문
+GENERATE_PROMPT_PREFIX = """Convert the following text to JSON format.
+**IMPORTANT**: Output ONLY valid JSON, no explanations.
+
+"""
+GENERATE_PROMPT_SUFFIX = """Text: {text}
+
+JSON Output:"""
+
+_JSON_OBJECT = re.compile(r"\{.*?\}", re.DOTALL)
+
+
+def parse_index_output(output: str) -> dict[str, str]:
+    """생성 결과에서 첫 JSON 객체의 index/essence/reasoning 추출 (실패 시 빈 값)"""
+    for match in _JSON_OBJECT.finditer(output):
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            return {key: str(parsed.get(key) or "") for key in ("index", "essence", "reasoning")}
+    return {"index": "", "essence": "", "reasoning": output.strip()}
 
-import torch
-from llama_index.core import Document
-from llama_index.core.node_parser import MarkdownNodeParser
-from sentence_transformers import SentenceTransformer
-from transformers import AutoModelForCausalLM, AutoTokenizer
+
+def is_valid_json(text: str) -> bool:
+    try:
+        json.loads(text)
+    except json.JSONDecodeError:
+        return False
+    return True
 
 
 class LLMEngine:
     _instance: Optional["LLMEngine"] = None
-    _model = None
-    _tokenizer = None
-    _embedding_model = None
+    _backend: Optional[InferenceBackend] = None
+    _chunker = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -20,81 +68,170 @@ class LLMEngine:
         return cls._instance
 
     def __init__(self):
-        if self._model is None:
-            print("Gemma2 2B 모델 로딩 중")
-            self._tokenizer = AutoTokenizer.from_pretrained("google/gemma-2-2b")
-            self._model = AutoModelForCausalLM.from_pretrained(
-                "google/gemma-2-2b",
-                device_map="auto",
-                torch_dtype=torch.float16,
-                load_in_8bit=True,
-                attn_implementation="eager",
-            )
-            print("Gemma2 2B 로드 완료")
+        if self._backend is None:
+            # 추론 백엔드 (hf: 현재 프로세스 모델 / openai: OpenAI 호환 서버)
+            print(f"추론 백엔드: {settings.INFERENCE_BACKEND}")
+            self._backend = create_backend()
+            if hasattr(self._backend, "register_prefix"):
+                self._backend.register_prefix("index", INDEX_PROMPT_PREFIX)
+                self._backend.register_prefix("generate", GENERATE_PROMPT_PREFIX)
+
+        if self._chunker is None:
+            # 대용량 문서 청킹은 프로세스 풀에서 처리 (이벤트 루프 블로킹 방지)
+            self._chunker = ChunkingService()
+
+    def count_tokens(self, text: str) -> int:
+        """엔진 토크나이저 기준 토큰 수"""
+        return self._backend.count_tokens(text)
+
+    async def split_document(
+        self,
+        text: str,
+        min_tokens: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """
+        문서를 마크다운 단위로 분할한 뒤 토큰 예산(min_tokens ~ max_tokens)에 맞게 조정하여 반환합니다.
 
-        if self._embedding_model is None:
-            print("임베딩 모델 로딩 중")
-            self._embedding_model = SentenceTransformer(
-                "sentence-transformers/all-MiniLM-L6-v2"
-            )
-            print("임베딩 모델 로드 완료")
+        반환 예시:
+            [
+                {"seq": 0, "text": "# 문서 제목\n첫 번째 문단 내용...", "start": 0, "end": 20,
+                 "header_path": "/문서 제목", "chunk_hash": "...", "header_spans": [[0, 20, "/문서 제목"]]},
+                ...
+            ]
+        """
+        spans = await self._chunker.chunk(text)
+        return await self._fit_chunks(text, spans, min_tokens, max_tokens)
+
+    async def split_document_incremental(
+        self,
+        text: str,
+        base_text: str,
+        base_sections: list[dict[str, Any]],
+        min_tokens: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        이전 색인 결과(base_sections 의 header_spans)를 기준으로 편집 영역만 다시 분할합니다.
+        이전 결과에 span 정보가 없으면 전체 분할합니다.
 
-    @staticmethod
-    def chunk_markdown_with_llamaindex(markdown_text: str) -> list[dict[str, Any]]:
-        doc = Document(text=markdown_text)
-        parser = MarkdownNodeParser()
-        nodes = parser.get_nodes_from_documents([doc])
+        반환 : (청크 목록, 재분할 없이 재사용한 헤더 단위 span 수)
+        """
+        try:
+            header_spans = {}
+            for section in base_sections:
+                for start, end, header_path in section.get("header_spans") or [
+                    (section["start"], section["end"], section["header_path"])
+                ]:
+                    header_spans[start] = (end, header_path)
+            base_spans = [
+                (seq, start, end, header_path)
+                for seq, (start, (end, header_path)) in enumerate(sorted(header_spans.items()))
+            ]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return await self.split_document(text, min_tokens, max_tokens), 0
+
+        spans, reused = rechunk_incremental(base_text, base_spans, text)
+        return await self._fit_chunks(text, spans, min_tokens, max_tokens), reused
+
+    async def _fit_chunks(
+        self,
+        text: str,
+        spans: list[Span],
+        min_tokens: Optional[int],
+        max_tokens: Optional[int],
+    ) -> list[dict[str, Any]]:
+        """헤더 단위 span 을 토큰 예산에 맞게 분할/병합 (토큰화는 별도 스레드)"""
+        min_tokens = min_tokens or settings.CHUNK_MIN_TOKENS
+        max_tokens = max_tokens or settings.CHUNK_MAX_TOKENS
+
+        fitted = await self._chunker.fit(text, spans, self.count_tokens, min_tokens, max_tokens)
+        return self._spans_to_chunks(text, fitted, spans)
 
-        chunks = []
-        for i, node in enumerate(nodes):
+    @staticmethod
+    def _spans_to_chunks(
+        text: str, fitted: list[Span], header_spans: list[Span]
+    ) -> list[dict[str, Any]]:
+        """
+        청크 dict 생성
+        header_spans : 청크가 걸쳐 있는 헤더 단위 span (다음 증분 청킹의 기준)
+        """
+        chunks, h = [], 0
+        for seq, start, end, header_path in fitted:
+            while h < len(header_spans) and header_spans[h][2] <= start:
+                h += 1
+            covered, k = [], h
+            while k < len(header_spans) and header_spans[k][1] < end:
+                covered.append([header_spans[k][1], header_spans[k][2], header_spans[k][3]])
+                k += 1
+
+            chunk_text = text[start:end]
             chunks.append(
                 {
-                    "chunk_id": i,
-                    "content": node.get_content(),
-                    "metadata": node.metadata,
+                    "seq": seq,
+                    "text": chunk_text,
+                    "start": start,
+                    "end": end,
+                    "header_path": header_path,
+                    "chunk_hash": chunk_hash(chunk_text),
+                    "header_spans": covered,
                 }
             )
-
         return chunks
 
-    async def split_document(self, text: str) -> list[dict[str, Any]]:
+    async def index_section(
+        self,
+        texts: list[dict[str, Any]],
+        batch_size: Optional[int] = None,
+        max_new_tokens: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
         """
-        문서를 마크다운 단위로 분할하여 반환합니다.
+        섹션 인덱싱 - 각 섹션의 index/essence/reasoning 을 배치 생성
 
-        반환 예시:
-            [
-                {"seq": 0, "text": "# 문서 제목\n첫 번째 문단 내용..."},
-                {"seq": 1, "text": "## 부제목\n두 번째 문단 내용..."},
-                ...
-            ]
-        """
-        chunks = type(self).chunk_markdown_with_llamaindex(text)
-        texts = [
-            {
-                "seq": chunk.get("chunk_id"),
-                "text":chunk.get("content")
-            } for chunk in chunks if chunk.get("content")
-        ]
-        return texts
+        - 토큰 길이순으로 정렬해 batch_size 씩 묶음 (배치 내 패딩 최소화)
+        - 모든 프롬프트는 INDEX_PROMPT_PREFIX 를 공유
+        - max_new_tokens 로 생성 길이 제한, 새로 생성된 토큰만 디코딩
+        반환 순서는 입력 순서와 같다.
 
-    async def index_section(self, texts: list[str]) -> list[dict[str, Any]]:
+        output = [{"seq", "index" ( ex. 기술문서.개요.기술스택), "essence", "reasoning", "original_text", ...}, ...]
         """
-        섹션 인덱싱 - 각 텍스트에 대한 메타데이터 및 벡터 준비
+        batch_size = batch_size or settings.INDEX_BATCH_SIZE
+        max_new_tokens = max_new_tokens or settings.INDEX_MAX_NEW_TOKENS
 
-        input = md:str
-        output =  [{"index" : str ( ex. 기술문서.개요.기술스택) , "essence" : str, "original_text" : str}, {...} , ... ]
+        suffixes = [
+            INDEX_PROMPT_SECTION.format(
+                header_path=text.get("header_path") or "/", text=text.get("text") or ""
+            )
+            for text in texts
+        ]
+        lengths = [self.count_tokens(suffix) for suffix in suffixes]
+        order = sorted(range(len(suffixes)), key=lambda i: lengths[i])
+
+        outputs: list[str] = [""] * len(suffixes)
+        for b in range(0, len(order), batch_size):
+            batch = order[b: b + batch_size]
+            generated = await self._backend.generate_batch(
+                INDEX_PROMPT_PREFIX, [suffixes[i] for i in batch], max_new_tokens
+            )
+            for i, output in zip(batch, generated):
+                outputs[i] = output
 
-        """
         indexed_sections = []
-        for text in texts:
-            # llm 프롬프트로 데이터 생성
+        for text, output in zip(texts, outputs):
+            parsed = parse_index_output(output)
             indexed_sections.append(
                 {
                     "seq": text.get("seq"),
-                    "index": "테스트.인텍스.확인용",
-                    "essence": "내용 요약이 들어있습니다",
+                    "index": parsed["index"],
+                    "essence": parsed["essence"],
                     "original_text": text.get("text"),
-                    "reasoning": "테스트 사유 입니다."
+                    "reasoning": parsed["reasoning"],
+                    # 증분 재색인용 청크 정보
+                    "start": text.get("start"),
+                    "end": text.get("end"),
+                    "header_path": text.get("header_path"),
+                    "chunk_hash": text.get("chunk_hash"),
+                    "header_spans": text.get("header_spans"),
                 }
             )
 
@@ -117,39 +254,38 @@ class LLMEngine:
         return merged
 
     async def generate_document(
-        self, text: str, max_tokens: int = 512
+        self,
+        text: str,
+        max_tokens: int = 512,
+        constrained: Optional[bool] = None,
+        schema: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
         """
-        문서 생성 - Gemma2 2B를 사용한 실제 LLM 추론
+        문서 생성 - LLM 으로 원문을 JSON 으로 변환
+
+        constrained=True (기본값 settings.GENERATE_CONSTRAINED)
+            JsonLogitsProcessor 로 유효한 JSON 접두사만 생성하고, 최상위 객체가 닫히면 바로 종료
+            schema 로 최상위 키/타입/필수 키 제한 가능
+        constrained=False
+            자유 생성 후 JSON 파싱에 실패하면 settings.GENERATE_JSON_RETRIES 회까지 다시 생성
+        어느 경우든 새로 생성된 토큰만 디코딩한다.
         """
-        prompt = f"""Convert the following text to JSON format.
-**IMPORTANT**: Output ONLY valid JSON, no explanations.
-
-Text: {text}
-
-JSON Output:"""
-
-        # 토큰화
-        inputs = self._tokenizer(prompt, return_tensors="pt").to(self._model.device)
-
-        # 비동기 처리를 위해 별도 스레드에서 실행
-        loop = asyncio.get_event_loop()
-
-        def _generate():
-            with torch.no_grad():
-                outputs = self._model.generate(
-                    **inputs,
-                    max_new_tokens=max_tokens,
-                    temperature=0.1,
-                    top_p=0.9,
-                    do_sample=True,
-                    pad_token_id=self._tokenizer.eos_token_id,
-                )
-            return self._tokenizer.decode(outputs[0], skip_special_tokens=True)
-
-        # CPU-bound 작업을 별도 스레드에서 실행
-        full_output = await loop.run_in_executor(None, _generate)
-        generated_text = full_output.replace(prompt, "").strip()
+        constrained = settings.GENERATE_CONSTRAINED if constrained is None else constrained
+        max_attempts = 1 if constrained else 1 + settings.GENERATE_JSON_RETRIES
+
+        loop = asyncio.get_running_loop()
+        generated_text, generated_tokens, valid_json, attempts = "", 0, False, 0
+        while attempts < max_attempts and not valid_json:
+            attempts += 1
+            generated_text, new_tokens = await self._backend.generate_json(
+                GENERATE_PROMPT_PREFIX,
+                GENERATE_PROMPT_SUFFIX.format(text=text),
+                max_tokens,
+                constrained,
+                schema,
+            )
+            generated_tokens += new_tokens
+            valid_json = is_valid_json(generated_text)
 
         return {
             "title": "Generated Document",
@@ -159,11 +295,35 @@ JSON Output:"""
             else generated_text,
             "metadata": {
                 "source_length": len(text),
-                "model": "google/gemma-2-2b",
-                "generated_at": asyncio.get_event_loop().time(),
+                "model": self._backend.model_name,
+                "generated_at": loop.time(),
+                "constrained": constrained,
+                "attempts": attempts,
+                "generated_tokens": generated_tokens,
+                "valid_json": valid_json,
             },
         }
 
+    async def stream_document(
+        self,
+        text: str,
+        max_tokens: int = 512,
+        constrained: Optional[bool] = None,
+        schema: Optional[dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        문서 생성 스트리밍 - generate_document 와 같은 프롬프트로 생성 텍스트를 조각 단위로 전달
+        """
+        constrained = settings.GENERATE_CONSTRAINED if constrained is None else constrained
+        async for piece in self._backend.stream(
+            GENERATE_PROMPT_PREFIX,
+            GENERATE_PROMPT_SUFFIX.format(text=text),
+            max_tokens,
+            constrained,
+            schema,
+        ):
+            yield piece
+
     async def embed_text(self, text: str) -> List[float]:
         """
         텍스트를 벡터로 임베딩
@@ -174,21 +334,11 @@ JSON Output:"""
         Returns:
             1536차원 벡터 (OpenAI text-embedding-3-small 호환)
         """
-        loop = asyncio.get_event_loop()
-
-        def _embed():
-            # sentence-transformers로 임베딩 생성 (384차원)
-            embedding = self._embedding_model.encode(text, convert_to_numpy=True)
-
-            # 1536차원으로 패딩 (zero-padding)
-            # 실제 운영 시에는 1536차원 모델 사용 또는 DB 스키마 조정 필요
-            import numpy as np
-
-            padded = np.zeros(1536)
-            padded[: len(embedding)] = embedding
-
-            return padded.tolist()
-
-        # CPU-bound 작업을 별도 스레드에서 실행
-        vector = await loop.run_in_executor(None, _embed)
-        return vector
+        # sentence-transformers 기준 384차원
+        embedding = (await self._backend.embed([text]))[0]
+
+        # 1536차원으로 패딩 (zero-padding)
+        # 실제 운영 시에는 1536차원 모델 사용 또는 DB 스키마 조정 필요
+        padded = [0.0] * 1536
+        padded[: len(embedding)] = embedding[:1536]
+        return padded
@@ -0,0 +1,229 @@
+"""
+사용법 참고:
+
+InferenceExecutor 는 추론(generate/encode) 전용 스레드 풀이다.
+기본 executor(run_in_executor(None, ...)) 대신 크기와 대기열 한도가 정해진 풀을 사용하고,
+호출마다 마감 시각(deadline)을 둔다.
+
+작업(task_id)마다 CancelToken 을 만들어 bind_token 으로 현재 컨텍스트에 묶으면
+그 안에서 호출되는 추론은 모두 같은 토큰을 본다.
+    - HF 생성: CancelStoppingCriteria 가 매 스텝 토큰을 확인해 바로 멈춘다
+    - OpenAI 호환 서버: cancel_scope 가 요청 중인 asyncio 작업을 취소한다 (연결 종료 → 서버 측 중단)
+
+이 모듈은 torch/transformers 를 import 하지 않는다.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from common.core.config import settings
+
+
+class InferenceCancelled(Exception):
+    """취소 요청으로 중단된 추론"""
+
+
+class InferenceTimeout(InferenceCancelled):
+    """마감 시각을 넘겨 중단된 추론"""
+
+
+class InferenceQueueFull(RuntimeError):
+    """추론 대기열이 가득 참"""
+
+
+class _CancelState:
+    """같은 작업의 토큰들이 공유하는 취소 상태"""
+
+    __slots__ = ("event", "lock", "callbacks", "reason")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks: list[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+
+class CancelToken:
+    """
+    취소 플래그 + 마감 시각
+    with_timeout 으로 만든 하위 토큰은 취소 상태를 공유하고 마감 시각만 더 짧게 가진다.
+    생성 스레드와 이벤트 루프 양쪽에서 안전하게 확인/취소할 수 있다.
+    """
+
+    def __init__(self, task_id: Optional[str] = None, timeout: Optional[float] = None):
+        self.task_id = task_id
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._state = _CancelState()
+
+    def with_timeout(self, timeout: Optional[float]) -> "CancelToken":
+        child = CancelToken.__new__(CancelToken)
+        child.task_id = self.task_id
+        child.deadline = self.deadline
+        if timeout:
+            deadline = time.monotonic() + timeout
+            child.deadline = deadline if self.deadline is None else min(self.deadline, deadline)
+        child._state = self._state
+        return child
+
+    def cancel(self, reason: str = "cancelled"):
+        state = self._state
+        with state.lock:
+            if state.event.is_set():
+                return
+            state.reason = reason
+            state.event.set()
+            callbacks = list(state.callbacks)
+            state.callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """취소 시 호출할 콜백 등록 (이미 취소됐으면 바로 호출). 등록 해제 함수 반환."""
+        state = self._state
+        with state.lock:
+            if not state.event.is_set():
+                state.callbacks.append(callback)
+
+                def remove():
+                    with state.lock:
+                        if callback in state.callbacks:
+                            state.callbacks.remove(callback)
+
+                return remove
+        callback()
+        return lambda: None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._state.event.is_set()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._state.reason
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def should_stop(self) -> bool:
+        return self.cancelled or self.expired()
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_stopped(self):
+        if self.cancelled:
+            raise InferenceCancelled(f"추론 취소됨 ({self.reason}) task_id={self.task_id}")
+        if self.expired():
+            raise InferenceTimeout(f"추론 시간 초과 task_id={self.task_id}")
+
+
+_current_token: ContextVar[Optional[CancelToken]] = ContextVar("inference_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    """현재 컨텍스트에 묶인 CancelToken (없으면 None)"""
+    return _current_token.get()
+
+
+@contextlib.contextmanager
+def bind_token(token: CancelToken):
+    """with 블록 안의 추론 호출이 token 을 사용하도록 현재 컨텍스트에 묶음"""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+class InferenceExecutor:
+    """
+    추론 전용 스레드 풀
+    - max_workers 개 스레드에서 실행, 실행 중 + 대기 중 호출이 max_workers + max_queue 를 넘으면 InferenceQueueFull
+    - 호출마다 call_timeout 마감 시각을 가진 토큰을 스레드 컨텍스트에 묶어 실행
+    - 대기 중에 취소/만료된 호출은 실행하지 않음
+    - 호출한 asyncio 작업이 취소되면 토큰도 취소 (생성 스레드가 다음 스텝에서 멈춤)
+    """
+
+    def __init__(
+        self,
+        max_workers: int = settings.INFERENCE_WORKERS,
+        max_queue: int = settings.INFERENCE_MAX_QUEUE,
+        call_timeout: Optional[float] = settings.INFERENCE_CALL_TIMEOUT,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.call_timeout = call_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self._pending = 0
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+        if self._pending >= self.max_workers + self.max_queue:
+            raise InferenceQueueFull(
+                f"추론 대기열 초과 (pending={self._pending}, "
+                f"workers={self.max_workers}, queue={self.max_queue})"
+            )
+
+        token = (current_token() or CancelToken()).with_timeout(timeout or self.call_timeout)
+        token.raise_if_stopped()
+
+        # 스레드에서도 current_token() 으로 같은 토큰을 보도록 컨텍스트 복사
+        context = contextvars.copy_context()
+        context.run(_current_token.set, token)
+
+        def call():
+            token.raise_if_stopped()
+            return context.run(func, *args)
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(self._pool, call)
+        except asyncio.CancelledError:
+            token.cancel("caller cancelled")
+            raise
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self._pending,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@contextlib.asynccontextmanager
+async def cancel_scope(timeout: Optional[float] = None):
+    """
+    현재 asyncio 작업을 CancelToken 에 묶는 구간 (이벤트 루프에서 도는 추론용)
+    토큰이 취소되거나 마감 시각이 지나면 작업을 취소하고 InferenceCancelled / InferenceTimeout 으로 바꿔 올린다.
+    """
+    token = (current_token() or CancelToken()).with_timeout(timeout)
+    token.raise_if_stopped()
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    remove = token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+    try:
+        async with asyncio.timeout(token.remaining()):
+            yield token
+    except asyncio.CancelledError:
+        if not token.cancelled:
+            raise
+        task.uncancel()
+        raise InferenceCancelled(f"추론 취소됨 ({token.reason}) task_id={token.task_id}")
+    except TimeoutError:
+        raise InferenceTimeout(f"추론 시간 초과 task_id={token.task_id}")
+    finally:
+        remove()
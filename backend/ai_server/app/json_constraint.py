@@ -0,0 +1,330 @@
+"""
+사용법 참고:
+
+JSON 제약 디코딩. 생성 중인 텍스트가 항상 "유효한 JSON 의 앞부분"이 되도록 토큰을 제한한다.
+
+    processor = JsonLogitsProcessor(tokenizer, prompt_length, schema={...})
+    model.generate(**inputs, logits_processor=LogitsProcessorList([processor]), ...)
+
+- JsonPrefixValidator : 문자 단위 pushdown automaton (객체/배열 스택 + 문자열/숫자/리터럴 상태)
+- 스키마는 최상위 객체만 제한하는 부분집합을 지원한다
+    {"type": "object", "properties": {"title": {"type": "string"}, ...}, "required": [...]}
+  properties 가 있으면 그 밖의 키는 허용하지 않고, 값의 첫 문자로 타입을 확인하며,
+  required 키가 모두 나와야 최상위 객체를 닫을 수 있다. 중첩 값은 일반 JSON 문법만 검사한다.
+- 매 스텝 점수 상위 top_k 후보만 검사하고(없으면 후보를 넓힘), 최상위 객체가 닫히면 EOS 만 허용한다.
+"""
+
+import re
+from typing import Any, Optional
+
+import torch
+from transformers import LogitsProcessor
+
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_NUMBER_CHARS = set("0123456789+-.eE")
+_WHITESPACE = set(" \t\n\r")
+_LITERALS = {"t": "true", "f": "false", "n": "null"}
+_TYPE_FIRST_CHARS = {
+    "string": set('"'),
+    "number": set("-0123456789"),
+    "integer": set("-0123456789"),
+    "boolean": set("tf"),
+    "null": set("n"),
+    "object": set("{"),
+    "array": set("["),
+}
+# 문자열 밖 연속 공백 허용 개수 (공백만 무한 생성하는 경우 방지)
+MAX_WHITESPACE_RUN = 8
+
+
+class JsonPrefixValidator:
+    """문자를 하나씩 받아 JSON 접두사로 유효한지 검사하는 상태 기계"""
+
+    def __init__(self, schema: Optional[dict[str, Any]] = None):
+        schema = schema or {}
+        properties = schema.get("properties") or {}
+        self.allowed_keys: Optional[dict[str, Optional[str]]] = (
+            {key: (value or {}).get("type") for key, value in properties.items()} if properties else None
+        )
+        self.required = frozenset(schema.get("required") or [])
+        self.root_object = schema.get("type", "object") == "object"
+
+        # 컨테이너 스택: [kind("obj"/"arr"), phase]
+        self.stack: list[list[str]] = []
+        self.mode: Optional[str] = None  # None / string / number / literal
+        self.buffer = ""
+        self.escape = 0  # 0: 없음, 1: '\' 직후, 2~5: \\u 뒤 남은 hex 수 + 1
+        self.is_key = False
+        self.seen_keys: set[str] = set()
+        self.pending_key: Optional[str] = None
+        self.whitespace_run = 0
+        self.started = False
+        self.done = False
+
+    def copy(self) -> "JsonPrefixValidator":
+        clone = object.__new__(JsonPrefixValidator)
+        clone.__dict__.update(self.__dict__)
+        clone.stack = [frame[:] for frame in self.stack]
+        clone.seen_keys = set(self.seen_keys)
+        return clone
+
+    # ------------------------------------------------------------------
+    def feed(self, text: str) -> bool:
+        for ch in text:
+            if not self._step(ch):
+                return False
+        return True
+
+    @property
+    def complete(self) -> bool:
+        return self.done and self.mode is None
+
+    def _expecting_value(self) -> bool:
+        if not self.stack:
+            return not self.started
+        kind, phase = self.stack[-1]
+        return phase in ("value", "value_or_end")
+
+    def _value_allowed(self, ch: str) -> bool:
+        """현재 위치에서 ch 로 시작하는 값이 허용되는지 (최상위/스키마 타입 검사)"""
+        if not self.stack:
+            return ch == "{" if self.root_object else True
+        if len(self.stack) == 1 and self.allowed_keys is not None and self.pending_key is not None:
+            expected = self.allowed_keys.get(self.pending_key)
+            if expected in _TYPE_FIRST_CHARS:
+                return ch in _TYPE_FIRST_CHARS[expected]
+        return True
+
+    def _value_done(self):
+        """스칼라/컨테이너 값이 끝났을 때 부모 상태 갱신"""
+        self.mode = None
+        self.buffer = ""
+        if not self.stack:
+            self.done = True
+            return
+        self.stack[-1][1] = "comma_or_end"
+        if len(self.stack) == 1:
+            self.pending_key = None
+
+    def _key_done(self) -> bool:
+        key = self.buffer
+        self.mode = None
+        self.buffer = ""
+        self.is_key = False
+        if len(self.stack) == 1:
+            if self.allowed_keys is not None and key not in self.allowed_keys:
+                return False
+            if key in self.seen_keys:
+                return False
+            self.seen_keys.add(key)
+            self.pending_key = key
+        self.stack[-1][1] = "colon"
+        return True
+
+    def _step(self, ch: str) -> bool:
+        if self.mode == "string":
+            return self._step_string(ch)
+        if self.mode == "literal":
+            target = _LITERALS[self.buffer[0]]
+            if target[len(self.buffer)] != ch:
+                return False
+            self.buffer += ch
+            if self.buffer == target:
+                self._value_done()
+            return True
+        if self.mode == "number":
+            if ch in _NUMBER_CHARS:
+                candidate = self.buffer + ch
+                if not (_NUMBER.fullmatch(candidate) or _NUMBER.fullmatch(candidate + "0")):
+                    return False
+                self.buffer = candidate
+                return True
+            if not _NUMBER.fullmatch(self.buffer):
+                return False
+            self._value_done()
+            # 숫자를 끝낸 문자는 구조 문자로 다시 처리
+
+        if self.done:
+            return ch in _WHITESPACE and self._whitespace()
+
+        if ch in _WHITESPACE:
+            return self._whitespace()
+        self.whitespace_run = 0
+
+        if self._expecting_value():
+            if not self._value_allowed(ch):
+                return False
+            self.started = True
+            if ch == "{":
+                self.stack.append(["obj", "key_or_end"])
+                return True
+            if ch == "[":
+                self.stack.append(["arr", "value_or_end"])
+                return True
+            if ch == '"':
+                self.mode, self.buffer, self.is_key = "string", "", False
+                return True
+            if ch in "-0123456789":
+                self.mode, self.buffer = "number", ch
+                return True
+            if ch in _LITERALS:
+                self.mode, self.buffer = "literal", ch
+                return True
+            if ch == "]" and self.stack[-1] == ["arr", "value_or_end"]:
+                return self._close("arr")
+            return False
+
+        kind, phase = self.stack[-1]
+        if kind == "obj":
+            if phase in ("key_or_end", "key") and ch == '"':
+                self.mode, self.buffer, self.is_key = "string", "", True
+                return True
+            if phase == "key_or_end" and ch == "}":
+                return self._close("obj")
+            if phase == "colon" and ch == ":":
+                self.stack[-1][1] = "value"
+                return True
+            if phase == "comma_or_end" and ch == ",":
+                self.stack[-1][1] = "key"
+                return True
+            if phase == "comma_or_end" and ch == "}":
+                return self._close("obj")
+            return False
+
+        if phase == "comma_or_end" and ch == ",":
+            self.stack[-1][1] = "value"
+            return True
+        if phase == "comma_or_end" and ch == "]":
+            return self._close("arr")
+        return False
+
+    def _whitespace(self) -> bool:
+        self.whitespace_run += 1
+        return self.whitespace_run <= MAX_WHITESPACE_RUN
+
+    def _close(self, kind: str) -> bool:
+        if kind == "obj" and len(self.stack) == 1 and not self.required <= self.seen_keys:
+            return False
+        self.stack.pop()
+        self._value_done()
+        return True
+
+    def _step_string(self, ch: str) -> bool:
+        if self.escape == 1:
+            if ch == "u":
+                self.escape = 5
+            elif ch in '"\\/bfnrt':
+                self.escape = 0
+            else:
+                return False
+            self.buffer += ch
+            return True
+        if self.escape > 1:
+            if ch not in "0123456789abcdefABCDEF":
+                return False
+            self.escape = self.escape - 1 if self.escape > 2 else 0
+            self.buffer += ch
+            return True
+        if ch == "\\":
+            self.escape = 1
+            self.buffer += ch
+            return True
+        if ch == '"':
+            if self.is_key:
+                return self._key_done()
+            self._value_done()
+            return True
+        if ord(ch) < 0x20:
+            return False
+        self.buffer += ch
+        # 최상위 객체 키는 허용 키의 접두사여야 함
+        if self.is_key and len(self.stack) == 1 and self.allowed_keys is not None:
+            return any(key.startswith(self.buffer) for key in self.allowed_keys)
+        return True
+
+
+class JsonLogitsProcessor(LogitsProcessor):
+    """
+    JsonPrefixValidator 로 상위 후보 토큰만 검사해 유효하지 않은 토큰을 -inf 로 막는 LogitsProcessor
+    (batch 의 각 행마다 validator 를 따로 유지)
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        prompt_length: int,
+        schema: Optional[dict[str, Any]] = None,
+        top_k: int = 32,
+        max_candidates: int = 4096,
+    ):
+        self.tokenizer = tokenizer
+        self.prompt_length = prompt_length
+        self.schema = schema
+        self.top_k = top_k
+        self.max_candidates = max_candidates
+        self.eos_token_id = tokenizer.eos_token_id
+        self._validators: list[JsonPrefixValidator] = []
+        self._fed: list[int] = []
+        self._token_text: dict[int, str] = {}
+        # 토큰 단독 decode 는 앞 공백이 사라지는 토크나이저가 있어 기준 토큰 뒤에 붙여 decode
+        self._anchor_ids = tokenizer.encode("a", add_special_tokens=False)
+        self._anchor_text = tokenizer.decode(self._anchor_ids)
+
+    def token_text(self, token_id: int) -> str:
+        text = self._token_text.get(token_id)
+        if text is None:
+            decoded = self.tokenizer.decode(self._anchor_ids + [token_id])
+            text = decoded[len(self._anchor_text):]
+            self._token_text[token_id] = text
+        return text
+
+    def is_complete(self, row: int = 0) -> bool:
+        return row < len(self._validators) and self._validators[row].complete
+
+    def _sync(self, row: int, ids: list[int]):
+        """이전 스텝에서 선택된 토큰을 validator 에 반영"""
+        if row >= len(self._validators):
+            self._validators.append(JsonPrefixValidator(self.schema))
+            self._fed.append(0)
+        validator = self._validators[row]
+        for token_id in ids[self._fed[row]:]:
+            if token_id != self.eos_token_id:
+                validator.feed(self.token_text(token_id))
+        self._fed[row] = len(ids)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        masked = torch.full_like(scores, float("-inf"))
+        for row in range(input_ids.shape[0]):
+            self._sync(row, input_ids[row, self.prompt_length:].tolist())
+            validator = self._validators[row]
+
+            # 최상위 객체가 닫히면 EOS 로 종료
+            if validator.complete:
+                masked[row, self.eos_token_id] = 0.0
+                continue
+
+            allowed: list[int] = []
+            k = self.top_k
+            checked = 0
+            while not allowed and checked < min(self.max_candidates, scores.shape[-1]):
+                k = min(k, scores.shape[-1])
+                candidates = torch.topk(scores[row], k).indices.tolist()
+                for token_id in candidates[checked:]:
+                    if token_id == self.eos_token_id:
+                        continue
+                    text = self.token_text(token_id)
+                    if text and validator.copy().feed(text):
+                        allowed.append(token_id)
+                checked = k
+                k *= 4
+
+            if not allowed:
+                # 허용 후보가 없으면 EOS (불완전한 JSON 은 호출 측에서 검증)
+                masked[row, self.eos_token_id] = 0.0
+                continue
+
+            index = torch.tensor(allowed, device=scores.device)
+            values = scores[row, index]
+            # 앞선 processor(top_p 등)가 -inf 로 만든 후보만 남은 경우에도 선택 가능하도록
+            masked[row, index] = torch.where(torch.isinf(values), torch.zeros_like(values), values)
+        return masked
@@ -0,0 +1,163 @@
+"""
+사용법 참고:
+
+PrefixCache 는 여러 요청이 공유하는 고정 프롬프트 앞부분(prefix)의 KV cache(past_key_values)를
+한 번만 계산해 재사용한다.
+
+    cache = PrefixCache(model, tokenizer)
+    cache.register("generate", GENERATE_PROMPT_PREFIX)
+    inputs = cache.build_inputs(GENERATE_PROMPT_PREFIX, suffix)   # input_ids, attention_mask, past_key_values
+    model.generate(**inputs, ...)
+
+- prefix 와 suffix 는 따로 토큰화해 이어 붙인다 (prefix 토큰이 항상 같아야 cache 를 재사용할 수 있음)
+- generate 는 past_key_values 를 갱신하므로 요청마다 복사본을 넘긴다
+- LRU 로 관리하며 max_bytes 초과 또는 메모리 압박 시 오래된 prefix 부터 제거한다
+- 등록되지 않은 prefix 나 cache 를 둘 수 없는 상황에서는 past_key_values 없이 입력만 만든다
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import psutil
+import torch
+
+
+def cache_nbytes(past_key_values) -> int:
+    """KV cache 텐서 전체 크기 (transformers 버전별 Cache 구조 모두 지원)"""
+    tensors = []
+    if hasattr(past_key_values, "layers"):
+        for layer in past_key_values.layers:
+            tensors += [getattr(layer, "keys", None), getattr(layer, "values", None)]
+    elif hasattr(past_key_values, "key_cache"):
+        tensors = list(past_key_values.key_cache) + list(past_key_values.value_cache)
+    else:
+        for layer in past_key_values:
+            tensors += list(layer)
+    return sum(t.numel() * t.element_size() for t in tensors if isinstance(t, torch.Tensor))
+
+
+class PrefixCache:
+    """고정 프롬프트 prefix 의 past_key_values LRU 캐시 (스레드 안전)"""
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        max_bytes: int,
+        min_free_ratio: float,
+    ):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_bytes = max_bytes
+        self.min_free_ratio = min_free_ratio
+
+        self._prefixes: dict[str, str] = {}  # name -> prefix 텍스트
+        self._entries: "OrderedDict[str, dict[str, Any]]" = OrderedDict()  # prefix 텍스트 -> cache
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def register(self, name: str, prefix: str):
+        """재사용할 prefix 등록 (계산은 첫 사용 시)"""
+        self._prefixes[name] = prefix
+
+    def is_registered(self, prefix: str) -> bool:
+        return prefix in self._prefixes.values()
+
+    def _memory_pressure(self) -> bool:
+        """가용 메모리 비율이 min_free_ratio 미만이면 True (GPU 가 있으면 GPU 기준)"""
+        if torch.cuda.is_available():
+            free, total = torch.cuda.mem_get_info()
+        else:
+            memory = psutil.virtual_memory()
+            free, total = memory.available, memory.total
+        return free / total < self.min_free_ratio
+
+    def _used_bytes(self) -> int:
+        return sum(entry["nbytes"] for entry in self._entries.values())
+
+    def _evict(self, incoming: int = 0):
+        """max_bytes 를 넘거나 메모리 압박이 있으면 LRU 순으로 제거"""
+        while self._entries and (
+            self._used_bytes() + incoming > self.max_bytes or self._memory_pressure()
+        ):
+            prefix, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            print(f"prefix cache 제거 | len(prefix)={len(prefix)}")
+
+    def _prefix_ids(self, prefix: str) -> torch.Tensor:
+        return self.tokenizer(prefix, return_tensors="pt")["input_ids"].to(self.model.device)
+
+    def _compute(self, prefix: str) -> Optional[dict[str, Any]]:
+        input_ids = self._prefix_ids(prefix)
+        with torch.no_grad():
+            outputs = self.model(input_ids=input_ids, use_cache=True)
+        past_key_values = outputs.past_key_values
+        nbytes = cache_nbytes(past_key_values)
+
+        self._evict(incoming=nbytes)
+        if nbytes > self.max_bytes or self._memory_pressure():
+            return None
+
+        entry = {
+            "input_ids": input_ids,
+            "past_key_values": past_key_values,
+            "nbytes": nbytes,
+            "created_at": time.time(),
+        }
+        self._entries[prefix] = entry
+        return entry
+
+    def get(self, prefix: str) -> Optional[dict[str, Any]]:
+        """등록된 prefix 의 cache 조회 (없으면 계산). 캐시할 수 없으면 None"""
+        if not self.is_registered(prefix):
+            return None
+
+        with self._lock:
+            entry = self._entries.get(prefix)
+            if entry is not None:
+                self._entries.move_to_end(prefix)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            return self._compute(prefix)
+
+    def build_inputs(self, prefix: str, suffix: str) -> dict[str, Any]:
+        """
+        generate 입력 생성
+        cache 가 있으면 past_key_values 복사본을 함께 넘겨 prefix 는 다시 계산하지 않는다.
+        """
+        entry = self.get(prefix)
+        prefix_ids = entry["input_ids"] if entry else self._prefix_ids(prefix)
+        suffix_ids = self.tokenizer(
+            suffix, return_tensors="pt", add_special_tokens=False
+        )["input_ids"].to(self.model.device)
+
+        input_ids = torch.cat([prefix_ids, suffix_ids], dim=-1)
+        inputs = {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+        }
+        if entry:
+            inputs["past_key_values"] = copy.deepcopy(entry["past_key_values"])
+        return inputs
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._used_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
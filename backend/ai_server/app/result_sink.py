@@ -0,0 +1,271 @@
+"""
+사용법 참고:
+
+ResultSink 는 워커의 작업 결과(ai_output)를 모아서 model_logs 에 한 번에 저장하는 write-behind 버퍼다.
+    submit  : 워커별 Redis 저널(result_journal:{worker_id})에 기록 후 메모리 버퍼에 추가 (바로 반환, 다음 작업 진행)
+              미저장 결과가 MAX_PENDING 건 이상이면 flush 로 줄어들 때까지 반환하지 않음
+              (DB 장애 중에는 워커가 새 작업을 받지 않으므로 버퍼/저널 크기가 제한됨)
+    flush   : 버퍼 전체를 UPDATE ... FROM (VALUES ...) 한 번으로 커밋
+              → 커밋 성공 후에만 COMPLETE 상태로 전환 → 저널에서 삭제
+    BATCH_SIZE 건이 모이거나 FLUSH_INTERVAL 초가 지나면 백그라운드에서 flush 한다.
+    result_cache 가 있으면 커밋 직후(COMPLETE 전환 전) 완료 응답 캐시도 채운다.
+    (입력 원문은 submit 에 넘긴 input_text 를 사용 - DB 에서 input_data 를 다시 읽지 않음.
+     input_text 가 없거나 저널에서 복구한 결과는 캐시하지 않고 API 가 조회 시 채움)
+
+비정상 종료 시
+    - 커밋 전 결과: 저널에 남아 있으므로 다른 워커(또는 재기동한 워커)가 가져가 다시 flush (상태는 그동안 PROCESSING)
+      워커는 OWNER_TTL 안에 생존 표시를 갱신하고, 표시가 만료된 워커의 저널만 가져간다
+      (start 시 + OWNER_TTL/3 마다 확인. 실행 중인 다른 워커의 저널은 건드리지 않음)
+    - 커밋 후 COMPLETE/저널 삭제 전: 다시 flush 해도 같은 값으로 UPDATE 하므로 안전
+    즉 COMPLETE 로 보이는 작업은 항상 DB 에 결과가 있다.
+DB 저장이나 상태 전환이 실패하면 결과를 버퍼에 되돌려 다음 주기에 재시도한다.
+    - DB 연결 장애 : 배치 전체를 그대로 재시도
+    - 그 밖의 실패(직렬화 불가 값, 제약 위반 등) : 배치를 반으로 나눠 가며 다시 저장해 문제 행만 골라내고
+      나머지는 커밋. 골라낸 행은 MAX_ATTEMPTS 번 실패하면 ERROR 로 전환하고 저널에서 삭제
+"""
+
+import asyncio
+import os
+import socket
+import time
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from common.core.codes import LlmTaskStatus
+from common.core.config import settings
+from common.core.database import AsyncSessionLocal
+from common.repositories.model_logs_repo import ModelLogsRepository
+from common.repositories.redis_repo import RedisRepository
+from common.repositories.result_cache import TaskResultCache, build_task_detail
+
+# submit 이 버퍼가 줄기를 기다릴 때 flush 재시도 간격 상한 (초)
+MAX_BACKOFF = 5.0
+
+
+def _is_outage(error: Exception) -> bool:
+    """DB 연결/가용성 문제인지 (행을 나눠 다시 시도해도 소용없으므로 배치 전체 재시도)"""
+    if isinstance(error, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+class ResultSink:
+    def __init__(
+        self,
+        repo: RedisRepository,
+        batch_size: int = settings.RESULT_SINK_BATCH_SIZE,
+        flush_interval: float = settings.RESULT_SINK_FLUSH_INTERVAL,
+        max_pending: int = settings.RESULT_SINK_MAX_PENDING,
+        max_attempts: int = settings.RESULT_SINK_MAX_ATTEMPTS,
+        owner_ttl: int = settings.RESULT_SINK_OWNER_TTL,
+        result_cache: Optional[TaskResultCache] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.repo = repo
+        # 저널 소유자 (프로세스마다 새 id → 재기동한 워커도 이전 저널을 만료 후 복구 대상으로 봄)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.owner_ttl = owner_ttl
+        self.result_cache = result_cache
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+        self._buffer: dict[str, Any] = {}
+        # 완료 응답 캐시용 입력 원문 (task_id → text, 저널에는 기록하지 않음)
+        self._inputs: dict[str, str] = {}
+        # 행 단위 저장 실패 횟수 (task_id → 횟수)
+        self._attempts: dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._heartbeat_at = 0.0
+
+        self.flushes = 0
+        self.flushed_tasks = 0
+        self.failures = 0
+        self.rejected = 0
+
+    async def start(self):
+        """종료된 워커가 커밋하지 못한 결과를 복구하고 백그라운드 flush 시작"""
+        await self._heartbeat()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def _heartbeat(self):
+        """생존 표시 갱신 + 생존 표시가 만료된 워커의 저널을 가져와 버퍼에 추가"""
+        self._heartbeat_at = time.monotonic()
+        await self.repo.register_journal(self.worker_id, self.owner_ttl)
+        claimed = await self.repo.claim_orphan_journals(self.worker_id)
+        if claimed:
+            print(f"ResultSink: 종료된 워커의 커밋되지 않은 결과 {len(claimed)}건 복구")
+            # 이 워커가 같은 작업의 결과를 이미 가지고 있으면 그쪽을 유지
+            self._buffer = {**claimed, **self._buffer}
+            self._wakeup.set()
+
+    async def submit(self, task_id: str, ai_output: Any, input_text: Optional[str] = None):
+        await self.repo.journal_result(self.worker_id, task_id, ai_output)
+        self._buffer[task_id] = ai_output
+        if input_text is not None and self.result_cache is not None:
+            self._inputs[task_id] = input_text
+
+        if len(self._buffer) >= self.max_pending:
+            # DB 가 밀리면 작업 처리도 멈춰 버퍼가 무한히 커지지 않게 함
+            await self._drain()
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _drain(self):
+        """버퍼가 max_pending 아래로 줄 때까지 flush 를 반복 (실패하면 간격을 늘려 가며 대기)"""
+        delay = self.flush_interval
+        while True:
+            await self.flush()
+            if len(self._buffer) < self.max_pending:
+                return
+            print(
+                f"ResultSink: 미저장 결과 {len(self._buffer)}건 (max_pending={self.max_pending}) "
+                f"→ {delay:.1f}초 후 다시 저장 (새 작업 대기)"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_BACKOFF)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if time.monotonic() - self._heartbeat_at >= self.owner_ttl / 3:
+                try:
+                    await self._heartbeat()
+                except Exception as e:
+                    print(f"ResultSink: 저널 생존 표시 갱신 실패: {e}")
+            await self.flush()
+
+    async def flush(self) -> int:
+        """버퍼 전체를 커밋하고 COMPLETE 처리. 커밋한 작업 수 반환 (실패 시 0, 버퍼 복원)."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, {}
+
+            try:
+                rows, failed = await self._commit(batch)
+            except Exception as e:
+                self.failures += 1
+                print(f"ResultSink: model_logs 저장 실패 ({len(batch)}건, 다음 주기에 재시도): {e}")
+                # flush 중에 들어온 같은 작업의 새 결과가 있으면 그쪽을 유지
+                self._buffer = {**batch, **self._buffer}
+                return 0
+
+            task_ids = [task_id for task_id in batch if task_id not in failed]
+            errors = self._drop_failed(batch, failed)
+            for task_id in task_ids:
+                self._attempts.pop(task_id, None)
+            await self._cache_results(rows, batch)
+
+            try:
+                await self.repo.set_tasks_status(task_ids, LlmTaskStatus.COMPLETE)
+                await self.repo.set_tasks_status(errors, LlmTaskStatus.ERROR)
+                await self.repo.clear_journaled_results(self.worker_id, task_ids + errors)
+            except Exception as e:
+                # 커밋은 됐으므로 다시 flush 해도 같은 값으로 UPDATE (상태 전환만 재시도)
+                self.failures += 1
+                print(f"ResultSink: 상태 전환 실패 ({len(task_ids) + len(errors)}건, 다음 주기에 재시도): {e}")
+                for task_id in errors:
+                    # 다음 flush 에서 다시 실패하면 바로 ERROR 전환
+                    self._attempts[task_id] = self.max_attempts - 1
+                self._buffer = {**{task_id: batch[task_id] for task_id in task_ids + errors}, **self._buffer}
+                return 0
+            for task_id in task_ids + errors:
+                self._inputs.pop(task_id, None)
+            self.flushes += 1
+            self.flushed_tasks += len(task_ids)
+            return len(task_ids)
+
+    async def _commit(self, batch: dict[str, Any]) -> tuple[list[dict[str, Any]], dict[str, Exception]]:
+        """
+        배치 UPDATE 후 커밋. 특정 행 때문에 실패하면 반으로 나눠 다시 저장해 실패한 행만 골라낸다.
+        반환 : (갱신된 행, 저장하지 못한 task_id → 예외). DB 연결 장애는 그대로 올린다.
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                return await ModelLogsRepository(db).bulk_update_ai_output(list(batch.items())), {}
+        except Exception as e:
+            if _is_outage(e):
+                raise
+            if len(batch) == 1:
+                return [], {task_id: e for task_id in batch}
+
+        items = list(batch.items())
+        middle = len(items) // 2
+        rows, failed = await self._commit(dict(items[:middle]))
+        more_rows, more_failed = await self._commit(dict(items[middle:]))
+        return rows + more_rows, {**failed, **more_failed}
+
+    def _drop_failed(self, batch: dict[str, Any], failed: dict[str, Exception]) -> list[str]:
+        """
+        저장하지 못한 행 처리 : max_attempts 에 못 미치면 버퍼에 되돌려 재시도
+        반환 : max_attempts 번 실패해 ERROR 로 전환할 task_id 목록
+        """
+        if not failed:
+            return []
+        self.failures += 1
+
+        errors, retry = [], {}
+        for task_id, error in failed.items():
+            attempts = self._attempts.get(task_id, 0) + 1
+            if attempts >= self.max_attempts:
+                print(f"ResultSink: 결과 저장 {attempts}회 실패 → ERROR | task_id={task_id} | {error}")
+                self._attempts.pop(task_id, None)
+                errors.append(task_id)
+            else:
+                print(f"ResultSink: 결과 저장 실패 ({attempts}/{self.max_attempts}) | task_id={task_id} | {error}")
+                self._attempts[task_id] = attempts
+                retry[task_id] = batch[task_id]
+
+        self.rejected += len(errors)
+        self._buffer = {**retry, **self._buffer}
+        return errors
+
+    async def _cache_results(self, rows: list[dict[str, Any]], batch: dict[str, Any]):
+        """커밋된 결과로 완료 응답 캐시 채움 (실패해도 API 가 DB 에서 조회하므로 무시)"""
+        if self.result_cache is None or not rows:
+            return
+        try:
+            await self.result_cache.put_many(
+                {
+                    task_id: build_task_detail(
+                        row["task_id"], row["task_type_code"], self._inputs[task_id], batch[task_id]
+                    )
+                    for row in rows
+                    if (task_id := str(row["task_id"])) in self._inputs
+                }
+            )
+        except Exception as e:
+            print(f"ResultSink: 완료 응답 캐시 저장 실패: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "pending": len(self._buffer),
+            "flushes": self.flushes,
+            "flushed_tasks": self.flushed_tasks,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+    async def close(self):
+        """백그라운드 flush 중지 후 남은 결과 커밋"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        # 남은 결과(DB 장애 등)는 다른 워커가 바로 복구하도록 생존 표시 삭제
+        await self.repo.unregister_journal(self.worker_id)
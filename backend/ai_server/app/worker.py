@@ -1,13 +1,28 @@
 import asyncio
 import json
-from typing import Any, Awaitable, Callable
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Optional
 
 from common.core.codes import LlmTaskStatus, LlmTaskType
 from common.core.config import settings
 from common.core.database import AsyncSessionLocal
+from common.index_output import compact_index_output, expand_index_output
 from common.repositories.model_logs_repo import ModelLogsRepository
 from common.repositories.redis_repo import RedisRepository
-from app.engine import LLMEngine
+from common.repositories.result_cache import TaskResultCache, build_task_detail
+from app.engine import LLMEngine, is_valid_json
+from app.inference_executor import CancelToken, InferenceCancelled, InferenceTimeout, bind_token
+from app.result_sink import ResultSink
+
+# 실행 중인 작업의 CancelToken (취소 요청 수신 시 사용)
+_running_tokens: dict[str, CancelToken] = {}
+
+# 작업 결과 write-behind 저장 (run_worker 에서 생성, None 이면 작업마다 바로 저장)
+_result_sink: Optional[ResultSink] = None
+
+# 완료된 작업 상세 응답 캐시 (run_worker 에서 생성, None 이면 캐시하지 않음)
+_result_cache: Optional[TaskResultCache] = None
 
 
 async def _execute_task_with_logging(
@@ -23,6 +38,10 @@ async def _execute_task_with_logging(
     - ModelLog 저장 실패는 무시
     - AI 처리 실패 시 ERROR 상태 전환 (원본 버그 수정)
 
+    ResultSink 사용 시 결과는 버퍼에 넣고 바로 반환하며,
+    배치 커밋이 끝난 뒤에 COMPLETE 로 전환된다 (저장 실패 시 재시도, COMPLETE 로 넘기지 않음.
+    같은 결과가 RESULT_SINK_MAX_ATTEMPTS 번 저장에 실패하면 ERROR).
+
     매개변수:
         payload: Redis에서 가져온 작업 데이터
         repo: RedisRepository 인스턴스
@@ -30,25 +49,56 @@ async def _execute_task_with_logging(
     """
     # task_id는 run_worker에서 검증됨
     task_id = payload.get("task_id")
-    
+
+    # 대기 중에 취소된 작업은 처리하지 않음
+    if task_id and await repo.is_cancel_requested(task_id):
+        print(f"취소된 작업 건너뜀 | task_id={task_id}")
+        await repo.set_task_metadata(task_id, LlmTaskStatus.CANCELLED)
+        return
+
     # 상태를 PROCESSING으로 변경
     if task_id:
         await repo.set_task_metadata(task_id, LlmTaskStatus.PROCESSING)
 
-    # 실제 처리 로직 실행 (에러 발생 시 ERROR 상태로 전환)
+    # 실제 처리 로직 실행 (에러 발생 시 ERROR, 취소 시 CANCELLED 상태로 전환)
+    # 작업 마감 시각 + 취소 플래그를 가진 토큰을 묶어 그 안의 모든 추론 호출에 적용
+    token = CancelToken(task_id, timeout=settings.TASK_TIMEOUT)
+    if task_id:
+        _running_tokens[task_id] = token
     try:
-        input_data, ai_output = await process_func(payload)
+        with bind_token(token):
+            input_data, ai_output = await process_func(payload)
+    except InferenceCancelled as e:
+        timed_out = isinstance(e, InferenceTimeout)
+        print(f"작업 {'시간 초과' if timed_out else '취소'}: {e}")
+        if task_id:
+            await repo.set_task_metadata(
+                task_id,
+                LlmTaskStatus.ERROR if timed_out else LlmTaskStatus.CANCELLED,
+                error=str(e),
+            )
+        return
     except Exception as e:
         print(f"작업 처리 실패: {e}")
         if task_id:
             await repo.set_task_metadata(task_id, LlmTaskStatus.ERROR)
         raise
+    finally:
+        _running_tokens.pop(task_id, None)
+
+    # write-behind: 배치 커밋 후 ResultSink 가 COMPLETE 처리
+    # (완료 응답 캐시는 메모리에 있는 입력 원문으로 생성 - model_logs.input_data 와 같은 텍스트)
+    if _result_sink is not None and task_id:
+        input_text = input_data.get("text") if isinstance(input_data, dict) else None
+        await _result_sink.submit(task_id, ai_output, input_text if isinstance(input_text, str) else None)
+        return
 
     # model_logs에 저장 (원본 로직: 실패해도 무시하고 COMPLETE 처리)
+    record = None
     try:
         async with AsyncSessionLocal() as db:
             logs_repo = ModelLogsRepository(db)
-            await logs_repo.update_by_task_id(
+            record = await logs_repo.update_by_task_id(
                 task_id=task_id,
                 ai_output=ai_output,
                 user_decision=None,
@@ -56,49 +106,196 @@ async def _execute_task_with_logging(
     except Exception as e:
         print(f"model_logs 저장 실패: {e}")
 
+    # 완료 응답 캐시 (실패해도 API 가 DB 에서 조회)
+    if record is not None and _result_cache is not None:
+        try:
+            await _result_cache.put(
+                task_id,
+                build_task_detail(record.task_id, record.task_type_code, record.input_data, ai_output),
+            )
+        except Exception as e:
+            print(f"완료 응답 캐시 저장 실패: {e}")
+
     # 상태를 COMPLETE로 변경
     if task_id:
         await repo.set_task_metadata(task_id, LlmTaskStatus.COMPLETE)
 
 
+async def _load_body_text(repo: RedisRepository, payload: dict) -> str:
+    """
+    큐 메시지의 본문 복원. 본문이 없거나 복원할 수 없으면 "" (호출한 쪽이 model_logs 에서 조회)
+    (참조 blob 이 만료/삭제됐거나 재전달된 메시지라 이미 discard 된 경우 등)
+    """
+    try:
+        return await repo.load_body(payload) or ""
+    except (KeyError, ValueError, zlib.error) as e:
+        print(f"큐 본문 복원 실패 → model_logs 에서 조회 | task_id={payload.get('task_id')} | {e}")
+        return ""
+
+
 async def handle_doc_index(payload: dict, engine: LLMEngine, repo: RedisRepository):
-    """문서 색인 핸들러 (분할 + 색인)    
+    """문서 색인 핸들러 (분할 + 색인)
+
+    base_task_id 가 있으면 이전 색인 결과와 비교해 편집 영역만 다시 분할하고,
+    청크 해시가 같은 청크는 이전 색인 결과를 재사용한다.
     """
 
     async def process(payload: dict) -> tuple[dict, Any]:
         task_id = payload.get("task_id")
-        text = ""
+        base_task_id = payload.get("base_task_id")
+        base_text, base_sections = "", []
 
-        try:
-            async with AsyncSessionLocal() as db:
-                logs_repo = ModelLogsRepository(db)
-                record = await logs_repo.get_by_task_id(task_id=task_id)
-                if record and record.input_data:
-                    text = record.input_data
-        except Exception as e:
-            print(f"model_logs 로드 실패: {e}")
+        # 본문은 큐 메시지(인라인/참조)에서 복원, 없거나 복원할 수 없으면(이전 형식 메시지, blob 만료) model_logs 에서 조회
+        text = await _load_body_text(repo, payload)
+        if not text or base_task_id:
+            try:
+                async with AsyncSessionLocal() as db:
+                    logs_repo = ModelLogsRepository(db)
+                    if not text:
+                        record = await logs_repo.get_by_task_id(task_id=task_id)
+                        if record and record.input_data:
+                            text = record.input_data
+
+                    if base_task_id:
+                        base_record = await logs_repo.get_by_task_id(task_id=base_task_id)
+                        if base_record and isinstance(base_record.ai_output, list):
+                            base_text = base_record.input_data or ""
+                            base_sections = expand_index_output(base_record.ai_output, base_text)
+            except Exception as e:
+                print(f"model_logs 로드 실패: {e}")
 
         if not text:
             raise ValueError(f"입력 텍스트를 찾을 수 없습니다. task_id={task_id}")
 
         print(
             f"문서 색인(DOC_INDEX) 수신 | task_id={task_id} | len(text)={len(text)}"
+            f" | base_task_id={base_task_id}"
         )
 
-        # 문서 분할
-        split_texts = await engine.split_document(text)
+        # 문서 분할 (이전 결과가 있으면 편집 영역만) + 토큰 예산 조정
+        min_tokens = payload.get("chunk_min_tokens")
+        max_tokens = payload.get("chunk_max_tokens")
+        if base_text and base_sections:
+            split_texts, spans_reused = await engine.split_document_incremental(
+                text, base_text, base_sections, min_tokens, max_tokens
+            )
+        else:
+            split_texts = await engine.split_document(text, min_tokens, max_tokens)
+            spans_reused = 0
         input_data = {"text": text}
 
-        print(f"   분할 완료: {len(split_texts)} 청크(chunks)")
-        
-        # 문서 색인
-        indices = await engine.index_section(split_texts)
-        
-        ai_output = indices
+        print(f"   분할 완료: {len(split_texts)} 청크(chunks) | 재분할 생략 {spans_reused}")
+
+        # 내용이 바뀌지 않은 청크는 이전 색인 결과 재사용
+        previous = {
+            section["chunk_hash"]: section
+            for section in base_sections
+            if isinstance(section, dict) and section.get("chunk_hash")
+        }
+        targets = [chunk for chunk in split_texts if chunk["chunk_hash"] not in previous]
+
+        # 문서 색인 (신규/변경 청크만)
+        indexed = {section["seq"]: section for section in await engine.index_section(targets)}
+
+        ai_output = []
+        for chunk in split_texts:
+            if chunk["seq"] in indexed:
+                ai_output.append(indexed[chunk["seq"]])
+                continue
+            ai_output.append(
+                {
+                    **previous[chunk["chunk_hash"]],
+                    "seq": chunk["seq"],
+                    "original_text": chunk["text"],
+                    "start": chunk["start"],
+                    "end": chunk["end"],
+                    "header_path": chunk["header_path"],
+                    "header_spans": chunk["header_spans"],
+                }
+            )
+
+        chunks_reused = len(split_texts) - len(targets)
+        print(f"   색인 완료: 재사용 {chunks_reused} / 재계산 {len(targets)}")
+        await repo.set_task_metadata(
+            task_id,
+            LlmTaskStatus.PROCESSING,
+            chunks_reused=chunks_reused,
+            chunks_recomputed=len(targets),
+        )
+
+        # original_text 는 원문(input_data) 오프셋으로 대체해 저장
+        if settings.INDEX_OUTPUT_COMPACT:
+            ai_output = compact_index_output(ai_output, text)
+
         return input_data, ai_output
 
     await _execute_task_with_logging(payload, repo, process)
 
+async def handle_doc_generate(payload: dict, engine: LLMEngine, repo: RedisRepository):
+    """문서 생성 핸들러 (토큰 스트리밍)
+
+    생성 조각을 task_stream:{task_id} 에 delta 이벤트로 바로 추가하고,
+    끝나면 조립한 결과를 done 이벤트로 보낸 뒤 model_logs 에 저장한다.
+    첫 가시 토큰까지 걸린 시간(ttfvt_ms)은 작업 메타데이터에도 기록한다.
+    """
+
+    async def process(payload: dict) -> tuple[dict, Any]:
+        task_id = payload.get("task_id")
+
+        # 본문은 큐 메시지(인라인/참조)에서 복원, 없거나 복원할 수 없으면 model_logs 에서 조회
+        text = await _load_body_text(repo, payload)
+        if not text:
+            try:
+                async with AsyncSessionLocal() as db:
+                    logs_repo = ModelLogsRepository(db)
+                    record = await logs_repo.get_by_task_id(task_id=task_id)
+                    if record and record.input_data:
+                        text = record.input_data
+            except Exception as e:
+                print(f"model_logs 로드 실패: {e}")
+
+        if not text:
+            raise ValueError(f"입력 텍스트를 찾을 수 없습니다. task_id={task_id}")
+
+        max_tokens = int(payload.get("max_tokens") or settings.GENERATE_MAX_TOKENS)
+        print(f"문서 생성(DOC_GENERATE) 수신 | task_id={task_id} | len(text)={len(text)}")
+
+        started = time.perf_counter()
+        ttfvt_ms = None
+        pieces = []
+        try:
+            async for piece in engine.stream_document(text, max_tokens=max_tokens):
+                pieces.append(piece)
+                await repo.append_stream(task_id, {"event": "delta", "text": piece})
+                if ttfvt_ms is None and piece.strip():
+                    ttfvt_ms = round((time.perf_counter() - started) * 1000, 1)
+                    await repo.set_task_metadata(
+                        task_id, LlmTaskStatus.PROCESSING, ttfvt_ms=ttfvt_ms
+                    )
+        except Exception as e:
+            # 스트림 구독자가 무한 대기하지 않도록 에러 이벤트 전달
+            await repo.append_stream(task_id, {"event": "error", "message": str(e)})
+            raise
+
+        content = "".join(pieces).strip()
+        total_ms = round((time.perf_counter() - started) * 1000, 1)
+        ai_output = {
+            "content": content,
+            "valid_json": is_valid_json(content),
+            "ttfvt_ms": ttfvt_ms,
+            "total_ms": total_ms,
+        }
+        await repo.append_stream(
+            task_id, {"event": "done", "data": json.dumps(ai_output, ensure_ascii=False)}
+        )
+        print(f"   생성 완료: ttfvt={ttfvt_ms}ms | total={total_ms}ms | 조각 {len(pieces)}")
+
+        input_data = {"text": text}
+        return input_data, ai_output
+
+    await _execute_task_with_logging(payload, repo, process)
+
+
 async def handle_doc_update(payload: dict, engine: LLMEngine, repo: RedisRepository):
     """문서 업데이트 핸들러"""
 
@@ -166,64 +363,102 @@ async def handle_merge_prop(payload: dict, engine: LLMEngine, repo: RedisReposit
     await _execute_task_with_logging(payload, repo, process)
 
 
+async def listen_cancel_requests(repo: RedisRepository):
+    """취소 요청(pub/sub)을 받아 실행 중인 작업의 토큰 취소 → 생성 스레드가 다음 스텝에서 멈춤"""
+    while True:
+        try:
+            async for task_id in repo.listen_cancel():
+                token = _running_tokens.get(task_id)
+                if token is not None:
+                    print(f"작업 취소 요청 수신 | task_id={task_id}")
+                    token.cancel("cancel requested")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"취소 채널 구독 오류: {e}")
+            await asyncio.sleep(1)
+
+
 async def run_worker():
+    global _result_sink, _result_cache
+
     repo = RedisRepository(settings.REDIS_URL)
     engine = LLMEngine()
 
+    if settings.RESULT_CACHE_ENABLED:
+        _result_cache = TaskResultCache(settings.REDIS_URL)
+    if settings.RESULT_SINK_ENABLED:
+        _result_sink = ResultSink(repo, result_cache=_result_cache)
+        await _result_sink.start()
+
     # 작업 유형(Task Type)별 핸들러 매핑 (확장 가능한 구조)
     task_handlers = {
         LlmTaskType.DOC_INDEX: handle_doc_index,
         LlmTaskType.DOC_UPDATE: handle_doc_update,
+        LlmTaskType.DOC_GENERATE: handle_doc_generate,
     }
 
     print(f"지식 워커(Knowledge Worker) 시작됨. API: {settings.API_SERVER_URL}")
     print(f"등록된 핸들러: {list(task_handlers.keys())}")
 
-    while True:
-        try:
-            payload = await repo.dequeue(timeout=5)
-            if not payload:
-                continue
-
-            print(f"큐에서 수신됨: {payload}")
-            
-            # 1. task_id 검증
-            task_id = payload.get("task_id")
-            if not task_id:
-                print(f"페이로드에 task_id가 누락되었습니다: {payload}")
-                continue
+    # 취소 요청 수신 (작업 처리와 동시에 실행)
+    cancel_listener = asyncio.create_task(listen_cancel_requests(repo))
 
-            # 2. task_type 검증 및 변환
-            raw_task = payload.get("task_type")
-
-            # 작업 유형이 없으면 오류 처리
-            if raw_task is None:
-                print(f"페이로드에 작업 유형(task_type)이 누락되었습니다: {payload}")
-                continue
-
-            # 작업 유형 변환
+    try:
+        while True:
             try:
-                task_type = (
-                    raw_task
-                    if isinstance(raw_task, LlmTaskType)
-                    else LlmTaskType(raw_task)
-                )
-                # 검증된 task_type을 payload에 업데이트 (선택 사항이지만 안전을 위해)
-                # payload["task_type"] = task_type.value # 필요시
-            except ValueError:
-                print(f"알 수 없는 작업 유형(task_type): {raw_task}, payload: {payload}")
-                continue
-
-            # 핸들러 매핑에서 적절한 핸들러 찾기
-            handler = task_handlers.get(task_type)
-            if handler:
-                await handler(payload, engine, repo)
-            else:
-                print(f"해당 작업 유형(task_type)에 대한 핸들러가 없습니다: {task_type}, payload: {payload}")
-        except Exception as e:
-            print(f"워커 오류: {e}")
-            await asyncio.sleep(1)
+                payload = await repo.dequeue(timeout=5)
+                if not payload:
+                    continue
 
+                print(f"큐에서 수신됨: { {k: v for k, v in payload.items() if k != 'body'} }")
+            
+                # 1. task_id 검증
+                task_id = payload.get("task_id")
+                if not task_id:
+                    print(f"페이로드에 task_id가 누락되었습니다: {payload}")
+                    continue
+
+                # 2. task_type 검증 및 변환
+                raw_task = payload.get("task_type")
+
+                # 작업 유형이 없으면 오류 처리
+                if raw_task is None:
+                    print(f"페이로드에 작업 유형(task_type)이 누락되었습니다: {payload}")
+                    continue
+
+                # 작업 유형 변환
+                try:
+                    task_type = (
+                        raw_task
+                        if isinstance(raw_task, LlmTaskType)
+                        else LlmTaskType(raw_task)
+                    )
+                    # 검증된 task_type을 payload에 업데이트 (선택 사항이지만 안전을 위해)
+                    # payload["task_type"] = task_type.value # 필요시
+                except ValueError:
+                    print(f"알 수 없는 작업 유형(task_type): {raw_task}, payload: {payload}")
+                    continue
+
+                # 핸들러 매핑에서 적절한 핸들러 찾기
+                handler = task_handlers.get(task_type)
+                if handler:
+                    try:
+                        await handler(payload, engine, repo)
+                    finally:
+                        # 참조로 전달된 본문 blob 정리
+                        await repo.discard_body(payload)
+                else:
+                    print(f"해당 작업 유형(task_type)에 대한 핸들러가 없습니다: {task_type}, payload: {payload}")
+            except Exception as e:
+                print(f"워커 오류: {e}")
+                await asyncio.sleep(1)
+
+    finally:
+        # 종료 시 버퍼에 남은 결과 커밋
+        cancel_listener.cancel()
+        if _result_sink is not None:
+            await _result_sink.close()
 
 if __name__ == "__main__":
     asyncio.run(run_worker())
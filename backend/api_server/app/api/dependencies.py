@@ -5,6 +5,9 @@ dependencies 모듈은 FastAPI Depends로 객체를 생성·주입하는 조립
 Router는 여기서 준비된 Service/Repository를 받아 사용하고, 비즈니스 로직은 이곳에 두지 않는다.
 """
 
+from functools import lru_cache
+from typing import Optional
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from common.core.database import get_db
@@ -13,6 +16,7 @@ from common.core.config import settings
 # 각 계층(Layer)별 클래스 임포트
 from common.repositories.section_repo import SectionRepository as SctRepo
 from common.repositories.redis_repo import RedisRepository as RdsRepo
+from common.repositories.result_cache import TaskResultCache
 
 from app.services.document_adaption import DocumentAdaptionService as DocSvc
 from app.services.common_code_service import CommonCodeService as CCSrvc
@@ -33,6 +37,15 @@ def get_redis_repo() -> RdsRepo:
     return RdsRepo(settings.REDIS_URL)
 
 
+@lru_cache
+def _task_result_cache() -> TaskResultCache:
+    # 프로세스당 하나 (연결 풀 재사용)
+    return TaskResultCache(settings.REDIS_URL)
+
+def get_result_cache() -> Optional[TaskResultCache]:
+    return _task_result_cache() if settings.RESULT_CACHE_ENABLED else None
+
+
 # ---------------------- Common Code ----------------------
 def get_common_code_repo(db: AsyncSession = Depends(get_db)) -> CCRepo:
     return CCRepo(db)
@@ -62,5 +75,6 @@ def get_document_adaption_service(
     sct_repo: SctRepo = Depends(get_model_sct_repo),
     recipe_repo: RecipeRepo = Depends(get_model_Recipe_repo),
     text_repo: OrigTextRepo = Depends(get_model_text_repo),
+    result_cache: Optional[TaskResultCache] = Depends(get_result_cache),
 ) -> DocSvc:
-    return DocSvc(redis_repo, logs_repo, sct_repo, recipe_repo, text_repo)
\ No newline at end of file
+    return DocSvc(redis_repo, logs_repo, sct_repo, recipe_repo, text_repo, result_cache)
\ No newline at end of file
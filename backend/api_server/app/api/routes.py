@@ -6,13 +6,23 @@ Router는 HTTP 요청을 받아 서비스 계층을 호출하는 용도로만 
 """
 
 from uuid import UUID
+import gzip
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
 from common.schemas import (
     LlmTaskRequest,
     LlmTaskResponse,
     LlmTaskDetailResponse,
+    IndexBatchResponse,
+    TaskBatchProgressResponse,
+    TaskStatusBatchRequest,
+    TaskStatusBatchResponse,
+    DedupeStatsResponse,
+    CommonCodeCacheStatsResponse,
     DocProposalResponse,
     DocUpdateRequest,
     DocUpdateResponse,
@@ -28,6 +38,23 @@ from app.api.dependencies import (
 
 router = APIRouter()
 
+
+def _cached_json_response(
+    etag: str, data: bytes, if_none_match: Optional[str], accept_encoding: Optional[str]
+) -> Response:
+    """완료 응답 캐시 바이트를 그대로 응답 (ETag 일치 시 304, gzip 을 받지 않는 클라이언트는 압축 해제)"""
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if accept_encoding and "gzip" in accept_encoding.lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=data, media_type="application/json", headers=headers)
+    return Response(content=gzip.decompress(data), media_type="application/json", headers=headers)
+
+
 @router.get(
     "/tasks/{task_id}/status",
     response_model=LlmTaskResponse,
@@ -57,12 +84,36 @@ async def get_task_status(
     
     return status_res
 
+@router.post(
+    "/tasks/status:batch",
+    response_model=TaskStatusBatchResponse,
+)
+async def get_tasks_status(
+    request: TaskStatusBatchRequest,
+    service: DocSvc = Depends(get_document_adaption_service)
+):
+    """[LLM 작업 상태 일괄 조회]
+
+    task_ids: 조회할 task_id 목록 (최대 TASK_STATUS_BATCH_MAX 개)
+    statuses: task_id → 작업 상태 (찾을 수 없으면 null)
+    """
+    try:
+        return await service.get_tasks_status(request.task_ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
 @router.get(
     "/tasks/{task_id}/detail",
     response_model=LlmTaskDetailResponse,
 )
 async def get_task_detail(
     task_id: str,
+    include_text: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
     service: DocSvc = Depends(get_document_adaption_service)
 ):
     """[LLM 작업 상세 조회]
@@ -71,10 +122,18 @@ async def get_task_detail(
     task_type: 작업 유형
     task_status: 작업 상태
     results: 작업 결과
+    include_text: DOC_INDEX 섹션에 original_text 포함 (기본은 input_data 의 start/end 오프셋만)
+
+    완료된 작업은 캐시된 응답 바이트를 그대로 반환 (ETag, If-None-Match 일치 시 304)
     """
+    # 0. 완료 응답 캐시
+    cached = await service.get_cached_task_detail(task_id, include_text=include_text)
+    if cached is not None:
+        return _cached_json_response(*cached, if_none_match, accept_encoding)
+
     # 1. 상태 조회 (Redis)
     try:
-        status_res = await service.get_task_detail(task_id)
+        status_res = await service.get_task_detail(task_id, include_text=include_text)
     except KeyError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -89,22 +148,158 @@ async def get_task_detail(
     return status_res
 
 
+@router.post(
+    "/tasks/{task_id}/cancel",
+    response_model=LlmTaskResponse,
+)
+async def cancel_task(
+    task_id: str,
+    service: DocSvc = Depends(get_document_adaption_service)
+):
+    """[LLM 작업 취소]
+
+    대기 중이면 바로 CANCELLED, 처리 중이면 실행 중인 생성을 중단시키고 워커가 CANCELLED 로 전환
+    """
+    try:
+        return await service.cancel_task(task_id)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except ValueError as e:
+         raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/tasks/{task_id}/stream")
+async def stream_task_events(
+    task_id: str,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    service: DocSvc = Depends(get_document_adaption_service)
+):
+    """[LLM 작업 스트림 구독 (SSE)]
+
+    event: delta (생성 조각 {"text"}) / done (최종 결과) / error / end
+    재연결 시 Last-Event-ID 헤더 이후 이벤트부터 전달
+    """
+    try:
+        events = await service.open_task_stream(task_id, last_event_id)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except ValueError as e:
+         raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/documents/generate", response_model=LlmTaskResponse)
+async def request_document_generation(
+    req: LlmTaskRequest,
+    service: DocSvc = Depends(get_document_adaption_service),
+):
+    """[문서 생성 api]
+    원문 → JSON 생성, 생성 토큰은 /tasks/{task_id}/stream 으로 실시간 구독
+    최종 결과는 /tasks/{task_id}/detail 에서도 조회
+    """
+    try:
+        return await service.request_document_generation(req.text, max_tokens=req.max_tokens)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.post("/documents/index", response_model=LlmTaskResponse)
 async def request_document_indexing(
     req: LlmTaskRequest,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
     service: DocSvc = Depends(get_document_adaption_service),
 ):
     """[문서 색인 api]
     문서 분할 + 문서 색인
+    base_task_id 를 주면 이전 색인 결과 중 바뀌지 않은 청크는 재사용
+    chunk_min_tokens / chunk_max_tokens 로 청크 토큰 예산 지정
+    같은 Idempotency-Key 또는 같은 내용의 재요청은 기존 task_id 반환 (deduplicated=true)
     """
     try:
-        return await service.request_document_indexing(req.text)
+        return await service.request_document_indexing(
+            req.text,
+            base_task_id=req.base_task_id,
+            chunk_min_tokens=req.chunk_min_tokens,
+            chunk_max_tokens=req.chunk_max_tokens,
+            idempotency_key=idempotency_key,
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     
+@router.post("/documents/index:batch", response_model=IndexBatchResponse)
+async def request_document_indexing_batch(
+    req: LlmTaskRequest,
+    service: DocSvc = Depends(get_document_adaption_service),
+):
+    """[문서 일괄 색인 api]
+    texts 의 문서를 한 번에 등록 (최대 INDEX_BULK_MAX_TEXTS 개)
+    chunk_min_tokens / chunk_max_tokens 는 모든 문서에 적용
+    batch_id 와 texts 순서의 task_ids 반환, 진행 상황은 /documents/index/batches/{batch_id}
+    """
+    try:
+        return await service.request_document_indexing_batch(
+            req.texts,
+            chunk_min_tokens=req.chunk_min_tokens,
+            chunk_max_tokens=req.chunk_max_tokens,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/documents/index/batches/{batch_id}", response_model=TaskBatchProgressResponse)
+async def get_index_batch_progress(
+    batch_id: str,
+    service: DocSvc = Depends(get_document_adaption_service),
+):
+    """[문서 일괄 색인 진행 상황] 상태별 작업 수 (pending / processing / complete / error / cancelled)"""
+    try:
+        return await service.get_batch_progress(batch_id)
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/documents/index/stats", response_model=DedupeStatsResponse)
+async def get_index_dedupe_stats(
+    service: DocSvc = Depends(get_document_adaption_service),
+):
+    """[문서 색인 중복 제거 통계] 요청 수, 중복 적중 수, 적중률"""
+    return await service.get_dedupe_stats()
+
+
 @router.get("/documents/proposal", response_model=DocProposalResponse)
 async def get_merge_proposal(
     task_id: str,
@@ -161,4 +356,12 @@ async def get_document(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document(Recipe) {doc_id} not found",
         )
-    return doc
\ No newline at end of file
+    return doc
+
+
+@router.get("/codes/cache/stats", response_model=CommonCodeCacheStatsResponse)
+async def get_common_code_cache_stats(
+    service: CCSrvc = Depends(get_common_code_service),
+):
+    """[공통 코드 캐시 통계] 캐시 나이, 버전, 적중/미적중 수"""
+    return service.cache_stats()
@@ -2,6 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware # 1. 이거 임포트 필수
 from app.api.routes import router
 from common.core.config import settings
+from common.core.database import AsyncSessionLocal
+from common.repositories.common_code_repo import CommonCodeRepository
+from app.services.common_code_service import CommonCodeService
 
 app = FastAPI(title="AJC Knowledge System")
 
@@ -15,6 +18,13 @@ app.add_middleware(
 
 app.include_router(router, prefix="/api/v1", tags=["v1"])
 
+@app.on_event("startup")
+async def warm_up_common_codes():
+    # 공통 코드 캐시를 미리 채움 (이후 조회는 메모리에서 처리)
+    if settings.COMMON_CODE_CACHE_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await CommonCodeService(CommonCodeRepository(db)).warm_up()
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
\ No newline at end of file
@@ -6,6 +6,7 @@ Service는 공통 코드 관련 비즈니스 규칙을 처리하고 Repository
 """
 
 from sqlalchemy.exc import IntegrityError
+from common.repositories.common_code_cache import common_code_cache
 from common.repositories.common_code_repo import CommonCodeRepository
 from common.schemas import CommonCodeCreate
 
@@ -40,3 +41,11 @@ class CommonCodeService:
     async def list_all(self):
         """전체 공통 코드를 조회."""
         return await self.repo.get_all()
+
+    async def warm_up(self):
+        """서버 기동 시 공통 코드 캐시를 미리 채움."""
+        await common_code_cache.load(self.repo.db)
+
+    def cache_stats(self) -> dict:
+        """공통 코드 캐시 나이/적중 통계."""
+        return common_code_cache.stats()
@@ -4,18 +4,26 @@ from common.repositories.model_logs_repo import ModelLogsRepository
 from common.repositories.section_repo import SectionRepository
 from common.repositories.doc_recipes_repo import DocRecipesRepository
 from common.repositories.original_texts_repo import OriginalTextsRepository
+from common.repositories.result_cache import TaskResultCache, build_task_detail
 from uuid import UUID
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
+import hashlib
+import unicodedata
 
 from common.schemas import (
     LlmTaskRequest,
     LlmTaskResponse,
     LlmTaskDetailResponse,
+    IndexBatchResponse,
+    TaskBatchProgressResponse,
+    TaskStatusBatchResponse,
+    DedupeStatsResponse,
     DocResponse,
     DocProposalResponse,
     DocUpdateRequest
 )
 from common.core.codes import LlmTaskType, LlmTaskStatus
+from common.core.config import settings
 import uuid, json
 
 
@@ -32,28 +40,301 @@ class DocumentAdaptionService:
         sct_repo: Optional[SectionRepository] = None,
         recipe_repo: Optional[DocRecipesRepository] = None,
         text_repo: Optional[OriginalTextsRepository] = None,
+        result_cache: Optional[TaskResultCache] = None,
     ):
         self.redis_repo = redis_repo
         self.logs_repo = logs_repo
         self.sct_repo = sct_repo
         self.recipe_repo = recipe_repo
         self.text_repo = text_repo
+        self.result_cache = result_cache
 
-    async def request_document_indexing(self, text) -> LlmTaskResponse:
-        """[문서 색인] 분할 + 색인"""
+    async def request_document_indexing(
+        self,
+        text,
+        base_task_id: Optional[UUID] = None,
+        chunk_min_tokens: Optional[int] = None,
+        chunk_max_tokens: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> LlmTaskResponse:
+        """[문서 색인] 분할 + 색인
+
+        같은 Idempotency-Key 또는 같은 내용(정규화 후 해시 + 청킹 옵션)으로
+        INDEX_DEDUPE_WINDOW 초 안에 다시 요청하면 새로 등록하지 않고 기존 작업을 반환한다.
+        (기존 작업이 ERROR/CANCELLED 면 새로 등록)
+        """
         if not self.logs_repo:
             raise ValueError("ModelLogsRepository not injected")
+        self._validate_chunk_options(chunk_min_tokens, chunk_max_tokens)
+
+        # 1. Idempotency-Key 재요청
+        if idempotency_key:
+            existing_id = await self.redis_repo.get_idempotency_task(idempotency_key)
+            existing = await self._find_reusable_task(existing_id) if existing_id else None
+            if existing:
+                await self.redis_repo.record_dedupe("idempotency_key")
+                return existing
 
         task_id = uuid.uuid4()
         task_type = LlmTaskType.DOC_INDEX
         task_status = LlmTaskStatus.PENDING
 
+        # 2. 같은 내용의 완료/진행 중 작업
+        content_hash = None
+        if settings.INDEX_DEDUPE_WINDOW > 0:
+            content_hash = self._content_hash(
+                text,
+                base_task_id=base_task_id,
+                chunk_min_tokens=chunk_min_tokens,
+                chunk_max_tokens=chunk_max_tokens,
+            )
+            existing_id = await self.redis_repo.claim_dedupe_key(
+                content_hash, str(task_id), settings.INDEX_DEDUPE_WINDOW
+            )
+            if existing_id:
+                # 해시는 있는데 메타데이터가 없으면 등록 중인 작업
+                existing = await self._find_reusable_task(existing_id, in_flight_if_missing=True)
+                if existing:
+                    if idempotency_key:
+                        await self.redis_repo.set_idempotency_task(
+                            idempotency_key, existing_id, settings.IDEMPOTENCY_KEY_TTL
+                        )
+                    await self.redis_repo.record_dedupe("content")
+                    return existing
+                await self.redis_repo.set_dedupe_key(
+                    content_hash, str(task_id), settings.INDEX_DEDUPE_WINDOW
+                )
+
         payload = {
             "task_id": str(task_id),
             "task_type": task_type.value,
             "task_status": task_status.value,
             # "text": text,
         }
+        if base_task_id:
+            # 이전 색인 결과 기준 증분 청킹
+            payload["base_task_id"] = str(base_task_id)
+        # 요청별 청크 토큰 예산 (없으면 워커 설정값)
+        if chunk_min_tokens is not None:
+            payload["chunk_min_tokens"] = chunk_min_tokens
+        if chunk_max_tokens is not None:
+            payload["chunk_max_tokens"] = chunk_max_tokens
+
+        try:
+            await self.logs_repo.create(
+                operator_seq=None,
+                team_seq=None,
+                task_type_code=task_type,
+                task_id=task_id,
+                input_data=text,
+                ai_output=None,
+                user_decision=None,
+            )
+            await self.redis_repo.enqueue(key_name="task_id", payload=payload, body=text)
+        except Exception:
+            if content_hash:
+                await self.redis_repo.release_dedupe_key(content_hash, str(task_id))
+            raise
+
+        if idempotency_key:
+            await self.redis_repo.set_idempotency_task(
+                idempotency_key, str(task_id), settings.IDEMPOTENCY_KEY_TTL
+            )
+        await self.redis_repo.record_dedupe()
+
+        return LlmTaskResponse(
+            task_id=task_id,
+            task_type=task_type,
+            task_status=task_status
+        )
+    
+    async def request_document_indexing_batch(
+        self,
+        texts: Optional[List[str]],
+        chunk_min_tokens: Optional[int] = None,
+        chunk_max_tokens: Optional[int] = None,
+    ) -> IndexBatchResponse:
+        """[문서 일괄 색인] 여러 문서를 한 번에 등록
+
+        - model_logs multi-row INSERT 1번 + Redis 파이프라인 1번 (작업 Hash, 큐 메시지, 배치 메타데이터)
+        - 같은 배치 안의 같은 내용 문서는 작업 하나로 합침
+          (다른 요청과의 내용 중복은 확인하지 않고, 이후 단건 요청이 이 작업을 재사용할 수 있게 해시만 등록)
+        - 진행 상황은 /documents/index/batches/{batch_id}
+        """
+        if not self.logs_repo:
+            raise ValueError("ModelLogsRepository not injected")
+        if not texts:
+            raise ValueError("texts 가 비어 있습니다.")
+        if len(texts) > settings.INDEX_BULK_MAX_TEXTS:
+            raise ValueError(f"texts 는 최대 {settings.INDEX_BULK_MAX_TEXTS}개까지 등록할 수 있습니다.")
+        if any(not text for text in texts):
+            raise ValueError("texts 에 빈 문서가 있습니다.")
+        self._validate_chunk_options(chunk_min_tokens, chunk_max_tokens)
+
+        batch_id = str(uuid.uuid4())
+        task_type = LlmTaskType.DOC_INDEX
+        task_status = LlmTaskStatus.PENDING
+
+        task_ids: List[UUID] = []
+        by_hash: dict[str, UUID] = {}
+        rows, items = [], []
+        for text in texts:
+            content_hash = self._content_hash(
+                text,
+                base_task_id=None,
+                chunk_min_tokens=chunk_min_tokens,
+                chunk_max_tokens=chunk_max_tokens,
+            )
+            if content_hash in by_hash:
+                task_ids.append(by_hash[content_hash])
+                continue
+
+            task_id = uuid.uuid4()
+            by_hash[content_hash] = task_id
+            task_ids.append(task_id)
+
+            payload = {
+                "task_id": str(task_id),
+                "task_type": task_type.value,
+                "task_status": task_status.value,
+                "batch_id": batch_id,
+            }
+            if chunk_min_tokens is not None:
+                payload["chunk_min_tokens"] = chunk_min_tokens
+            if chunk_max_tokens is not None:
+                payload["chunk_max_tokens"] = chunk_max_tokens
+            rows.append(
+                {
+                    "operator_seq": None,
+                    "team_seq": None,
+                    "task_type_code": task_type.value,
+                    "task_id": task_id,
+                    "input_data": text,
+                }
+            )
+            items.append((payload, text))
+
+        await self.logs_repo.bulk_create(rows)
+        await self.redis_repo.enqueue_many(key_name="task_id", items=items, batch_id=batch_id)
+        if settings.INDEX_DEDUPE_WINDOW > 0:
+            await self.redis_repo.add_dedupe_keys(
+                {content_hash: str(task_id) for content_hash, task_id in by_hash.items()},
+                settings.INDEX_DEDUPE_WINDOW,
+            )
+
+        return IndexBatchResponse(batch_id=uuid.UUID(batch_id), task_ids=task_ids)
+
+    async def get_batch_progress(self, batch_id: str) -> TaskBatchProgressResponse:
+        """일괄 등록 배치의 상태별 작업 수 (작업 상태 전환 시 누적되는 집합 크기, 개별 작업 조회 없음)"""
+        try:
+            uuid.UUID(batch_id)
+        except ValueError:
+            raise ValueError("batch_id 형식이 올바르지 않습니다.")
+
+        progress = await self.redis_repo.get_batch_progress(batch_id)
+        if not progress:
+            raise KeyError("배치를 찾을 수 없습니다.")
+
+        total = int(progress["total"])
+        processing = progress["processing"]
+        done = progress["complete"] + progress["error"] + progress["cancelled"]
+        return TaskBatchProgressResponse(
+            batch_id=uuid.UUID(batch_id),
+            total=total,
+            pending=max(total - processing - done, 0),
+            processing=processing,
+            complete=progress["complete"],
+            error=progress["error"],
+            cancelled=progress["cancelled"],
+            finished=done >= total,
+        )
+
+    @staticmethod
+    def _validate_chunk_options(chunk_min_tokens: Optional[int], chunk_max_tokens: Optional[int]):
+        if chunk_min_tokens is not None and chunk_min_tokens < 0:
+            raise ValueError("chunk_min_tokens 는 0 이상이어야 합니다.")
+        if chunk_max_tokens is not None and chunk_max_tokens < 1:
+            raise ValueError("chunk_max_tokens 는 1 이상이어야 합니다.")
+        if chunk_min_tokens and chunk_max_tokens and chunk_min_tokens > chunk_max_tokens:
+            raise ValueError("chunk_min_tokens 가 chunk_max_tokens 보다 클 수 없습니다.")
+
+    @staticmethod
+    def _content_hash(text: str, **options) -> str:
+        """정규화한 본문(NFC, 줄바꿈 통일, 줄 끝 공백 제거) + 옵션의 sha256"""
+        normalized = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+        normalized = "\n".join(line.rstrip() for line in normalized.split("\n")).strip()
+
+        digest = hashlib.sha256()
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalized.encode("utf-8"))
+        return digest.hexdigest()
+
+    async def _find_reusable_task(
+        self, task_id: str, in_flight_if_missing: bool = False
+    ) -> Optional[LlmTaskResponse]:
+        """재사용할 수 있는(완료/진행 중) 기존 작업이면 응답 DTO, 아니면 None"""
+        meta = await self.redis_repo.get_task_metadata(task_id)
+        if not meta:
+            if not in_flight_if_missing:
+                return None
+            return LlmTaskResponse(
+                task_id=uuid.UUID(task_id),
+                task_type=LlmTaskType.DOC_INDEX,
+                task_status=LlmTaskStatus.PENDING,
+                deduplicated=True,
+            )
+
+        try:
+            task_status = LlmTaskStatus(meta.get("task_status"))
+            task_type = LlmTaskType(meta.get("task_type", LlmTaskType.DOC_INDEX.value))
+        except ValueError:
+            return None
+        if task_status in (LlmTaskStatus.ERROR, LlmTaskStatus.CANCELLED):
+            return None
+
+        return LlmTaskResponse(
+            task_id=uuid.UUID(task_id),
+            task_type=task_type,
+            task_status=task_status,
+            deduplicated=True,
+        )
+
+    async def get_dedupe_stats(self) -> DedupeStatsResponse:
+        """색인 요청 중복 제거 통계 (hit_rate = hits / requests)"""
+        stats = {key: int(value) for key, value in (await self.redis_repo.get_dedupe_stats()).items()}
+        requests = stats.get("requests", 0)
+        hits = stats.get("hits", 0)
+        return DedupeStatsResponse(
+            requests=requests,
+            hits=hits,
+            hits_content=stats.get("hits_content", 0),
+            hits_idempotency_key=stats.get("hits_idempotency_key", 0),
+            hit_rate=round(hits / requests, 4) if requests else 0.0,
+        )
+
+    async def request_document_generation(
+        self, text, max_tokens: Optional[int] = None
+    ) -> LlmTaskResponse:
+        """[문서 생성] 원문 → JSON 생성 (토큰 스트리밍, /tasks/{task_id}/stream 으로 구독)"""
+        if not self.logs_repo:
+            raise ValueError("ModelLogsRepository not injected")
+        if not text:
+            raise ValueError("text 가 비어 있습니다.")
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError("max_tokens 는 1 이상이어야 합니다.")
+
+        task_id = uuid.uuid4()
+        task_type = LlmTaskType.DOC_GENERATE
+        task_status = LlmTaskStatus.PENDING
+
+        payload = {
+            "task_id": str(task_id),
+            "task_type": task_type.value,
+            "task_status": task_status.value,
+        }
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
 
         await self.logs_repo.create(
             operator_seq=None,
@@ -64,14 +345,78 @@ class DocumentAdaptionService:
             ai_output=None,
             user_decision=None,
         )
-        await self.redis_repo.enqueue(key_name="task_id", payload=payload)
+        await self.redis_repo.enqueue(key_name="task_id", payload=payload, body=text)
 
         return LlmTaskResponse(
             task_id=task_id,
             task_type=task_type,
             task_status=task_status
         )
-    
+
+    async def open_task_stream(
+        self, task_id: str, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        작업 스트림 구독 - SSE 문자열을 내보내는 비동기 이터레이터 반환
+        작업이 없으면 스트림을 열기 전에 KeyError (404)
+        """
+        await self._fetch_task_state_from_redis(task_id)
+        return self._iter_task_events(task_id, last_event_id or "0-0")
+
+    async def _iter_task_events(self, task_id: str, last_id: str) -> AsyncIterator[str]:
+        """task_stream:{task_id} 를 XREAD 로 따라가며 SSE 이벤트로 변환 (done/error 에서 종료)"""
+        while True:
+            entries = await self.redis_repo.read_stream(
+                task_id, last_id, block_ms=settings.TASK_STREAM_BLOCK_MS
+            )
+            if not entries:
+                # 새 이벤트 없음: 작업이 이미 끝났으면(스트림 만료 등) 종료, 아니면 keep-alive
+                try:
+                    task_status, _ = await self._fetch_task_state_from_redis(task_id)
+                except KeyError:
+                    return
+                if task_status in (
+                    LlmTaskStatus.COMPLETE, LlmTaskStatus.ERROR, LlmTaskStatus.CANCELLED
+                ):
+                    yield f"event: end\ndata: {json.dumps({'task_status': task_status.value})}\n\n"
+                    return
+                yield ": keep-alive\n\n"
+                continue
+
+            for event_id, fields in entries:
+                last_id = event_id
+                event = fields.get("event", "message")
+                if "data" in fields:
+                    data = fields["data"]
+                else:
+                    data = json.dumps(
+                        {k: v for k, v in fields.items() if k != "event"}, ensure_ascii=False
+                    )
+                yield f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+                if event in ("done", "error"):
+                    return
+
+    async def cancel_task(self, task_id: str) -> LlmTaskResponse:
+        """
+        작업 취소
+        - PENDING: 바로 CANCELLED (워커는 꺼낼 때 취소 표시를 보고 건너뜀)
+        - PROCESSING: 워커에 취소 요청, 생성이 멈추면 워커가 CANCELLED 로 전환
+        """
+        task_status, task_type = await self._fetch_task_state_from_redis(task_id)
+        if task_status in (LlmTaskStatus.COMPLETE, LlmTaskStatus.ERROR, LlmTaskStatus.CANCELLED):
+            raise ValueError(f"이미 종료된 작업입니다. task_status={task_status.value}")
+
+        await self.redis_repo.request_cancel(task_id)
+        if task_status == LlmTaskStatus.PENDING:
+            await self.redis_repo.set_task_metadata(task_id, LlmTaskStatus.CANCELLED)
+            task_status = LlmTaskStatus.CANCELLED
+
+        return LlmTaskResponse(
+            task_id=uuid.UUID(task_id),
+            task_type=task_type,
+            task_status=task_status
+        )
+
     async def _fetch_task_state_from_redis(self, task_id: str):
         """Redis에서 작업 메타데이터 조회 및 파싱 (공통 로직)"""
         meta = await self.redis_repo.get_task_metadata(task_id)
@@ -106,7 +451,51 @@ class DocumentAdaptionService:
             results=None
         )
 
-    async def get_task_detail(self, task_id: str) -> LlmTaskDetailResponse:
+    async def get_tasks_status(self, task_ids: List[str]) -> TaskStatusBatchResponse:
+        """
+        작업 상태 일괄 조회
+        - Redis 파이프라인 한 번으로 모든 작업의 task_status 조회
+        - 해시가 없는(만료된) 작업만 model_logs 를 한 번 조회해 결과가 저장돼 있으면 COMPLETE
+        - 그래도 알 수 없는 작업은 null
+        """
+        if len(task_ids) > settings.TASK_STATUS_BATCH_MAX:
+            raise ValueError(f"task_ids 는 최대 {settings.TASK_STATUS_BATCH_MAX}개까지 조회할 수 있습니다.")
+        task_ids = list(dict.fromkeys(task_ids))
+
+        statuses: dict[str, Optional[LlmTaskStatus]] = {}
+        missing: dict[str, str] = {}  # 정규화한 UUID 문자열 → 요청한 task_id
+        for task_id, value in zip(task_ids, await self.redis_repo.get_tasks_status(task_ids)):
+            statuses[task_id] = None
+            if value is not None:
+                try:
+                    statuses[task_id] = LlmTaskStatus(value)
+                except ValueError:
+                    pass
+                continue
+            try:
+                missing[str(uuid.UUID(task_id))] = task_id
+            except ValueError:
+                pass
+
+        if missing and self.logs_repo:
+            flags = await self.logs_repo.get_output_flags([uuid.UUID(key) for key in missing])
+            for key, task_id in missing.items():
+                if flags.get(key):
+                    statuses[task_id] = LlmTaskStatus.COMPLETE
+
+        return TaskStatusBatchResponse(statuses=statuses)
+
+    async def get_cached_task_detail(self, task_id: str, include_text: bool = False) -> Optional[tuple[str, bytes]]:
+        """완료 응답 캐시 조회 → (ETag, gzip JSON 바이트), 없으면 None"""
+        if self.result_cache is None:
+            return None
+        data = await self.result_cache.get(task_id, include_text)
+        if data is None:
+            return None
+        return TaskResultCache.etag(data), data
+
+    async def get_task_detail(self, task_id: str, include_text: bool = False) -> LlmTaskDetailResponse:
+        """작업 상세 조회 (include_text 면 DOC_INDEX compact 결과에 섹션 original_text 복원)"""
         # 1. Redis 조회 (공통 로직 사용)
         task_status, task_type = await self._fetch_task_state_from_redis(task_id)
 
@@ -122,15 +511,20 @@ class DocumentAdaptionService:
                 raise KeyError("작업 상태를 찾을 수 없습니다.")
 
         if log:
-            return LlmTaskDetailResponse(
-                task_id=log.task_id,
-                task_type=LlmTaskType(log.task_type_code),
-                task_status=LlmTaskStatus.COMPLETE,
-                results={
-                    "input_data": log.input_data,
-                    "ai_output": log.ai_output
-                }
+            detail = build_task_detail(
+                log.task_id, log.task_type_code, log.input_data, log.ai_output, include_text=include_text
             )
+            # 결과가 저장된 완료 작업만 캐시 (다음 조회부터 바이트 그대로 응답)
+            if (
+                self.result_cache is not None
+                and log.ai_output is not None
+                and task_status == LlmTaskStatus.COMPLETE
+            ):
+                try:
+                    await self.result_cache.put(task_id, detail, include_text)
+                except Exception as e:
+                    print(f"완료 응답 캐시 저장 실패: {e}")
+            return detail
 
         if task_status and task_type:
             return LlmTaskDetailResponse(
@@ -0,0 +1,99 @@
+"""
+대용량 문서 청킹 중 이벤트 루프 지연 벤치마크
+
+10MB 마크다운을 청킹하는 동안 작은 작업(소형 문서 청킹 + 1ms tick)의 지연을 측정한다.
+    inline : 이벤트 루프에서 직접 청킹 (기존 방식)
+    pool   : ChunkingService 프로세스 풀
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=.:ai_server python benchmarks/bench_chunking_latency.py --size-mb 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+from app.chunking import ChunkingService  # noqa: E402
+
+SECTION = "## 섹션 {i}\n\n본문 문장입니다. " * 3 + "\n\n- 항목 1\n- 항목 2\n\n"
+SMALL_DOC = "# 작은 문서\n\n짧은 본문입니다.\n\n## 하위\n\n내용입니다.\n"
+
+
+def build_document(size_mb: float) -> str:
+    parts, total, i = ["# 대용량 문서\n\n"], 0, 0
+    target = int(size_mb * 1024 * 1024)
+    while total < target:
+        part = SECTION.format(i=i)
+        parts.append(part)
+        total += len(part.encode("utf-8"))
+        i += 1
+    return "".join(parts)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def run_scenario(name: str, service: ChunkingService, big_doc: str, small_tasks: int):
+    lags, latencies = [], []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - started - 0.001) * 1000)
+
+    async def small_task(delay: float):
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        await service.chunk(SMALL_DOC)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    ticker_task = asyncio.create_task(ticker())
+    small = [asyncio.create_task(small_task(i * 0.01)) for i in range(small_tasks)]
+
+    started = time.perf_counter()
+    await asyncio.sleep(0.005)  # 작은 작업이 먼저 시작되도록
+    spans = await service.chunk(big_doc)
+    big_sec = time.perf_counter() - started
+
+    await asyncio.gather(*small)
+    done.set()
+    await ticker_task
+
+    print(
+        f"{name:<7} | big={big_sec:6.2f}s spans={len(spans):>6} | "
+        f"small p50={percentile(latencies, 0.5):8.1f}ms p99={percentile(latencies, 0.99):8.1f}ms | "
+        f"loop lag p50={statistics.median(lags) if lags else 0:6.1f}ms max={max(lags) if lags else 0:8.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--small-tasks", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    big_doc = build_document(args.size_mb)
+    print(f"document={len(big_doc.encode('utf-8')) / 1024 / 1024:.1f}MB small_tasks={args.small_tasks}")
+
+    inline = ChunkingService(max_workers=0)
+    pool = ChunkingService(max_workers=args.pool_size, threshold=100_000)
+    await pool.chunk("x" * 100_000)  # 풀 워커 기동 시간 제외
+
+    await run_scenario("inline", inline, big_doc, args.small_tasks)
+    await run_scenario("pool", pool, big_doc, args.small_tasks)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
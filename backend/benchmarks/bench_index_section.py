@@ -0,0 +1,68 @@
+"""
+섹션 색인(index_section) 처리량 벤치마크 - 섹션별 생성 vs 배치 생성
+
+작은 모델로 CPU 에서 sections/sec 를 측정한다.
+    sequential : batch_size=1 (섹션마다 generate 1회, 기존 방식과 동일한 호출 수)
+    batched    : batch_size=N (길이순 정렬 + 왼쪽 패딩 배치)
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=.:ai_server python benchmarks/bench_index_section.py \
+        --model sshleifer/tiny-gpt2 --sections 64 --batch-sizes 1 4 8 16
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+SENTENCE = "섹션 본문 문장입니다. "
+
+
+def build_sections(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    sections = []
+    for seq in range(count):
+        text = f"## 섹션 {seq}\n" + SENTENCE * rng.randint(5, 80)
+        sections.append({"seq": seq, "text": text, "header_path": f"/문서/섹션 {seq}"})
+    return sections
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--sections", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--max-new-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    os.environ["LLM_MODEL_NAME"] = args.model
+    os.environ["LLM_LOAD_IN_8BIT"] = "false"
+    os.environ.setdefault("INFERENCE_BACKEND", "hf")
+
+    from app.engine import LLMEngine  # noqa: E402 (환경 변수 설정 후 import)
+
+    engine = LLMEngine()
+    sections = build_sections(args.sections)
+
+    # 워밍업
+    await engine.index_section(sections[:2], batch_size=2, max_new_tokens=args.max_new_tokens)
+
+    print(f"model={args.model} sections={args.sections} max_new_tokens={args.max_new_tokens}")
+    print(f"{'batch':>6} | {'sec':>8} | {'sections/sec':>12}")
+    for batch_size in args.batch_sizes:
+        started = time.perf_counter()
+        results = await engine.index_section(
+            sections, batch_size=batch_size, max_new_tokens=args.max_new_tokens
+        )
+        elapsed = time.perf_counter() - started
+        assert [r["seq"] for r in results] == [s["seq"] for s in sections]
+        print(f"{batch_size:>6} | {elapsed:>8.2f} | {len(sections) / elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
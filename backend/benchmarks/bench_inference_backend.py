@@ -0,0 +1,72 @@
+"""
+OpenAI 호환 추론 백엔드 벤치마크 (vLLM/stub_server.py 대상)
+
+    sequential : 섹션마다 요청을 하나씩 순서대로 보냄
+    fan-out    : generate_batch (연결 풀 + 세마포어 동시 요청)
+    stream     : 첫 조각 도착 시간(TTFT)과 전체 시간
+    embed      : 배치 임베딩 1회
+
+실행 (backend 폴더 기준):
+    python ../vLLM/stub_server.py --port 8001 --delay 0.05 &
+    PYTHONPATH=.:ai_server python benchmarks/bench_inference_backend.py \
+        --base-url http://localhost:8001/v1 --sections 64
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8001/v1")
+    parser.add_argument("--sections", type=int, default=64)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    args = parser.parse_args()
+
+    from app.backends.openai_compat import OpenAICompatibleBackend  # noqa: E402
+    from app.engine import INDEX_PROMPT_PREFIX  # noqa: E402
+
+    backend = OpenAICompatibleBackend(base_url=args.base_url, model="stub")
+    suffixes = [f"Header path: /문서/섹션 {i}\nSection:\n본문 {i}\n\nJSON:" for i in range(args.sections)]
+
+    await backend.generate_batch(INDEX_PROMPT_PREFIX, suffixes[:2], args.max_tokens)  # 연결 워밍업
+
+    started = time.perf_counter()
+    for suffix in suffixes:
+        await backend.generate_batch(INDEX_PROMPT_PREFIX, [suffix], args.max_tokens)
+    sequential = time.perf_counter() - started
+
+    started = time.perf_counter()
+    outputs = await backend.generate_batch(INDEX_PROMPT_PREFIX, suffixes, args.max_tokens)
+    fan_out = time.perf_counter() - started
+    assert len(outputs) == len(suffixes)
+
+    started = time.perf_counter()
+    first_chunk, pieces = None, []
+    async for piece in backend.stream(INDEX_PROMPT_PREFIX, suffixes[0], args.max_tokens):
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - started
+        pieces.append(piece)
+    stream_total = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectors = await backend.embed(suffixes)
+    embed_sec = time.perf_counter() - started
+
+    print(f"sections={args.sections}")
+    print(f"sequential | {sequential:6.2f}s | {args.sections / sequential:8.1f} sections/sec")
+    print(f"fan-out    | {fan_out:6.2f}s | {args.sections / fan_out:8.1f} sections/sec")
+    print(f"stream     | TTFT {first_chunk * 1000:7.1f}ms | total {stream_total * 1000:7.1f}ms | pieces={len(pieces)}")
+    print(f"embed      | {embed_sec * 1000:7.1f}ms | vectors={len(vectors)} dim={len(vectors[0])}")
+
+    await backend.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+generate_document JSON 디코딩 벤치마크 - 자유 생성(+재시도) vs 제약 디코딩
+
+입력마다 generate_document 를 호출해 다음을 비교한다.
+    valid    : 최종 결과가 유효한 JSON 인 비율
+    attempts : 평균 생성 시도 수 (자유 생성은 파싱 실패 시 재시도)
+    tokens   : 평균 생성 토큰 수 (재시도 포함)
+    sec      : 입력당 평균 소요 시간
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=.:ai_server python benchmarks/bench_json_decoding.py \
+        --model sshleifer/tiny-gpt2 --inputs 10 --max-tokens 128
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+SAMPLE_TEXTS = [
+    "회의록: 3월 2일 기획 회의. 참석자 김, 이, 박. 안건은 문서 색인 기능 일정.",
+    "API 명세: POST /documents/index 는 text 를 받아 task_id 를 반환한다.",
+    "장애 보고: 워커가 Redis 연결을 잃어 10분간 작업이 지연되었다.",
+]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--inputs", type=int, default=10)
+    parser.add_argument("--max-tokens", type=int, default=128)
+    args = parser.parse_args()
+
+    os.environ["LLM_MODEL_NAME"] = args.model
+    os.environ["LLM_LOAD_IN_8BIT"] = "false"
+    os.environ.setdefault("INFERENCE_BACKEND", "hf")
+
+    from app.engine import LLMEngine  # noqa: E402 (환경 변수 설정 후 import)
+
+    engine = LLMEngine()
+    texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(args.inputs)]
+
+    print(f"model={args.model} inputs={args.inputs} max_tokens={args.max_tokens}")
+    print(f"{'mode':<12} | {'valid':>6} | {'attempts':>8} | {'tokens':>8} | {'sec':>7}")
+    for name, constrained in (("free+retry", False), ("constrained", True)):
+        valid, attempts, tokens, elapsed = [], [], [], []
+        for text in texts:
+            started = time.perf_counter()
+            result = await engine.generate_document(
+                text, max_tokens=args.max_tokens, constrained=constrained
+            )
+            elapsed.append(time.perf_counter() - started)
+            metadata = result["metadata"]
+            valid.append(metadata["valid_json"])
+            attempts.append(metadata["attempts"])
+            tokens.append(metadata["generated_tokens"])
+
+        print(
+            f"{name:<12} | {sum(valid) / len(valid):>6.0%} | {statistics.mean(attempts):>8.2f} | "
+            f"{statistics.mean(tokens):>8.1f} | {statistics.mean(elapsed):>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,161 @@
+"""
+model_logs task_id 조회 지연 벤치마크 (1M 행)
+
+별도 스키마(bench_model_logs)에 model_logs 와 같은 컬럼의 테이블을 만들어 비교한다.
+    no-index    : 인덱스 없는 힙 테이블 (기존 상태, 순차 스캔)
+    index       : task_id 인덱스 추가
+    partitioned : created_at 월별 파티션 + task_id / (task_type_code, created_at) 인덱스
+조회 쿼리는 ModelLogsRepository.get_by_task_id 와 같다.
+
+실행 (backend 폴더 기준, DB_* 환경 변수 또는 .env 필요):
+    PYTHONPATH=. python benchmarks/bench_model_logs_lookup.py --rows 1000000 --lookups 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+# Settings 필수 값 (벤치마크는 Redis 를 사용하지 않음)
+for key in ("REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+SCHEMA = "bench_model_logs"
+COLUMNS = """
+    log_seq        INTEGER     NOT NULL,
+    operator_seq   INTEGER,
+    team_seq       INTEGER,
+    task_type_code VARCHAR(50) NOT NULL,
+    task_id        UUID,
+    input_data     JSONB,
+    ai_output      JSONB,
+    user_decision  JSONB,
+    created_at     TIMESTAMP   NOT NULL
+"""
+LOOKUP = """
+    SELECT * FROM {table} WHERE task_id = CAST(:task_id AS UUID) ORDER BY log_seq DESC LIMIT 1
+"""
+
+
+async def measure(conn, table: str, task_ids: list[str]) -> list[float]:
+    from sqlalchemy import text
+
+    stmt = text(LOOKUP.format(table=table))
+    timings = []
+    for task_id in task_ids:
+        started = time.perf_counter()
+        row = (await conn.execute(stmt, {"task_id": task_id})).first()
+        timings.append((time.perf_counter() - started) * 1000)
+        assert row is not None
+    return timings
+
+
+def report(name: str, timings: list[float]):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{name:<12} | lookups={len(timings):>4} | p50={statistics.median(timings):9.2f}ms "
+        f"| p95={p95:9.2f}ms | mean={statistics.mean(timings):9.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--scan-lookups", type=int, default=20, help="no-index 조회 횟수 (순차 스캔이라 적게)")
+    parser.add_argument("--payload-bytes", type=int, default=512, help="행마다 input_data 크기")
+    parser.add_argument("--months", type=int, default=12, help="created_at 분포 기간(개월)")
+    parser.add_argument("--keep", action="store_true", help="끝난 뒤 벤치마크 스키마 유지")
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from common.core.config import settings
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    heap, part = f"{SCHEMA}.logs_heap", f"{SCHEMA}.logs_part"
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.execute(text(f"CREATE TABLE {heap} ({COLUMNS})"))
+
+        started = time.perf_counter()
+        await conn.execute(
+            text(
+                f"""
+                INSERT INTO {heap}
+                SELECT
+                    g,
+                    NULL, NULL,
+                    (ARRAY['DOC_INDEX', 'DOC_UPDATE', 'DOC_GENERATE'])[1 + g % 3],
+                    gen_random_uuid(),
+                    jsonb_build_object('text', repeat('x', CAST(:payload_bytes AS INTEGER))),
+                    NULL, NULL,
+                    date_trunc('month', now()) - make_interval(months => CAST(:months AS INTEGER) - 1)
+                        + (g::float / CAST(:rows AS INTEGER)) * (now() - (date_trunc('month', now())
+                        - make_interval(months => CAST(:months AS INTEGER) - 1)))
+                FROM generate_series(1, CAST(:rows AS INTEGER)) AS g
+                """
+            ),
+            {"rows": args.rows, "months": args.months, "payload_bytes": args.payload_bytes},
+        )
+        print(f"rows={args.rows} 적재 {time.perf_counter() - started:.1f}s")
+        await conn.execute(text(f"ANALYZE {heap}"))
+
+    async with engine.connect() as conn:
+        sample = (
+            await conn.execute(
+                text(f"SELECT task_id::text FROM {heap} TABLESAMPLE SYSTEM (1) LIMIT :n"),
+                {"n": args.lookups},
+            )
+        ).scalars().all()
+    task_ids = list(sample)
+    random.shuffle(task_ids)
+
+    async with engine.connect() as conn:
+        report("no-index", await measure(conn, heap, task_ids[: args.scan_lookups]))
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE INDEX ON {heap} (task_id)"))
+        await conn.execute(text(f"ANALYZE {heap}"))
+    async with engine.connect() as conn:
+        report("index", await measure(conn, heap, task_ids))
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(f"CREATE TABLE {part} ({COLUMNS}, PRIMARY KEY (log_seq, created_at)) PARTITION BY RANGE (created_at)")
+        )
+        months = (
+            await conn.execute(
+                text(
+                    f"SELECT DISTINCT date_trunc('month', created_at)::date FROM {heap} ORDER BY 1"
+                )
+            )
+        ).scalars().all()
+        for month in months:
+            await conn.execute(
+                text(
+                    f"CREATE TABLE {SCHEMA}.logs_p{month:%Y%m} PARTITION OF {part} "
+                    f"FOR VALUES FROM ('{month}') TO ('{month}'::date + INTERVAL '1 month')"
+                )
+            )
+        await conn.execute(text(f"CREATE INDEX ON {part} (task_id)"))
+        await conn.execute(text(f"CREATE INDEX ON {part} (task_type_code, created_at)"))
+        await conn.execute(text(f"INSERT INTO {part} SELECT * FROM {heap}"))
+        await conn.execute(text(f"ANALYZE {part}"))
+    async with engine.connect() as conn:
+        report("partitioned", await measure(conn, part, task_ids))
+
+    if not args.keep:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
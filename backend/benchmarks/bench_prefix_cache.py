@@ -0,0 +1,83 @@
+"""
+prefix KV cache 의 time-to-first-token(TTFT) 벤치마크
+
+고정 지시문(prefix) + 요청별 본문(suffix) 프롬프트로 첫 토큰 1개를 생성하는 시간을 측정한다.
+    no-cache : prefix + suffix 전체를 매번 prefill
+    cache    : PrefixCache 의 past_key_values 복사본 사용 (suffix 만 prefill)
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=.:ai_server python benchmarks/bench_prefix_cache.py \
+        --model sshleifer/tiny-gpt2 --prefix-repeat 20 --runs 20
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+
+def measure(model, tokenizer, build_inputs, runs: int) -> list[float]:
+    import torch
+
+    timings = []
+    for i in range(runs):
+        inputs = build_inputs(f"Text: 요청 {i} 본문입니다.\n\nJSON Output:")
+        started = time.perf_counter()
+        with torch.no_grad():
+            model.generate(
+                **inputs,
+                max_new_tokens=1,
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id,
+            )
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--prefix-repeat", type=int, default=20, help="지시문 반복 횟수 (prefix 길이 조절)")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["LLM_MODEL_NAME"] = args.model
+    os.environ["LLM_LOAD_IN_8BIT"] = "false"
+    os.environ["INFERENCE_BACKEND"] = "hf"
+
+    from app.engine import GENERATE_PROMPT_PREFIX, LLMEngine  # noqa: E402 (환경 변수 설정 후 import)
+
+    engine = LLMEngine()
+    backend = engine._backend
+    model, tokenizer, cache = backend.model, backend.tokenizer, backend.prefix_cache
+
+    prefix = GENERATE_PROMPT_PREFIX * args.prefix_repeat
+    cache.register("bench", prefix)
+    prefix_tokens = len(tokenizer(prefix)["input_ids"])
+
+    def no_cache_inputs(suffix: str):
+        return tokenizer(prefix + suffix, return_tensors="pt").to(model.device)
+
+    def cache_inputs(suffix: str):
+        return cache.build_inputs(prefix, suffix)
+
+    # 워밍업 (cache 는 첫 호출에서 prefix 계산)
+    measure(model, tokenizer, no_cache_inputs, 2)
+    measure(model, tokenizer, cache_inputs, 2)
+
+    print(f"model={args.model} prefix_tokens={prefix_tokens} runs={args.runs}")
+    for name, build_inputs in (("no-cache", no_cache_inputs), ("cache", cache_inputs)):
+        timings = measure(model, tokenizer, build_inputs, args.runs)
+        print(
+            f"{name:<9} | TTFT p50={statistics.median(timings):8.2f}ms "
+            f"mean={statistics.mean(timings):8.2f}ms max={max(timings):8.2f}ms"
+        )
+    print(f"cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
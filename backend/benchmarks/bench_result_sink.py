@@ -0,0 +1,122 @@
+"""
+워커 결과 저장 처리량 벤치마크 (작업별 커밋 vs ResultSink 배치 커밋)
+
+model_logs 에 벤치마크용 행(task_type_code='BENCH_RESULT_SINK')을 넣고 같은 결과를 두 방식으로 저장한다.
+    per-task : 기존 워커 방식. 작업마다 세션을 열어 update_by_task_id (SELECT + UPDATE + COMMIT)
+              + set_task_metadata(COMPLETE)
+    sink     : ResultSink.submit 후 close (BATCH_SIZE / FLUSH_INTERVAL 단위 UPDATE ... FROM (VALUES ...))
+끝나면 벤치마크 행과 Redis 메타데이터를 삭제한다 (sink 저널은 close 시 정리됨).
+
+실행 (backend 폴더 기준, DB_* / REDIS_* 환경 변수 또는 .env 필요):
+    PYTHONPATH=.:ai_server python benchmarks/bench_result_sink.py --tasks 2000 --batch-size 50
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+# Settings 필수 값 (벤치마크는 API 서버를 사용하지 않음)
+os.environ.setdefault("API_HOST", "bench")
+
+BENCH_TASK_TYPE = "BENCH_RESULT_SINK"
+
+
+def make_output(index: int, sections: int) -> list[dict]:
+    return [
+        {"title": f"섹션 {index}-{i}", "start": i * 100, "end": (i + 1) * 100, "summary": "요약 " * 20}
+        for i in range(sections)
+    ]
+
+
+async def insert_rows(session_factory, task_ids: list[str]):
+    from sqlalchemy import text
+
+    async with session_factory() as db:
+        await db.execute(
+            text(
+                """
+                INSERT INTO model_logs (task_type_code, task_id, input_data)
+                SELECT :task_type, CAST(t AS UUID), to_jsonb('bench'::text)
+                FROM unnest(CAST(:task_ids AS TEXT[])) AS t
+                """
+            ),
+            {"task_type": BENCH_TASK_TYPE, "task_ids": task_ids},
+        )
+        await db.commit()
+
+
+async def run_per_task(session_factory, repo, outputs: dict) -> float:
+    from common.core.codes import LlmTaskStatus
+    from common.repositories.model_logs_repo import ModelLogsRepository
+
+    started = time.perf_counter()
+    for task_id, ai_output in outputs.items():
+        async with session_factory() as db:
+            await ModelLogsRepository(db).update_by_task_id(task_id, ai_output=ai_output)
+        await repo.set_task_metadata(task_id, LlmTaskStatus.COMPLETE)
+    return time.perf_counter() - started
+
+
+async def run_sink(repo, outputs: dict, batch_size: int, flush_interval: float) -> tuple[float, dict]:
+    from app.result_sink import ResultSink
+
+    sink = ResultSink(repo, batch_size=batch_size, flush_interval=flush_interval, max_pending=batch_size * 10)
+    await sink.start()
+    started = time.perf_counter()
+    for task_id, ai_output in outputs.items():
+        await sink.submit(task_id, ai_output)
+    await sink.close()
+    return time.perf_counter() - started, sink.stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--sections", type=int, default=10, help="작업당 결과 섹션 수")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--flush-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    from sqlalchemy import text
+
+    from common.core.config import settings
+    from common.core.database import AsyncSessionLocal, engine
+    from common.repositories.redis_repo import RedisRepository
+
+    engine.echo = False
+    repo = RedisRepository(settings.REDIS_URL)
+
+    per_task_ids = [str(uuid.uuid4()) for _ in range(args.tasks)]
+    sink_ids = [str(uuid.uuid4()) for _ in range(args.tasks)]
+    try:
+        await insert_rows(AsyncSessionLocal, per_task_ids + sink_ids)
+
+        elapsed = await run_per_task(
+            AsyncSessionLocal, repo, {task_id: make_output(i, args.sections) for i, task_id in enumerate(per_task_ids)}
+        )
+        print(f"per-task | tasks={args.tasks} | {elapsed:6.2f}s | {args.tasks / elapsed:8.1f} tasks/s")
+
+        elapsed, stats = await run_sink(
+            repo,
+            {task_id: make_output(i, args.sections) for i, task_id in enumerate(sink_ids)},
+            args.batch_size,
+            args.flush_interval,
+        )
+        print(
+            f"sink     | tasks={args.tasks} | {elapsed:6.2f}s | {args.tasks / elapsed:8.1f} tasks/s "
+            f"| flushes={stats['flushes']} failures={stats['failures']}"
+        )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM model_logs WHERE task_type_code = :t"), {"t": BENCH_TASK_TYPE})
+            await db.commit()
+        all_ids = per_task_ids + sink_ids
+        await repo.redis.delete(*[f"task_id:{task_id}" for task_id in all_ids])
+        await repo.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+문서 생성 time-to-first-visible-token(TTFVT) 벤치마크 - 일괄 생성 vs 스트리밍
+
+    blocking : generate_document (생성이 끝나야 결과를 받음, TTFVT = 전체 시간)
+    stream   : stream_document 의 첫 비공백 조각 도착 시간과 전체 시간
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=.:ai_server python benchmarks/bench_streaming.py \
+        --model sshleifer/tiny-gpt2 --inputs 5 --max-tokens 128
+    # OpenAI 호환 서버 대상
+    INFERENCE_BACKEND=openai INFERENCE_BASE_URL=http://localhost:8001/v1 \
+        PYTHONPATH=.:ai_server python benchmarks/bench_streaming.py
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+# Settings 필수 값 (벤치마크는 DB/Redis 를 사용하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "REDIS_HOST", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+SAMPLE_TEXT = "회의록: 3월 2일 기획 회의. 참석자 김, 이, 박. 안건은 문서 색인 기능 일정."
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument("--inputs", type=int, default=5)
+    parser.add_argument("--max-tokens", type=int, default=128)
+    args = parser.parse_args()
+
+    os.environ["LLM_MODEL_NAME"] = args.model
+    os.environ["LLM_LOAD_IN_8BIT"] = "false"
+    os.environ.setdefault("INFERENCE_BACKEND", "hf")
+
+    from app.engine import LLMEngine  # noqa: E402 (환경 변수 설정 후 import)
+
+    engine = LLMEngine()
+    await engine.generate_document(SAMPLE_TEXT, max_tokens=8)  # 워밍업
+
+    blocking = []
+    for _ in range(args.inputs):
+        started = time.perf_counter()
+        await engine.generate_document(SAMPLE_TEXT, max_tokens=args.max_tokens)
+        blocking.append((time.perf_counter() - started) * 1000)
+
+    first_visible, totals = [], []
+    for _ in range(args.inputs):
+        started = time.perf_counter()
+        ttfvt = None
+        async for piece in engine.stream_document(SAMPLE_TEXT, max_tokens=args.max_tokens):
+            if ttfvt is None and piece.strip():
+                ttfvt = (time.perf_counter() - started) * 1000
+        totals.append((time.perf_counter() - started) * 1000)
+        first_visible.append(ttfvt if ttfvt is not None else totals[-1])
+
+    print(f"model={args.model} inputs={args.inputs} max_tokens={args.max_tokens}")
+    print(f"blocking | TTFVT p50={statistics.median(blocking):8.1f}ms (= total)")
+    print(
+        f"stream   | TTFVT p50={statistics.median(first_visible):8.1f}ms "
+        f"| total p50={statistics.median(totals):8.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
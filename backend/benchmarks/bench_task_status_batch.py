@@ -0,0 +1,102 @@
+"""
+작업 상태 폴링 벤치마크 - task_id 마다 GET /tasks/{id}/status vs POST /tasks/status:batch 한 번
+
+Redis 에 벤치마크용 작업 해시(task_id:{uuid}) N 개를 만들고 (--expired 비율만큼은 해시를 만들지 않아
+model_logs 조회 경로를 거치게 함) 폴링 한 주기에 걸리는 시간을 비교한다.
+    single-seq : 단건 조회 N 번 순차
+    single-par : 단건 조회 N 번 동시 (--concurrency)
+    batch      : 일괄 조회 1 번
+끝나면 만든 해시를 삭제한다.
+
+실행 (backend 폴더 기준, API 서버 실행 중 + REDIS_* 환경 변수 또는 .env 필요):
+    PYTHONPATH=. python benchmarks/bench_task_status_batch.py --tasks 200 --rounds 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+# Settings 필수 값 (벤치마크는 DB 에 직접 접속하지 않음)
+for key in ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME", "API_HOST"):
+    os.environ.setdefault(key, "bench")
+
+STATUSES = ("PENDING", "PROCESSING", "COMPLETE")
+
+
+async def poll_single(client, task_ids: list[str], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(task_id: str):
+        async with semaphore:
+            response = await client.get(f"/tasks/{task_id}/status")
+            assert response.status_code in (200, 404), response.text
+
+    await asyncio.gather(*(one(task_id) for task_id in task_ids))
+
+
+async def poll_batch(client, task_ids: list[str], batch_max: int):
+    for start in range(0, len(task_ids), batch_max):
+        response = await client.post("/tasks/status:batch", json={"task_ids": task_ids[start : start + batch_max]})
+        response.raise_for_status()
+
+
+async def measure(name: str, rounds: int, poll) -> None:
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await poll()
+        timings.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{name:<10} | rounds={rounds:>3} | p50={statistics.median(timings):9.2f}ms | p95={p95:9.2f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--api", default=None, help="API 주소 (기본 settings.API_SERVER_URL)")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--expired", type=float, default=0.1, help="Redis 해시가 없는 작업 비율 (DB 조회 경로)")
+    args = parser.parse_args()
+
+    import httpx
+
+    from common.core.config import settings
+    from common.repositories.redis_repo import RedisRepository
+
+    repo = RedisRepository(settings.REDIS_URL)
+    task_ids = [str(uuid.uuid4()) for _ in range(args.tasks)]
+    seeded = task_ids[int(len(task_ids) * args.expired) :]
+
+    async with repo.redis.pipeline(transaction=False) as pipe:
+        for i, task_id in enumerate(seeded):
+            pipe.hset(
+                f"task_id:{task_id}",
+                mapping={"task_id": task_id, "task_type": "DOC_INDEX", "task_status": STATUSES[i % len(STATUSES)]},
+            )
+            pipe.expire(f"task_id:{task_id}", 600)
+        await pipe.execute()
+
+    base_url = f"{(args.api or settings.API_SERVER_URL).rstrip('/')}/api/v1"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            await poll_batch(client, task_ids, settings.TASK_STATUS_BATCH_MAX)  # 워밍업
+            print(f"tasks={args.tasks} (Redis 해시 없음 {args.tasks - len(seeded)}) concurrency={args.concurrency}")
+            await measure("single-seq", args.rounds, lambda: poll_single(client, task_ids, 1))
+            await measure("single-par", args.rounds, lambda: poll_single(client, task_ids, args.concurrency))
+            await measure(
+                "batch", args.rounds, lambda: poll_batch(client, task_ids, settings.TASK_STATUS_BATCH_MAX)
+            )
+    finally:
+        if seeded:
+            await repo.redis.delete(*[f"task_id:{task_id}" for task_id in seeded])
+        await repo.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
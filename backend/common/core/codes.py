@@ -15,6 +15,7 @@ class LlmTaskType(str, Enum):
     """LLM 작업 유형 (common_codes.code_value)."""
     DOC_INDEX = "DOC_INDEX" # 문서 분할 + 문서 색인
     DOC_UPDATE = "DOC_UPDATE"
+    DOC_GENERATE = "DOC_GENERATE"  # 문서 생성 (스트리밍)
 
 
 class LlmTaskStatus(str, Enum):
@@ -23,4 +24,5 @@ class LlmTaskStatus(str, Enum):
     PROCESSING = "PROCESSING"  # 처리중
     COMPLETE = "COMPLETE"    # 완료
     ERROR = "ERROR"          # 오류
+    CANCELLED = "CANCELLED"  # 취소됨
 
@@ -19,8 +19,100 @@ class Settings(BaseSettings):
 
     HF_TOKEN: Optional[str] = None
 
+    # AI 서버 모델
+    LLM_MODEL_NAME: str = "google/gemma-2-2b"
+    LLM_LOAD_IN_8BIT: bool = True
+    EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # 추론 백엔드 - hf: 워커 프로세스에서 모델 실행 / openai: OpenAI 호환 서버(vLLM, TGI) 호출
+    INFERENCE_BACKEND: str = "hf"
+    INFERENCE_BASE_URL: str = "http://localhost:8001/v1"
+    INFERENCE_API_KEY: Optional[str] = None
+    INFERENCE_MODEL: Optional[str] = None  # 없으면 LLM_MODEL_NAME
+    INFERENCE_TOKENIZER: Optional[str] = None  # 토큰 수 계산용 (없으면 INFERENCE_MODEL)
+    INFERENCE_TIMEOUT: float = 120.0
+    INFERENCE_MAX_CONNECTIONS: int = 32
+    INFERENCE_CONCURRENCY: int = 16
+    INFERENCE_GUIDED_JSON: bool = True  # 제약 디코딩 시 vLLM guided_json 사용
+
+    # 추론 전용 스레드 풀 (실행 중 + 대기 중 호출이 WORKERS + MAX_QUEUE 를 넘으면 거절)
+    INFERENCE_WORKERS: int = 1
+    INFERENCE_MAX_QUEUE: int = 8
+    INFERENCE_CALL_TIMEOUT: float = 300.0  # 추론 호출 1회 마감 시간(초)
+    TASK_TIMEOUT: float = 1800.0  # 작업 1건 전체 마감 시간(초)
+    TASK_CANCEL_CHANNEL: str = "task_cancel"  # 작업 취소 요청 pub/sub 채널
+
+    # 섹션 색인 배치 생성
+    INDEX_BATCH_SIZE: int = 8
+    INDEX_MAX_NEW_TOKENS: int = 128
+    # 색인 결과(ai_output)에 original_text 대신 원문 오프셋(start, end)만 저장
+    INDEX_OUTPUT_COMPACT: bool = True
+
+    # 고정 프롬프트 prefix KV cache (가용 메모리 비율이 MIN_FREE_RATIO 미만이면 제거)
+    PREFIX_CACHE_ENABLED: bool = True
+    PREFIX_CACHE_MAX_MB: int = 512
+    PREFIX_CACHE_MIN_FREE_RATIO: float = 0.1
+
+    # 문서 생성 JSON 제약 디코딩 (False 면 자유 생성 + 파싱 실패 시 재시도)
+    GENERATE_CONSTRAINED: bool = True
+    GENERATE_JSON_RETRIES: int = 2
+    GENERATE_MAX_TOKENS: int = 512
+
+    # 색인 요청 중복 제거 (같은 내용이 WINDOW 초 안에 다시 오면 기존 task_id 반환, 0 이면 끔)
+    INDEX_DEDUPE_WINDOW: int = 600
+    IDEMPOTENCY_KEY_TTL: int = 86400  # Idempotency-Key 헤더 보관 시간(초)
+
+    # API → 워커 본문 전달 (압축 후 INLINE_MAX_BYTES 이하면 큐 메시지에 인라인, 초과하면 blob 참조)
+    PAYLOAD_INLINE_MAX_BYTES: int = 64 * 1024
+    PAYLOAD_COMPRESS_MIN_BYTES: int = 1024
+    PAYLOAD_BLOB_STORE: str = "redis"  # redis | local
+    PAYLOAD_BLOB_DIR: str = "/tmp/ajc_payloads"  # local 일 때 API/워커 공유 디렉터리
+    PAYLOAD_BLOB_TTL: int = 86400
+
+    # model_logs 월별 파티션 보존 기간 (jobs/model_logs_retention.py)
+    MODEL_LOGS_RETENTION_MONTHS: int = 6  # 이 기간보다 오래된 파티션은 정리
+    MODEL_LOGS_PARTITION_MONTHS_AHEAD: int = 3  # 미리 만들어 둘 미래 파티션 개월 수
+    MODEL_LOGS_ARCHIVE_DIR: Optional[str] = None  # 지정하면 삭제 전 gzip JSONL 로 보관
+
+    # 워커 결과 write-behind 저장 (BATCH_SIZE 건 또는 FLUSH_INTERVAL 초마다 한 번에 커밋)
+    RESULT_SINK_ENABLED: bool = True
+    RESULT_SINK_BATCH_SIZE: int = 50
+    RESULT_SINK_FLUSH_INTERVAL: float = 0.2
+    RESULT_SINK_MAX_PENDING: int = 500  # 이 이상이면 submit 이 flush 로 줄 때까지 대기 (DB 장애 시 새 작업 중단 → 메모리/저널 제한)
+    RESULT_SINK_OWNER_TTL: int = 30  # 워커 저널 생존 표시 TTL (초), 만료되면 다른 워커가 저널을 복구
+    RESULT_SINK_MAX_ATTEMPTS: int = 3  # 같은 행이 이 횟수만큼 저장에 실패하면 작업을 ERROR 로 전환
+
+    # POST /documents/index:batch 한 번에 등록할 수 있는 문서 수
+    INDEX_BULK_MAX_TEXTS: int = 1000
+
+    # POST /tasks/status:batch 한 번에 조회할 수 있는 task_id 수
+    TASK_STATUS_BATCH_MAX: int = 500
+
+    # 완료된 작업 상세 응답 캐시 (gzip 바이트, 압축 후 MAX_BYTES 를 넘는 응답은 캐시하지 않음)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL: int = 86400
+    RESULT_CACHE_MAX_BYTES: int = 4 * 1024 * 1024
+    RESULT_CACHE_GZIP_LEVEL: int = 6
+
+    # 공통 코드 프로세스 캐시 (CHECK_INTERVAL 초마다 Redis 버전 카운터 확인, 바뀌면 전체 다시 로드)
+    COMMON_CODE_CACHE_ENABLED: bool = True
+    COMMON_CODE_CACHE_CHECK_INTERVAL: float = 5.0
+
+    # 생성 스트리밍 (Redis stream task_stream:{task_id})
+    TASK_STREAM_MAXLEN: int = 10_000
+    TASK_STREAM_TTL: int = 86400
+    TASK_STREAM_BLOCK_MS: int = 15_000
+
     BACKEND_CORS_ORIGINS: list[str] = ["*"]
 
+    # 문서 청킹 프로세스 풀 (THRESHOLD 문자 이상인 문서만 풀에서 처리)
+    CHUNK_POOL_SIZE: int = 2
+    CHUNK_POOL_THRESHOLD: int = 200_000
+
+    # 청크 토큰 예산 기본값 (요청별 chunk_min_tokens/chunk_max_tokens 로 변경 가능)
+    CHUNK_MIN_TOKENS: int = 64
+    CHUNK_MAX_TOKENS: int = 1024
+
     @computed_field
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,41 @@
+"""
+사용법 참고:
+
+DOC_INDEX 결과(model_logs.ai_output) 의 compact 형식 변환.
+compact 형식은 섹션마다 original_text 를 복사하지 않고 input_data(원문) 의 (start, end) 오프셋만 가진다.
+    compact_index_output : 워커가 저장 전에 original_text 제거 (오프셋으로 복원 가능한 섹션만)
+    expand_index_output  : 조회 시 원문에서 original_text 복원
+"""
+
+from typing import Any
+
+
+def _restorable(section: Any, text: str) -> bool:
+    """오프셋으로 original_text 를 똑같이 복원할 수 있는 섹션인지"""
+    if not isinstance(section, dict):
+        return False
+    start, end = section.get("start"), section.get("end")
+    if not isinstance(start, int) or not isinstance(end, int) or not 0 <= start <= end <= len(text):
+        return False
+    original = section.get("original_text")
+    return original is None or text[start:end] == original
+
+
+def compact_index_output(sections: list[Any], text: str) -> list[Any]:
+    """original_text 를 (start, end) 오프셋으로 대체 (복원할 수 없는 섹션은 그대로 둠)"""
+    compacted = []
+    for section in sections:
+        if _restorable(section, text) and "original_text" in section:
+            section = {key: value for key, value in section.items() if key != "original_text"}
+        compacted.append(section)
+    return compacted
+
+
+def expand_index_output(sections: list[Any], text: str) -> list[Any]:
+    """compact 섹션에 original_text 복원 (이미 있거나 오프셋이 없으면 그대로 둠)"""
+    expanded = []
+    for section in sections:
+        if _restorable(section, text) and "original_text" not in section:
+            section = {**section, "original_text": text[section["start"]:section["end"]]}
+        expanded.append(section)
+    return expanded
@@ -0,0 +1,441 @@
+"""
+사용법 참고:
+
+헤더 기반 마크다운 스트리밍 청커. 외부 의존성 없이 원문 문자열 위의 span 만 생성한다.
+    (seq, start, end, header_path) - text[start:end] 가 청크 내용
+
+- 청크는 헤더 줄에서 시작해 다음 헤더 줄 직전에서 끝난다 (코드 블록 ``` 내부의 # 은 헤더가 아님)
+- span 들은 이어 붙이면 원문 전체가 된다 (공백뿐인 머리말은 다음 청크에 포함)
+- header_path 는 data_categorize.build_sections 와 동일:
+  현재 헤더를 depth 에 기록하고 더 깊은 depth 를 제거한 뒤 "/" + "/".join(depth 순 제목)
+- 메모리는 청크 수에 비례 (헤더 후보 줄만 슬라이스하고 본문은 복사하지 않음)
+
+AI 서버(engine)와 data/ 파이프라인(data_categorize) 양쪽에서 사용한다.
+"""
+
+import hashlib
+import re
+from typing import Callable, Iterator, Optional
+
+# (seq, start, end, header_path)
+Span = tuple[int, int, int, str]
+
+# 헤더/코드 펜스 후보 줄 (줄 앞 공백 허용, 줄바꿈은 넘지 않음)
+_CANDIDATE_LINE = re.compile(r"^[^\S\n]*(?:#{1,6}\s|<h[1-6]|```)", re.MULTILINE | re.IGNORECASE)
+_NON_SPACE = re.compile(r"\S")
+
+
+def clean_header_text(text: str) -> str:
+    # HTML 태그 제거
+    text = re.sub(r"<[^>]+>", "", text)
+
+    # Markdown 강조 제거
+    text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+    text = re.sub(r"\*(.*?)\*", r"\1", text)
+    text = re.sub(r"__(.*?)__", r"\1", text)
+    text = re.sub(r"_(.*?)_", r"\1", text)
+
+    return text.strip()
+
+
+def parse_markdown_header(text: str) -> Optional[tuple[int, str]]:
+    """
+    마크다운 헤더(#, ##, ### ...)를 파싱
+    반환:
+      - (depth, header_text)
+      - 헤더가 아니면 None
+    """
+    text = text.strip()
+
+    md_match = re.match(r"^(#{1,6})\s+(.*)", text)
+    if md_match:
+        depth = len(md_match.group(1))
+        header_text = md_match.group(2)
+
+        header_text = clean_header_text(header_text)
+        return depth, header_text
+
+    html_match = re.match(
+        r"^<h([1-6])[^>]*>(.*?)</h\1>",
+        text,
+        flags=re.IGNORECASE
+    )
+    if html_match:
+        depth = int(html_match.group(1))
+        header_text = html_match.group(2)
+
+        header_text = clean_header_text(header_text)
+        return depth, header_text
+
+    return None
+
+
+def format_header_path(headers: dict[int, str]) -> str:
+    return "/" + "/".join(headers[d] for d in sorted(headers))
+
+
+def _apply_header(headers: dict[int, str], depth: int, header_text: str):
+    # 현재 depth 의 헤더 갱신 후 하위 depth 제거
+    headers[depth] = header_text
+    for d in list(headers.keys()):
+        if d > depth:
+            del headers[d]
+
+
+def _iter_header_lines(text: str, start: int, end: int) -> Iterator[tuple[int, int, str]]:
+    """[start, end) 에서 코드 블록 밖의 헤더 줄 (line_start, depth, header_text)"""
+    in_code_block = False
+    for match in _CANDIDATE_LINE.finditer(text, start, end):
+        line_start = match.start()
+        line_end = text.find("\n", line_start, end)
+        line = text[line_start: end if line_end == -1 else line_end]
+
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block:
+            continue
+
+        parsed = parse_markdown_header(line)
+        if parsed:
+            yield line_start, parsed[0], parsed[1]
+
+
+def header_state_at(text: str, pos: int, start: int = 0) -> dict[int, str]:
+    """
+    text[start:pos] 의 헤더를 모두 적용한 상태 (pos 부터 이어서 청킹할 때 사용)
+    start 는 문서 시작 또는 최상위(#) 헤더로 시작하는 청크 경계여야 한다.
+    """
+    headers: dict[int, str] = {}
+    for _, depth, header_text in _iter_header_lines(text, start, pos):
+        _apply_header(headers, depth, header_text)
+    return headers
+
+
+def _iter_spans_with_state(
+    text: str,
+    start: int,
+    end: int,
+    headers: dict[int, str],
+    seq_start: int,
+) -> Iterator[tuple[Span, dict[int, str]]]:
+    """(span, span 끝 시점의 헤더 상태) - 상태 dict 는 갱신되므로 필요하면 복사해서 사용"""
+    seq = seq_start
+    chunk_start = start
+
+    for line_start, depth, header_text in _iter_header_lines(text, start, end):
+        # 공백뿐인 머리말은 별도 청크로 만들지 않음
+        if line_start > chunk_start and _NON_SPACE.search(text, chunk_start, line_start):
+            yield (seq, chunk_start, line_start, format_header_path(headers)), headers
+            seq += 1
+            chunk_start = line_start
+
+        _apply_header(headers, depth, header_text)
+
+    if end > chunk_start and _NON_SPACE.search(text, chunk_start, end):
+        yield (seq, chunk_start, end, format_header_path(headers)), headers
+
+
+def iter_markdown_spans(
+    text: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    headers: Optional[dict[int, str]] = None,
+    seq_start: int = 0,
+) -> Iterator[Span]:
+    """
+    text[start:end] 를 헤더 단위로 나눈 span 을 순서대로 생성
+
+    start 는 청크 경계(헤더 줄 시작 또는 문서 시작)여야 하며,
+    headers 로 start 이전의 헤더 상태를 넘기면 header_path 가 이어진다.
+    """
+    end = len(text) if end is None else end
+    for span, _ in _iter_spans_with_state(text, start, end, dict(headers or {}), seq_start):
+        yield span
+
+
+def chunk_markdown(text: str) -> list[Span]:
+    return list(iter_markdown_spans(text))
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _common_prefix_len(a: str, b: str) -> int:
+    # 슬라이스 비교(memcmp) 기반 이분 탐색 - 문자 단위 파이썬 루프 회피
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_len(a: str, b: str, limit: int) -> int:
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid: len(a) - lo] == b[len(b) - mid: len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def rechunk_incremental(
+    old_text: str,
+    old_spans: list[Span],
+    new_text: str,
+) -> tuple[list[Span], int]:
+    """
+    수정된 문서를 편집 영역 주변만 다시 청킹
+
+    1. 이전/현재 문서의 공통 접두사·접미사로 편집 영역을 찾는다
+    2. 편집 시작 위치를 포함하는 청크(헤더 경계)부터 다시 청킹한다
+    3. 편집 영역 뒤에서 이전 청크와 위치(길이 차이만큼 이동)·header_path 가 같은 청크가 나오면
+       거기서 멈추고 나머지 이전 청크를 그대로 재사용한다
+
+    코드 펜스(```)가 편집 영역에 있으면 이후 헤더 해석이 달라질 수 있으므로 끝까지 다시 청킹한다.
+    반환 : (새 span 목록, 재청킹 없이 재사용한 span 수)
+    """
+    if not old_spans or old_spans[-1][2] != len(old_text):
+        return chunk_markdown(new_text), 0
+
+    prefix = _common_prefix_len(old_text, new_text)
+    if prefix == len(old_text) == len(new_text):
+        return list(old_spans), len(old_spans)
+
+    suffix = _common_suffix_len(old_text, new_text, min(len(old_text), len(new_text)) - prefix)
+    old_edit_end = len(old_text) - suffix
+    new_edit_end = len(new_text) - suffix
+    delta = len(new_text) - len(old_text)
+
+    # 편집 시작 위치를 포함하는 청크 (경계에 걸친 삽입이면 앞 청크부터)
+    first = 0
+    for i, (_, start, _, _) in enumerate(old_spans):
+        if start >= prefix:
+            break
+        first = i
+    # 청크의 헤더 줄 자체가 편집되면 헤더가 아니게 될 수 있으므로 앞 청크부터
+    header_end = old_text.find("\n", old_spans[first][1])
+    if first > 0 and (header_end == -1 or header_end >= prefix):
+        first -= 1
+
+    fence_edited = "```" in old_text[prefix:old_edit_end] or "```" in new_text[prefix:new_edit_end]
+
+    resume = old_spans[first][1]
+    # resume 이전은 편집되지 않았으므로 헤더 상태는 이전 문서와 동일
+    # 가장 가까운 최상위 헤더 청크부터만 헤더를 다시 적용 (문서 앞부분 전체 스캔 회피)
+    anchor = 0
+    for _, start, _, _ in reversed(old_spans[:first + 1]):
+        line_end = old_text.find("\n", start, resume)
+        parsed = parse_markdown_header(old_text[start: resume if line_end == -1 else line_end])
+        if parsed and parsed[0] == 1:
+            anchor = start
+            break
+    headers = header_state_at(old_text, resume, anchor)
+    spans = list(old_spans[:first])
+    reused = len(spans)
+
+    # 이전 문서도 resume 부터 필요한 만큼만 함께 진행하며 span 끝의 헤더 상태를 비교
+    old_iter = _iter_spans_with_state(old_text, resume, len(old_text), dict(headers), first)
+    old_span, old_headers = next(old_iter, (None, None))
+
+    for span, new_headers in _iter_spans_with_state(new_text, resume, len(new_text), headers, first):
+        while old_span is not None and old_span[1] + delta < span[1]:
+            old_span, old_headers = next(old_iter, (None, None))
+
+        if (
+            not fence_edited
+            and old_span is not None
+            and old_span[1] >= old_edit_end
+            and old_span[1] + delta == span[1]
+            and old_span[2] + delta == span[2]
+            and old_headers == new_headers
+            and old_spans[old_span[0]][1:3] == old_span[1:3]
+        ):
+            # 동기화 지점: 위치·내용·헤더 상태가 같으므로 이후 청크는 이전 결과와 동일
+            j = old_span[0]
+            for k, (_, start, end, header_path) in enumerate(old_spans[j:]):
+                spans.append((span[0] + k, start + delta, end + delta, header_path))
+            reused += len(old_spans) - j
+            break
+        spans.append(span)
+
+    return spans, reused
+
+
+# 빈 줄(문단 경계) - 매치 끝이 다음 문단 시작
+_BLANK_LINE = re.compile(r"\n[^\S\n]*\n")
+_FENCE_LINE = re.compile(r"^[^\S\n]*```", re.MULTILINE)
+
+
+def _paragraph_boundaries(text: str, start: int, end: int) -> list[int]:
+    """코드 블록 밖의 문단 시작 위치"""
+    fences = [m.start() for m in _FENCE_LINE.finditer(text, start, end)]
+    boundaries, f, in_code_block = [], 0, False
+    for match in _BLANK_LINE.finditer(text, start, end):
+        while f < len(fences) and fences[f] < match.start():
+            in_code_block = not in_code_block
+            f += 1
+        if not in_code_block and match.end() < end:
+            boundaries.append(match.end())
+    return boundaries
+
+
+def _line_boundaries(text: str, start: int, end: int) -> list[int]:
+    boundaries = []
+    pos = text.find("\n", start, end)
+    while pos != -1 and pos + 1 < end:
+        boundaries.append(pos + 1)
+        pos = text.find("\n", pos + 1, end)
+    return boundaries
+
+
+def _char_boundaries(
+    text: str, start: int, end: int, count_tokens: Callable[[str], int], max_tokens: int
+) -> list[int]:
+    """줄 하나가 예산을 넘으면 문자 단위로 자름 (max_tokens 이하가 되는 가장 긴 길이를 이분 탐색)"""
+    boundaries = []
+    while count_tokens(text[start:end]) > max_tokens:
+        lo, hi = start + 1, end - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if count_tokens(text[start:mid]) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        boundaries.append(lo)
+        start = lo
+    return boundaries
+
+
+def _split_oversized(
+    text: str,
+    start: int,
+    end: int,
+    count_tokens: Callable[[str], int],
+    max_tokens: int,
+    level: int = 0,
+) -> list[tuple[int, int]]:
+    """
+    [start, end) 를 max_tokens 이하 조각으로 분할
+    문단 경계 → 줄 경계 → 문자 순으로 안전한 경계를 우선하고, 작은 조각은 예산까지 다시 묶는다.
+    (토큰 수는 조각 합과 다를 수 있으므로 묶을 때 합친 텍스트를 다시 세어 max_tokens 이하만 허용)
+    """
+    if level == 0:
+        cuts = _paragraph_boundaries(text, start, end)
+    elif level == 1:
+        cuts = _line_boundaries(text, start, end)
+    else:
+        cuts = _char_boundaries(text, start, end, count_tokens, max_tokens)
+        points = [start] + cuts + [end]
+        return list(zip(points, points[1:]))
+
+    if not cuts:
+        return _split_oversized(text, start, end, count_tokens, max_tokens, level + 1)
+
+    points = [start] + cuts + [end]
+    pieces: list[tuple[int, int, int]] = []
+    for piece_start, piece_end in zip(points, points[1:]):
+        tokens = count_tokens(text[piece_start:piece_end])
+        if tokens > max_tokens:
+            for sub_start, sub_end in _split_oversized(
+                text, piece_start, piece_end, count_tokens, max_tokens, level + 1
+            ):
+                pieces.append((sub_start, sub_end, count_tokens(text[sub_start:sub_end])))
+        else:
+            pieces.append((piece_start, piece_end, tokens))
+
+    # 예산까지 순서대로 묶기 (공백뿐인 조각은 앞 조각에, 앞 조각이 공백뿐이면 이 조각을 붙임)
+    # 공백도 토큰이므로 합쳐서 max_tokens 를 넘으면 공백 조각도 따로 둔다
+    groups: list[list[int]] = []
+    for piece_start, piece_end, tokens in pieces:
+        if groups:
+            group = groups[-1]
+            blank = not _NON_SPACE.search(text, piece_start, piece_end) or not _NON_SPACE.search(
+                text, group[0], group[1]
+            )
+            if blank or group[2] + tokens <= max_tokens:
+                merged = count_tokens(text[group[0]:piece_end])
+                if merged <= max_tokens:
+                    group[1] = piece_end
+                    group[2] = merged
+                    continue
+        groups.append([piece_start, piece_end, tokens])
+    return [(group_start, group_end) for group_start, group_end, _ in groups]
+
+
+def _parent_path(header_path: str) -> str:
+    return header_path.rsplit("/", 1)[0]
+
+
+def _common_header_path(paths: list[str]) -> str:
+    parts = [path.split("/") for path in paths]
+    common = []
+    for names in zip(*parts):
+        if any(name != names[0] for name in names):
+            break
+        common.append(names[0])
+    return "/".join(common) or "/"
+
+
+def fit_spans_to_budget(
+    text: str,
+    spans: list[Span],
+    count_tokens: Callable[[str], int],
+    min_tokens: int,
+    max_tokens: int,
+) -> list[Span]:
+    """
+    헤더 기반 span 을 토큰 예산에 맞게 조정
+
+    - max_tokens 를 넘는 청크는 문단/줄/문자 경계에서 분할 (header_path 유지)
+    - min_tokens 미만인 청크는 같은 부모 아래의 이웃(형제/하위) 청크와 max_tokens 까지 병합
+      (병합된 청크의 header_path 는 공통 상위 경로)
+    span 의 연속성(이어 붙이면 원문)은 유지되고, 모든 청크는 count_tokens 기준 max_tokens 이하이다
+    (문자 하나가 max_tokens 를 넘는 경우 제외).
+    """
+    fitted: list[Span] = []
+    group: list[Span] = []
+    group_tokens = 0
+
+    def flush():
+        if group:
+            fitted.append(
+                (len(fitted), group[0][1], group[-1][2], _common_header_path([s[3] for s in group]))
+            )
+            group.clear()
+
+    for span in spans:
+        _, start, end, header_path = span
+        tokens = count_tokens(text[start:end])
+
+        if tokens > max_tokens:
+            flush()
+            for piece_start, piece_end in _split_oversized(text, start, end, count_tokens, max_tokens):
+                fitted.append((len(fitted), piece_start, piece_end, header_path))
+            continue
+
+        if (
+            group
+            and (group_tokens < min_tokens or tokens < min_tokens)
+            and group_tokens + tokens <= max_tokens
+            and header_path.startswith(_parent_path(group[0][3]) + "/")
+        ):
+            # 합친 텍스트의 토큰 수가 조각 합보다 클 수 있으므로 다시 세어 확인
+            merged = count_tokens(text[group[0][1]:end])
+            if merged <= max_tokens:
+                group.append(span)
+                group_tokens = merged
+                continue
+
+        flush()
+        group.append(span)
+        group_tokens = tokens
+
+    flush()
+    return fitted
@@ -5,7 +5,7 @@ models.py는 SQLAlchemy ORM 모델을 정의한다. 테이블/컬럼 구조만 
 비즈니스 로직은 Service, 쿼리는 Repository에 둔다.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, func, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, func, text, UniqueConstraint, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from pgvector.sqlalchemy import Vector
@@ -126,9 +126,16 @@ class CommonCode(Base):
 # (4) 모델 로그 (AI-사용자 상호작용 기록)
 class ModelLog(Base):
     __tablename__ = "model_logs"
-    __table_args__ = {"comment": "sLLM 파인튜닝을 위한 AI-사용자 상호작용 로그"}
-
-    log_seq = Column(Integer, primary_key=True, index=True, comment="로그 고유 식별자 (Sequence)")
+    # created_at 월별 range 파티션 (database/migrations/001_model_logs_indexes_partitioning.sql)
+    __table_args__ = (
+        Index("ix_model_logs_task_id", "task_id"),
+        Index("ix_model_logs_task_type_created_at", "task_type_code", "created_at"),
+        Index("ix_model_logs_decided_at", "decided_at", postgresql_where=text("decided_at IS NOT NULL")),
+        {"comment": "sLLM 파인튜닝을 위한 AI-사용자 상호작용 로그"},
+    )
+
+    # PK (log_seq, created_at) - 파티션 키 포함. 복합 PK 에서도 log_seq 는 시퀀스로 채움
+    log_seq = Column(Integer, primary_key=True, autoincrement=True, comment="로그 고유 식별자 (Sequence)")
     operator_seq = Column(Integer, ForeignKey("users.user_seq"), nullable=True, comment="작업을 수행한 사용자 식별자")
     team_seq = Column(Integer, ForeignKey("teams.team_seq"), nullable=True, comment="작업이 수행된 팀 식별자")
     task_type_code = Column(String(50), nullable=False, comment="작업 유형 common_code code_group llm_task_type")
@@ -136,6 +143,8 @@ class ModelLog(Base):
     input_data = Column(JSONB, nullable=True, comment="AI 모델에 입력된 프롬프트 또는 데이터 (JSON)")
     ai_output = Column(JSONB, nullable=True, comment="AI 모델이 반환한 결과 데이터 (JSON)")
     user_decision = Column(JSONB, nullable=True, comment="사용자의 최종 수정/승인 데이터 (학습 레이블용)")
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # user_decision 이 바뀌면 트리거가 갱신 (database/migrations/003_model_logs_decided_at.sql)
+    decided_at = Column(DateTime, nullable=True, comment="user_decision 최종 변경 시각 (증분 내보내기용)")
+    created_at = Column(DateTime, server_default=func.now(), primary_key=True, nullable=False)
 
 
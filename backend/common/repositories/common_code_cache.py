@@ -0,0 +1,150 @@
+"""
+사용법 참고:
+
+common_codes 테이블 전체를 프로세스 메모리에 올려 두는 캐시. CommonCodeRepository 의 조회가 이 캐시를 사용한다.
+    - (code_group, code_value) → CommonCode dict 로 O(1) 조회, 그룹별 목록은 code_value 정렬로 미리 만들어 둠
+    - API 서버 기동 시 load, 이후 COMMON_CODE_CACHE_CHECK_INTERVAL 초마다 Redis 버전 카운터
+      (common_codes:version) 를 확인해 바뀌었으면 전체를 다시 읽음
+    - 코드를 추가한 프로세스는 invalidate 로 버전을 올림 → 다른 API 복제본도 다음 확인 주기에 함께 갱신
+      (DB 를 직접 수정했다면 redis-cli INCR common_codes:version)
+Redis 에 연결할 수 없으면 가지고 있는 캐시를 그대로 사용한다 (처음이면 DB 에서 읽음).
+캐시가 돌려주는 CommonCode 는 세션에 속하지 않은 공유 객체이므로 읽기 전용으로 사용한다.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import redis.asyncio as redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.core.config import settings
+from common.models import CommonCode
+
+COMMON_CODE_VERSION_KEY = "common_codes:version"
+COLUMNS = (
+    CommonCode.code_seq,
+    CommonCode.code_group,
+    CommonCode.code_value,
+    CommonCode.code_name,
+    CommonCode.is_use,
+)
+
+
+class CommonCodeCache:
+    def __init__(self, check_interval: float = settings.COMMON_CODE_CACHE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+
+        self._codes: dict[tuple[str, str], CommonCode] = {}
+        self._groups: dict[str, list[CommonCode]] = {}
+        self._all: list[CommonCode] = []
+        self._version: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._checked_at = 0.0
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self._redis = None
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def redis(self):
+        """버전 카운터용 Redis 연결 (처음 사용할 때 연결)"""
+        if self._redis is None:
+            self._redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    async def _remote_version(self) -> Optional[str]:
+        """Redis 의 현재 버전 (키가 없으면 "0", 연결 실패 시 None)"""
+        try:
+            return await self.redis.get(COMMON_CODE_VERSION_KEY) or "0"
+        except Exception as e:
+            print(f"공통 코드 캐시: 버전 확인 실패, 기존 캐시 사용: {e}")
+            return None
+
+    async def load(self, db: AsyncSession):
+        """common_codes 전체를 다시 읽음 (읽기 전에 버전을 먼저 확인해 읽는 도중 바뀐 내용은 다음 주기에 반영)"""
+        async with self._lock:
+            await self._load(db, await self._remote_version())
+
+    async def _load(self, db: AsyncSession, version: Optional[str]):
+        stmt = select(*COLUMNS).order_by(CommonCode.code_group, CommonCode.code_value)
+        rows = (await db.execute(stmt)).mappings().all()
+
+        codes, groups, all_codes = {}, {}, []
+        for row in rows:
+            code = CommonCode(**row)
+            codes[(code.code_group, code.code_value)] = code
+            groups.setdefault(code.code_group, []).append(code)
+            all_codes.append(code)
+        self._codes, self._groups, self._all = codes, groups, all_codes
+
+        self._version = version
+        self._loaded_at = time.time()
+        self._checked_at = time.monotonic()
+        self._stale = False
+        self.reloads += 1
+        print(f"공통 코드 캐시 로드: {len(all_codes)}건 (version={version})")
+
+    async def refresh(self, db: AsyncSession):
+        """확인 주기가 지났으면 버전을 확인하고, 바뀌었거나 무효화됐으면 다시 읽음"""
+        if not self._stale and time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        async with self._lock:
+            if not self._stale and time.monotonic() - self._checked_at < self.check_interval:
+                return
+            version = await self._remote_version()
+            self._checked_at = time.monotonic()
+            if self._loaded_at is not None and not self._stale and (version is None or version == self._version):
+                return
+            await self._load(db, version)
+
+    async def invalidate(self):
+        """이 프로세스는 다음 조회 때, 다른 복제본은 다음 확인 주기에 다시 읽도록 버전을 올림"""
+        self._stale = True
+        try:
+            await self.redis.incr(COMMON_CODE_VERSION_KEY)
+        except Exception as e:
+            print(f"공통 코드 캐시: 버전 증가 실패 (다른 복제본은 갱신되지 않음): {e}")
+
+    def _count(self, found: bool):
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def get_one(self, code_group: str, code_value: str) -> Optional[CommonCode]:
+        code = self._codes.get((code_group, code_value))
+        self._count(code is not None)
+        return code
+
+    def get_by_group(self, code_group: str) -> list[CommonCode]:
+        codes = self._groups.get(code_group)
+        self._count(codes is not None)
+        return list(codes or ())
+
+    def get_all(self) -> list[CommonCode]:
+        self._count(True)
+        return list(self._all)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.COMMON_CODE_CACHE_ENABLED,
+            "entries": len(self._all),
+            "groups": len(self._groups),
+            "version": self._version,
+            "age_seconds": round(time.time() - self._loaded_at, 3) if self._loaded_at is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "reloads": self.reloads,
+        }
+
+
+# 프로세스당 하나 (API 서버 기동 시 load)
+common_code_cache = CommonCodeCache()
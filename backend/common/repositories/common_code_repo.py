@@ -2,13 +2,16 @@
 사용법 참고:
 
 Repository는 공통 코드에 대한 DB 조회/저장을 전담한다. 비즈니스 판단이나 데이터 가공은 Service에 둔다.
+COMMON_CODE_CACHE_ENABLED 이면 조회는 프로세스 캐시(common_code_cache)에서 처리하고, 생성 시 캐시 버전을 올린다.
 """
 
 from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from common.core.config import settings
 from common.models import CommonCode
+from common.repositories.common_code_cache import common_code_cache
 
 
 class CommonCodeRepository:
@@ -32,16 +35,24 @@ class CommonCodeRepository:
             await self.db.rollback()
             raise
         await self.db.refresh(record)
+        if settings.COMMON_CODE_CACHE_ENABLED:
+            await common_code_cache.invalidate()
         return record
 
     async def get_by_group(self, code_group: str) -> List[CommonCode]:
         """특정 그룹에 속한 코드 목록을 그룹 내 정렬로 조회."""
+        if settings.COMMON_CODE_CACHE_ENABLED:
+            await common_code_cache.refresh(self.db)
+            return common_code_cache.get_by_group(code_group)
         stmt = select(CommonCode).where(CommonCode.code_group == code_group).order_by(CommonCode.code_value)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
     async def get_one(self, code_group: str, code_value: str) -> Optional[CommonCode]:
         """그룹과 코드값으로 단일 공통 코드를 조회."""
+        if settings.COMMON_CODE_CACHE_ENABLED:
+            await common_code_cache.refresh(self.db)
+            return common_code_cache.get_one(code_group, code_value)
         stmt = select(CommonCode).where(
             CommonCode.code_group == code_group,
             CommonCode.code_value == code_value,
@@ -51,6 +62,9 @@ class CommonCodeRepository:
 
     async def get_all(self) -> List[CommonCode]:
         """모든 공통 코드를 그룹/코드값 정렬로 조회."""
+        if settings.COMMON_CODE_CACHE_ENABLED:
+            await common_code_cache.refresh(self.db)
+            return common_code_cache.get_all()
         stmt = select(CommonCode).order_by(CommonCode.code_group, CommonCode.code_value)
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
@@ -3,9 +3,11 @@ Repository for model_logs table (AI-사용자 상호작용 로그).
 비즈니스 로직은 Service 계층에 두고, 여기서는 CRUD/조회만 담당한다.
 """
 
+import json
 import uuid
-from typing import List, Optional, Union
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, AsyncIterator, List, Optional, Union
+from sqlalchemy import func, insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from common.models import ModelLog
@@ -51,6 +53,20 @@ class ModelLogsRepository:
         await self.db.refresh(record)
         return record
 
+    async def bulk_create(self, rows: list[dict[str, Any]]):
+        """
+        여러 로그를 multi-row INSERT 한 번으로 저장 후 커밋 (REFRESH 없음)
+        rows : create 와 같은 키(task_type_code, task_id, input_data, ...)의 dict 목록
+        """
+        if not rows:
+            return
+        try:
+            await self.db.execute(insert(ModelLog).values(rows))
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+
     async def update_by_task_id(
         self,
         task_id: str,
@@ -79,6 +95,55 @@ class ModelLogsRepository:
         await self.db.refresh(record)
         return record
 
+    async def bulk_update_ai_output(self, items: list[tuple[str, Any]]) -> list[dict[str, Any]]:
+        """
+        여러 작업의 ai_output 을 UPDATE ... FROM (VALUES ...) 한 번으로 저장 후 커밋
+        반환 : 실제로 갱신된 행의 task_id, task_type_code (완료 응답 캐시용, input_data 는 다시 읽지 않음)
+        """
+        if not items:
+            return []
+
+        values, params = [], {}
+        for i, (task_id, ai_output) in enumerate(items):
+            values.append(f"(CAST(:task_id_{i} AS UUID), CAST(:ai_output_{i} AS JSONB))")
+            params[f"task_id_{i}"] = str(task_id)
+            params[f"ai_output_{i}"] = json.dumps(ai_output, ensure_ascii=False)
+
+        stmt = text(
+            f"""
+            UPDATE model_logs AS m
+            SET ai_output = v.ai_output
+            FROM (VALUES {", ".join(values)}) AS v(task_id, ai_output)
+            WHERE m.task_id = v.task_id
+            RETURNING m.task_id, m.task_type_code
+            """
+        ).columns(ModelLog.task_id, ModelLog.task_type_code)
+        try:
+            result = await self.db.execute(stmt, params)
+            updated = [dict(row) for row in result.mappings().all()]
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return updated
+
+    async def get_output_flags(self, task_ids: list[uuid.UUID]) -> dict[str, bool]:
+        """task_id = ANY(...) 한 번으로 조회 → task_id: ai_output 저장 여부 (로그가 없는 task_id 는 제외)"""
+        if not task_ids:
+            return {}
+        stmt = text(
+            """
+            SELECT task_id, ai_output IS NOT NULL AS has_output
+            FROM model_logs
+            WHERE task_id = ANY(CAST(:task_ids AS UUID[]))
+            """
+        )
+        result = await self.db.execute(stmt, {"task_ids": [str(task_id) for task_id in task_ids]})
+        flags: dict[str, bool] = {}
+        for task_id, has_output in result.all():
+            flags[str(task_id)] = flags.get(str(task_id), False) or bool(has_output)
+        return flags
+
     async def get(self, log_seq: int) -> Optional[ModelLog]:
         stmt = select(ModelLog).where(ModelLog.log_seq == log_seq)
         result = await self.db.execute(stmt)
@@ -106,6 +171,100 @@ class ModelLogsRepository:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    @staticmethod
+    def _export_filters(
+        stmt,
+        task_type_code: Optional[str],
+        created_from: Optional[datetime],
+        created_to: Optional[datetime],
+        has_user_decision: Optional[bool] = None,
+    ):
+        if task_type_code is not None:
+            stmt = stmt.where(ModelLog.task_type_code == task_type_code)
+        if created_from is not None:
+            stmt = stmt.where(ModelLog.created_at >= created_from)
+        if created_to is not None:
+            stmt = stmt.where(ModelLog.created_at < created_to)
+        if has_user_decision is True:
+            stmt = stmt.where(ModelLog.user_decision.is_not(None))
+        elif has_user_decision is False:
+            stmt = stmt.where(ModelLog.user_decision.is_(None))
+        return stmt
+
+    async def export_bounds(
+        self,
+        *,
+        after_log_seq: int = 0,
+        task_type_code: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        incomplete_grace_hours: float = 24,
+    ) -> tuple[Optional[int], datetime]:
+        """
+        증분 내보내기 경계 조회
+        반환 : (after_log_seq 이후 아직 ai_output 이 없는 가장 작은 log_seq (없으면 None), DB 현재 시각)
+        incomplete_grace_hours 보다 오래된 미완료 행은 실패/중단된 작업으로 보고 경계에서 제외한다.
+        현재 시각은 created_at/decided_at 과 같은 TIMESTAMP (time zone 없음) 로 돌려준다.
+        """
+        now = func.localtimestamp()
+        incomplete = self._export_filters(
+            select(func.min(ModelLog.log_seq)).where(
+                ModelLog.log_seq > after_log_seq,
+                ModelLog.ai_output.is_(None),
+                ModelLog.created_at >= now - func.make_interval(0, 0, 0, 0, 0, 0, incomplete_grace_hours * 3600),
+            ),
+            task_type_code,
+            created_from,
+            created_to,
+        ).scalar_subquery()
+        row = (await self.db.execute(select(incomplete, now))).one()
+        return row[0], row[1]
+
+    async def stream_for_export(
+        self,
+        *,
+        after_log_seq: int = 0,
+        before_log_seq: Optional[int] = None,
+        decided_after: Optional[datetime] = None,
+        decided_until: Optional[datetime] = None,
+        task_type_code: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        has_user_decision: Optional[bool] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[dict]:
+        """
+        내보내기용 행 스트리밍 (log_seq 오름차순, 서버 측 커서로 batch_size 행씩 가져옴)
+        ORM 객체 대신 컬럼 dict 를 돌려주므로 테이블 크기와 관계없이 메모리 사용량이 일정하다.
+
+        완료된 행(ai_output 있음)만 내보낸다.
+            after_log_seq < log_seq < before_log_seq                 : 새 행 (before_log_seq 는 첫 미완료 행)
+            decided_after < decided_at <= decided_until 조건이 있으면 : 이후에 user_decision 이 바뀐 행
+        """
+        stmt = select(
+            ModelLog.log_seq,
+            ModelLog.operator_seq,
+            ModelLog.team_seq,
+            ModelLog.task_type_code,
+            ModelLog.task_id,
+            ModelLog.input_data,
+            ModelLog.ai_output,
+            ModelLog.user_decision,
+            ModelLog.created_at,
+        ).where(ModelLog.log_seq > after_log_seq, ModelLog.ai_output.is_not(None))
+        if before_log_seq is not None:
+            stmt = stmt.where(ModelLog.log_seq < before_log_seq)
+        if decided_after is not None:
+            stmt = stmt.where(ModelLog.decided_at > decided_after)
+        if decided_until is not None:
+            stmt = stmt.where(ModelLog.decided_at <= decided_until)
+        stmt = self._export_filters(stmt, task_type_code, created_from, created_to, has_user_decision)
+        stmt = stmt.order_by(ModelLog.log_seq).execution_options(yield_per=batch_size)
+
+        result = await self.db.stream(stmt)
+        async for row in result.mappings():
+            yield dict(row)
+
     async def list_by_task(
         self,
         *,
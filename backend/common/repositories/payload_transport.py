@@ -0,0 +1,170 @@
+"""
+사용법 참고:
+
+PayloadTransport 는 API → 워커로 넘기는 본문(문서 텍스트)의 전달 방식을 정한다.
+    - 작은 본문  : 큐 메시지에 그대로(raw:) 또는 zlib 압축 + base64(zlib:) 로 인라인
+    - 큰 본문    : zlib 압축 후 BlobStore 에 저장하고 메시지에는 참조(ref:)만 넣음
+BlobStore 는 Redis(TTL) 또는 로컬 파일시스템(API/워커가 같은 볼륨을 마운트)을 사용한다.
+
+RedisRepository.enqueue(body=...) 가 pack 하고, 워커는 RedisRepository.load_body 로 unpack 한다.
+"""
+
+import asyncio
+import base64
+import os
+import zlib
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import redis.asyncio as redis
+
+from common.core.config import settings
+
+RAW_PREFIX = "raw:"
+ZLIB_PREFIX = "zlib:"
+REF_PREFIX = "ref:"
+
+
+class BlobStore(ABC):
+    """본문 바이트 저장소"""
+
+    @abstractmethod
+    async def put(self, key: str, data: bytes, ttl: int):
+        """저장 (ttl 초 후 만료, 지원하지 않는 저장소는 discard 로 정리)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """조회 (없으면 None)"""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """삭제"""
+
+    async def close(self):
+        """연결 정리"""
+
+
+class RedisBlobStore(BlobStore):
+    """Redis 문자열 키(blob:{key})에 바이트 저장 (decode_responses=False 연결 사용)"""
+
+    def __init__(self, redis_url: str):
+        self.redis = redis.from_url(redis_url, decode_responses=False)
+
+    async def put(self, key: str, data: bytes, ttl: int):
+        await self.redis.set(f"blob:{key}", data, ex=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.redis.get(f"blob:{key}")
+
+    async def delete(self, key: str):
+        await self.redis.delete(f"blob:{key}")
+
+    async def close(self):
+        await self.redis.close()
+
+
+class LocalBlobStore(BlobStore):
+    """로컬 디렉터리에 파일로 저장 (TTL 없음, 작업 완료 시 discard 로 삭제)"""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root_dir, f"{key}.zlib")
+
+    def _write(self, key: str, data: bytes):
+        os.makedirs(self.root_dir, exist_ok=True)
+        path = self._path(key)
+        # 쓰는 도중 읽히지 않도록 임시 파일에 쓴 뒤 이름 변경
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _remove(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def put(self, key: str, data: bytes, ttl: int):
+        await asyncio.to_thread(self._write, key, data)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._remove, key)
+
+
+def create_blob_store(kind: Optional[str] = None) -> BlobStore:
+    """settings.PAYLOAD_BLOB_STORE (redis | local) 에 맞는 BlobStore 생성"""
+    kind = (kind or settings.PAYLOAD_BLOB_STORE).lower()
+    if kind == "redis":
+        return RedisBlobStore(settings.REDIS_URL)
+    if kind == "local":
+        return LocalBlobStore(settings.PAYLOAD_BLOB_DIR)
+    raise ValueError(f"지원하지 않는 PAYLOAD_BLOB_STORE 입니다: {kind}")
+
+
+class PayloadTransport:
+    """
+    본문 ↔ 큐 메시지 필드 문자열 변환
+
+    pack 결과 형식
+        raw:{text}              compress_min_bytes 미만
+        zlib:{base64}           압축 후 inline_max_bytes 이하
+        ref:{key}               그 외 (BlobStore 에 압축 바이트 저장)
+    """
+
+    def __init__(
+        self,
+        store: BlobStore,
+        inline_max_bytes: int = settings.PAYLOAD_INLINE_MAX_BYTES,
+        compress_min_bytes: int = settings.PAYLOAD_COMPRESS_MIN_BYTES,
+        ttl: int = settings.PAYLOAD_BLOB_TTL,
+    ):
+        self.store = store
+        self.inline_max_bytes = inline_max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.ttl = ttl
+
+    async def pack(self, key: str, text: str) -> str:
+        raw = text.encode("utf-8")
+        if len(raw) < self.compress_min_bytes:
+            return RAW_PREFIX + text
+
+        compressed = zlib.compress(raw, 6)
+        if len(compressed) <= self.inline_max_bytes:
+            return ZLIB_PREFIX + base64.b64encode(compressed).decode("ascii")
+
+        await self.store.put(key, compressed, self.ttl)
+        return REF_PREFIX + key
+
+    async def unpack(self, packed: str) -> str:
+        if packed.startswith(RAW_PREFIX):
+            return packed[len(RAW_PREFIX):]
+        if packed.startswith(ZLIB_PREFIX):
+            return zlib.decompress(base64.b64decode(packed[len(ZLIB_PREFIX):])).decode("utf-8")
+        if packed.startswith(REF_PREFIX):
+            key = packed[len(REF_PREFIX):]
+            data = await self.store.get(key)
+            if data is None:
+                raise KeyError(f"본문 blob 을 찾을 수 없습니다(만료?): {key}")
+            return zlib.decompress(data).decode("utf-8")
+        raise ValueError("알 수 없는 본문 형식입니다.")
+
+    async def discard(self, packed: str):
+        """참조(ref:) 본문이면 blob 삭제"""
+        if packed.startswith(REF_PREFIX):
+            await self.store.delete(packed[len(REF_PREFIX):])
+
+    async def close(self):
+        await self.store.close()
@@ -5,13 +5,43 @@ RedisRepository는 Redis 연결과 큐 작업 같은 외부 스토리지 I/O만
 비즈니스 로직은 Service에서 다룬다.
 """
 
+import asyncio
 import json
-from typing import Optional
+import time
+from typing import Any, AsyncIterator, Optional
 
 import redis.asyncio as redis
 
 from common.core.codes import LlmTaskStatus
 from common.core.config import settings
+from common.repositories.payload_transport import PayloadTransport, create_blob_store
+
+
+# 워커 write-behind 저장(ResultSink) 저널 : 워커마다 result_journal:{worker_id} (Hash task_id → ai_output)
+# 살아 있는 워커는 result_journal_owner:{worker_id} 를 TTL 로 갱신하고, 저널을 가진 워커 id 는 result_journals 집합에 둔다.
+# (RESULT_JOURNAL_KEY 단독 키는 이전 형식의 공용 저널 - 복구 시 함께 가져감)
+RESULT_JOURNAL_KEY = "result_journal"
+RESULT_JOURNAL_OWNERS_KEY = "result_journals"
+
+# 저널 항목을 다른 저널로 옮기고 원래 키 삭제 (원자적 → 여러 워커가 동시에 복구해도 한 워커만 가져감)
+# 대상에 같은 task_id 가 이미 있으면 대상 값 유지
+_MOVE_JOURNAL_SCRIPT = """
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    redis.call('HSETNX', KEYS[2], entries[i], entries[i + 1])
+end
+redis.call('DEL', KEYS[1])
+return entries
+"""
+
+# 일괄 등록 배치 진행 집합 (task_batch:{batch_id}:{status}) 에 기록하는 상태
+BATCH_TRACKED_STATUSES = (
+    LlmTaskStatus.PROCESSING,
+    LlmTaskStatus.COMPLETE,
+    LlmTaskStatus.ERROR,
+    LlmTaskStatus.CANCELLED,
+)
+TASK_METADATA_TTL = 86400
 
 
 class RedisRepository:
@@ -19,18 +49,30 @@ class RedisRepository:
 
     def __init__(self, redis_url: str):
         self.redis = redis.from_url(redis_url, decode_responses=True)
+        self._transport: Optional[PayloadTransport] = None
+
+    @property
+    def transport(self) -> PayloadTransport:
+        """본문 전달 계층 (처음 사용할 때 blob 저장소 연결)"""
+        if self._transport is None:
+            self._transport = PayloadTransport(create_blob_store())
+        return self._transport
 
-    async def enqueue(self, key_name: str, payload: dict):
+    async def enqueue(self, key_name: str, payload: dict, body: Optional[str] = None):
         """
         지정한 큐에 작업을 추가하고, 동시에 payload 데이터를 기반으로 상태 메타데이터(Hash)를 생성합니다.
         
         :param key_name: payload에서 식별자로 사용할 필드명 (예: 'task_id')
         :param payload: 작업 데이터 (이 전체 내용이 Hash에도 저장됨)
+        :param body: 워커에 넘길 본문 (PayloadTransport 로 인라인/참조 변환해 payload["body"] 에 담음, Hash 에는 저장하지 않음)
         """
         queue_name = settings.QUEUE_NAME
         
         # 1. 식별자 값 추출
         id_value = payload.get(key_name)
+        message = payload
+        if body is not None:
+            message = {**payload, "body": await self.transport.pack(str(id_value), body)}
 
         async with self.redis.pipeline(transaction=True) as pipe:
             # 2. 메타데이터(Hash) 저장 준비
@@ -43,21 +85,180 @@ class RedisRepository:
                 
                 pipe.hset(redis_key, mapping=mapping)
                 # 24시간 후 만료 (TTL 설정)
-                pipe.expire(redis_key, 86400)
+                pipe.expire(redis_key, TASK_METADATA_TTL)
 
             # 3. 큐에 작업 추가 준비
-            pipe.lpush(queue_name, json.dumps(payload))
+            pipe.lpush(queue_name, json.dumps(message))
 
             # 4. 일괄 실행 (Atomic)
             await pipe.execute()
 
+    async def enqueue_many(
+        self, key_name: str, items: list[tuple[dict, Optional[str]]], batch_id: Optional[str] = None
+    ):
+        """
+        여러 작업을 파이프라인 한 번으로 등록 (작업별 Hash / 큐 메시지 형식은 enqueue 와 같음).
+
+        :param items: (payload, body) 목록
+        :param batch_id: 있으면 배치 메타데이터 Hash(task_batch:{batch_id}, total 포함)도 함께 생성
+                         (payload 에 batch_id 를 넣어 두면 상태 전환 시 배치 진행 집합에 기록됨)
+        """
+        if not items:
+            return
+        packed = await asyncio.gather(
+            *(
+                self.transport.pack(str(payload.get(key_name)), body)
+                for payload, body in items
+                if body is not None
+            )
+        )
+        packed_iter = iter(packed)
+        messages = [
+            {**payload, "body": next(packed_iter)} if body is not None else payload
+            for payload, body in items
+        ]
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if batch_id:
+                batch_key = f"task_batch:{batch_id}"
+                pipe.hset(
+                    batch_key,
+                    mapping={"batch_id": batch_id, "total": len(items), "created_at": int(time.time())},
+                )
+                pipe.expire(batch_key, TASK_METADATA_TTL)
+            for payload, _ in items:
+                redis_key = f"{key_name}:{payload.get(key_name)}"
+                pipe.hset(redis_key, mapping=payload.copy())
+                pipe.expire(redis_key, TASK_METADATA_TTL)
+            pipe.lpush(settings.QUEUE_NAME, *[json.dumps(message) for message in messages])
+            await pipe.execute()
+
+    async def load_body(self, payload: dict) -> Optional[str]:
+        """큐 메시지의 본문 복원 (본문이 없는 메시지면 None)."""
+        packed = payload.get("body")
+        if not packed:
+            return None
+        return await self.transport.unpack(packed)
+
+    async def discard_body(self, payload: dict):
+        """참조로 전달된 본문 blob 삭제 (작업 처리 후)."""
+        packed = payload.get("body")
+        if packed:
+            await self.transport.discard(packed)
+
     async def set_task_metadata(self, task_id: str, status: LlmTaskStatus, **kwargs):
-        """작업 상태 및 추가 메타데이터 저장."""
+        """작업 상태 및 추가 메타데이터 저장 (배치 작업이면 배치 진행 집합에도 기록)."""
         key = f"task_id:{task_id}"
         mapping = {"task_status": status.value}
         if kwargs:
             mapping.update(kwargs)
-        await self.redis.hset(key, mapping=mapping)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.hget(key, "batch_id")
+            _, batch_id = await pipe.execute()
+        if batch_id:
+            await self._record_batch_status({task_id: batch_id}, status)
+
+    async def set_tasks_status(self, task_ids: list[str], status: LlmTaskStatus):
+        """여러 작업 상태를 파이프라인 한 번으로 저장 (배치 작업이면 배치 진행 집합에도 기록)."""
+        if not task_ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.hset(f"task_id:{task_id}", "task_status", status.value)
+                pipe.hget(f"task_id:{task_id}", "batch_id")
+            results = await pipe.execute()
+        batch_ids = {
+            task_id: batch_id for task_id, batch_id in zip(task_ids, results[1::2]) if batch_id
+        }
+        if batch_ids:
+            await self._record_batch_status(batch_ids, status)
+
+    async def _record_batch_status(self, batch_ids: dict[str, str], status: LlmTaskStatus):
+        """
+        배치 진행 집합 갱신 (task_id → batch_id).
+        집합(SADD)이라 같은 전환이 다시 기록돼도(저널 재처리 등) 개수가 늘지 않는다.
+        종료 상태로 가면 processing 집합에서 뺀다.
+        """
+        if status not in BATCH_TRACKED_STATUSES:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id, batch_id in batch_ids.items():
+                status_key = f"task_batch:{batch_id}:{status.value.lower()}"
+                pipe.sadd(status_key, task_id)
+                pipe.expire(status_key, TASK_METADATA_TTL)
+                if status != LlmTaskStatus.PROCESSING:
+                    pipe.srem(f"task_batch:{batch_id}:processing", task_id)
+            await pipe.execute()
+
+    async def get_batch_progress(self, batch_id: str) -> Optional[dict]:
+        """배치 메타데이터 + 상태별 작업 수를 파이프라인 한 번으로 조회. 배치가 없으면 None."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(f"task_batch:{batch_id}")
+            for status in BATCH_TRACKED_STATUSES:
+                pipe.scard(f"task_batch:{batch_id}:{status.value.lower()}")
+            meta, *counts = await pipe.execute()
+        if not meta:
+            return None
+        return {
+            **meta,
+            **{status.value.lower(): count for status, count in zip(BATCH_TRACKED_STATUSES, counts)},
+        }
+
+    @staticmethod
+    def _journal_key(worker_id: str) -> str:
+        return f"{RESULT_JOURNAL_KEY}:{worker_id}"
+
+    async def register_journal(self, worker_id: str, ttl: int):
+        """워커 저널 등록 + 생존 표시 갱신 (ttl 초 안에 다시 호출하지 않으면 다른 워커가 저널을 복구)."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(RESULT_JOURNAL_OWNERS_KEY, worker_id)
+            pipe.set(f"result_journal_owner:{worker_id}", "1", ex=ttl)
+            await pipe.execute()
+
+    async def unregister_journal(self, worker_id: str):
+        """정상 종료 시 생존 표시 삭제 (저널에 남은 항목은 다른 워커가 바로 복구)."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.delete(f"result_journal_owner:{worker_id}")
+            pipe.hlen(self._journal_key(worker_id))
+            _, remaining = await pipe.execute()
+        if not remaining:
+            await self.redis.srem(RESULT_JOURNAL_OWNERS_KEY, worker_id)
+
+    async def journal_result(self, worker_id: str, task_id: str, ai_output: Any):
+        """DB 커밋 전 작업 결과를 워커 저널(Hash result_journal:{worker_id})에 기록 (워커 비정상 종료 시 복구용)."""
+        await self.redis.hset(self._journal_key(worker_id), task_id, json.dumps(ai_output, ensure_ascii=False))
+
+    async def clear_journaled_results(self, worker_id: str, task_ids: list[str]):
+        """DB 에 커밋된 작업 결과를 워커 저널에서 삭제."""
+        if task_ids:
+            await self.redis.hdel(self._journal_key(worker_id), *task_ids)
+
+    async def claim_orphan_journals(self, worker_id: str) -> dict[str, Any]:
+        """
+        생존 표시가 만료된(종료된) 워커의 저널과 이전 형식 공용 저널을 worker_id 의 저널로 옮김.
+        반환 : 옮겨 온 작업 결과 (task_id → ai_output). 살아 있는 워커의 저널은 건드리지 않는다.
+        """
+        members = [member for member in await self.redis.smembers(RESULT_JOURNAL_OWNERS_KEY) if member != worker_id]
+        alive = []
+        if members:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for member in members:
+                    pipe.exists(f"result_journal_owner:{member}")
+                alive = await pipe.execute()
+
+        claimed: dict[str, Any] = {}
+        target = self._journal_key(worker_id)
+        sources = [self._journal_key(member) for member, is_alive in zip(members, alive) if not is_alive]
+        for source in sources + [RESULT_JOURNAL_KEY]:
+            entries = await self.redis.eval(_MOVE_JOURNAL_SCRIPT, 2, source, target)
+            for i in range(0, len(entries), 2):
+                claimed[entries[i]] = json.loads(entries[i + 1])
+
+        dead = [member for member, is_alive in zip(members, alive) if not is_alive]
+        if dead:
+            await self.redis.srem(RESULT_JOURNAL_OWNERS_KEY, *dead)
+        return claimed
 
     async def get_task_metadata(self, task_id: str) -> Optional[dict]:
         """작업 상태 해시를 조회. 없으면 None 반환."""
@@ -65,6 +266,107 @@ class RedisRepository:
         data = await self.redis.hgetall(key)
         return data or None
 
+    async def get_tasks_status(self, task_ids: list[str]) -> list[Optional[str]]:
+        """여러 작업 상태를 파이프라인 한 번으로 조회 (task_ids 순서, 해시가 없으면 None)."""
+        if not task_ids:
+            return []
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.hget(f"task_id:{task_id}", "task_status")
+            return await pipe.execute()
+
+    async def claim_dedupe_key(self, content_hash: str, task_id: str, ttl: int) -> Optional[str]:
+        """내용 해시를 task_id 로 선점 (SET NX). 이미 있으면 기존 task_id, 선점했으면 None 반환."""
+        key = f"dedupe:{content_hash}"
+        if await self.redis.set(key, task_id, nx=True, ex=ttl):
+            return None
+        return await self.redis.get(key)
+
+    async def add_dedupe_keys(self, task_ids: dict[str, str], ttl: int):
+        """내용 해시 → task_id 를 파이프라인 한 번으로 저장 (이미 있는 해시는 그대로 둠, SET NX)."""
+        if not task_ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for content_hash, task_id in task_ids.items():
+                pipe.set(f"dedupe:{content_hash}", task_id, nx=True, ex=ttl)
+            await pipe.execute()
+
+    async def set_dedupe_key(self, content_hash: str, task_id: str, ttl: int):
+        """내용 해시의 task_id 를 덮어씀 (기존 작업이 실패/취소된 경우)."""
+        await self.redis.set(f"dedupe:{content_hash}", task_id, ex=ttl)
+
+    async def release_dedupe_key(self, content_hash: str, task_id: str):
+        """선점한 내용 해시 해제 (작업 등록 실패 시). 다른 작업이 덮어썼으면 그대로 둔다."""
+        key = f"dedupe:{content_hash}"
+        if await self.redis.get(key) == task_id:
+            await self.redis.delete(key)
+
+    async def get_idempotency_task(self, idempotency_key: str) -> Optional[str]:
+        """Idempotency-Key 로 등록된 task_id 조회."""
+        return await self.redis.get(f"idempotency:{idempotency_key}")
+
+    async def set_idempotency_task(self, idempotency_key: str, task_id: str, ttl: int):
+        """Idempotency-Key → task_id 저장."""
+        await self.redis.set(f"idempotency:{idempotency_key}", task_id, ex=ttl)
+
+    async def record_dedupe(self, hit_source: Optional[str] = None):
+        """중복 제거 통계 누적 (hit_source: content / idempotency_key, None 이면 신규 작업)."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby("dedupe_stats", "requests", 1)
+            if hit_source:
+                pipe.hincrby("dedupe_stats", "hits", 1)
+                pipe.hincrby("dedupe_stats", f"hits_{hit_source}", 1)
+            await pipe.execute()
+
+    async def get_dedupe_stats(self) -> dict:
+        """중복 제거 통계 조회."""
+        return await self.redis.hgetall("dedupe_stats")
+
+    async def request_cancel(self, task_id: str) -> int:
+        """작업 취소 요청 - 메타데이터에 표시하고 워커에 알림 (PUBLISH). 수신한 워커 수 반환."""
+        key = f"task_id:{task_id}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "cancel_requested", 1)
+            pipe.publish(settings.TASK_CANCEL_CHANNEL, task_id)
+            _, receivers = await pipe.execute()
+        return receivers
+
+    async def is_cancel_requested(self, task_id: str) -> bool:
+        """작업 취소 요청 여부."""
+        return await self.redis.hget(f"task_id:{task_id}", "cancel_requested") == "1"
+
+    async def listen_cancel(self) -> AsyncIterator[str]:
+        """취소 요청된 task_id 를 수신 (SUBSCRIBE)."""
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(settings.TASK_CANCEL_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(settings.TASK_CANCEL_CHANNEL)
+            await pubsub.close()
+
+    async def append_stream(self, task_id: str, fields: dict) -> str:
+        """작업 스트림(task_stream:{task_id})에 이벤트 추가 (XADD). 이벤트 ID 반환."""
+        key = f"task_stream:{task_id}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, fields, maxlen=settings.TASK_STREAM_MAXLEN, approximate=True)
+            pipe.expire(key, settings.TASK_STREAM_TTL)
+            event_id, _ = await pipe.execute()
+        return event_id
+
+    async def read_stream(
+        self, task_id: str, last_id: str = "0-0", block_ms: Optional[int] = None, count: int = 100
+    ) -> list[tuple[str, dict]]:
+        """last_id 이후 스트림 이벤트 조회 (XREAD). 새 이벤트가 없으면 block_ms 동안 대기."""
+        key = f"task_stream:{task_id}"
+        result = await self.redis.xread({key: last_id}, count=count, block=block_ms)
+        if not result:
+            return []
+        _, entries = result[0]
+        return entries
+
     async def dequeue(self, timeout: int = 5) -> Optional[dict]:
         """큐에서 작업을 가져옴 (BPOP)."""
         queue_name = settings.QUEUE_NAME
@@ -76,4 +378,6 @@ class RedisRepository:
 
     async def close(self):
         """Redis 연결을 정리."""
-        await self.redis.close()
\ No newline at end of file
+        await self.redis.close()
+        if self._transport is not None:
+            await self._transport.close()
\ No newline at end of file
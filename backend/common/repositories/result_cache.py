@@ -0,0 +1,90 @@
+"""
+사용법 참고:
+
+완료된 작업의 /tasks/{task_id}/detail 응답을 미리 직렬화 + gzip 한 바이트로 보관하는 캐시 (Redis, TTL).
+    - 워커가 결과 커밋 직후 채움 (기본 응답 include_text=false)
+    - API 는 캐시에 있으면 Redis HGETALL / model_logs 조회 / Pydantic 검증 없이 바이트를 그대로 응답
+      (ETag 는 압축 바이트의 해시, If-None-Match 가 같으면 304)
+    - 캐시에 없으면 기존처럼 조회한 뒤 완료된 작업이면 채움 (include_text=true 응답 포함)
+완료된 결과는 바뀌지 않으므로 무효화 없이 RESULT_CACHE_TTL 로만 정리한다.
+"""
+
+import gzip
+import hashlib
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from common.core.codes import LlmTaskStatus, LlmTaskType
+from common.core.config import settings
+from common.index_output import expand_index_output
+from common.schemas import LlmTaskDetailResponse
+
+
+def build_task_detail(
+    task_id: Any, task_type_code: str, input_data: Any, ai_output: Any, include_text: bool = False
+) -> LlmTaskDetailResponse:
+    """model_logs 행으로 완료된 작업의 상세 응답 생성 (include_text 면 DOC_INDEX 섹션 original_text 복원)"""
+    if (
+        include_text
+        and task_type_code == LlmTaskType.DOC_INDEX.value
+        and isinstance(ai_output, list)
+        and isinstance(input_data, str)
+    ):
+        ai_output = expand_index_output(ai_output, input_data)
+
+    return LlmTaskDetailResponse(
+        task_id=task_id,
+        task_type=LlmTaskType(task_type_code),
+        task_status=LlmTaskStatus.COMPLETE,
+        results={
+            "input_data": input_data,
+            "ai_output": ai_output,
+        },
+    )
+
+
+class TaskResultCache:
+    """task_result:{task_id}:{compact|text} 키에 gzip 응답 바이트 저장 (decode_responses=False 연결 사용)"""
+
+    def __init__(self, redis_url: str, ttl: int = settings.RESULT_CACHE_TTL):
+        self.redis = redis.from_url(redis_url, decode_responses=False)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(task_id: str, include_text: bool) -> str:
+        return f"task_result:{task_id}:{'text' if include_text else 'compact'}"
+
+    @staticmethod
+    def encode(response: LlmTaskDetailResponse) -> Optional[bytes]:
+        """응답을 JSON + gzip 바이트로 변환 (RESULT_CACHE_MAX_BYTES 를 넘으면 None → 캐시하지 않음)"""
+        # mtime=0: 같은 응답이면 항상 같은 바이트 (ETag 유지)
+        data = gzip.compress(
+            response.model_dump_json().encode("utf-8"), compresslevel=settings.RESULT_CACHE_GZIP_LEVEL, mtime=0
+        )
+        return data if len(data) <= settings.RESULT_CACHE_MAX_BYTES else None
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+    async def put(self, task_id: str, response: LlmTaskDetailResponse, include_text: bool = False):
+        data = self.encode(response)
+        if data is not None:
+            await self.redis.set(self._key(task_id, include_text), data, ex=self.ttl)
+
+    async def put_many(self, responses: dict[str, LlmTaskDetailResponse]):
+        """여러 작업의 기본 응답을 파이프라인 한 번으로 저장"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id, response in responses.items():
+                data = self.encode(response)
+                if data is not None:
+                    pipe.set(self._key(task_id, False), data, ex=self.ttl)
+            await pipe.execute()
+
+    async def get(self, task_id: str, include_text: bool = False) -> Optional[bytes]:
+        """gzip 응답 바이트 (없으면 None)"""
+        return await self.redis.get(self._key(task_id, include_text))
+
+    async def close(self):
+        await self.redis.close()
@@ -20,12 +20,49 @@ class LlmTaskRequest(BaseModel):
     text: Optional[str] = None  # 단건일때
     texts: Optional[List[str]] = None  # 다건일때
     k: Optional[int] = None  # 검색 시 상위 k개 조회
+    base_task_id: Optional[UUID] = None  # 수정 문서 재색인 시 이전 색인 task_id (증분 청킹)
+    chunk_min_tokens: Optional[int] = None  # 청크 최소 토큰 (미만이면 이웃 청크와 병합)
+    chunk_max_tokens: Optional[int] = None  # 청크 최대 토큰 (초과하면 분할)
+    max_tokens: Optional[int] = None  # 문서 생성 시 최대 생성 토큰
 
 class LlmTaskResponse(BaseModel):
     """LLM 작업 공통 응답 DTO"""
     task_id: UUID
     task_type: LlmTaskType
     task_status: LlmTaskStatus
+    deduplicated: bool = False  # 중복 요청이라 기존 작업을 반환했는지
+
+class IndexBatchResponse(BaseModel):
+    """문서 일괄 색인 등록 응답 (task_ids 는 texts 순서, 같은 내용의 문서는 같은 task_id)"""
+    batch_id: UUID
+    task_ids: List[UUID]
+
+class TaskBatchProgressResponse(BaseModel):
+    """일괄 등록 배치 진행 상황 (상태별 작업 수)"""
+    batch_id: UUID
+    total: int
+    pending: int
+    processing: int
+    complete: int
+    error: int
+    cancelled: int
+    finished: bool  # 모든 작업이 COMPLETE/ERROR/CANCELLED
+
+class TaskStatusBatchRequest(BaseModel):
+    """여러 작업 상태 일괄 조회 요청"""
+    task_ids: List[str]
+
+class TaskStatusBatchResponse(BaseModel):
+    """task_id → 작업 상태 (찾을 수 없으면 null)"""
+    statuses: dict[str, Optional[LlmTaskStatus]]
+
+class DedupeStatsResponse(BaseModel):
+    """색인 요청 중복 제거 통계"""
+    requests: int
+    hits: int
+    hits_content: int
+    hits_idempotency_key: int
+    hit_rate: float
 
 class LlmTaskDetailResponse(BaseModel):
     """작업 상태 및 결과 통합 응답 DTO"""
@@ -53,6 +90,19 @@ class CommonCodeResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class CommonCodeCacheStatsResponse(BaseModel):
+    """공통 코드 프로세스 캐시 통계"""
+    enabled: bool
+    entries: int
+    groups: int
+    version: Optional[str] = None
+    age_seconds: Optional[float] = None
+    hits: int
+    misses: int
+    hit_rate: float
+    reloads: int
+
 # ----------------------------------------------
 
 class ProposalSimilarSection(BaseModel):
@@ -0,0 +1,285 @@
+"""
+model_logs 파인튜닝 데이터셋 내보내기 (스트리밍, 증분)
+
+    - 서버 측 커서로 log_seq 오름차순 스트리밍 (ORM 객체 미사용, 테이블 크기와 무관하게 메모리 일정)
+    - 필터: 작업 유형, 생성일 범위, user_decision 유무
+    - --shard-rows 행마다 샤드 파일 (gzip JSONL 또는 zstd Parquet) + manifest.json
+    - 완료된 행(ai_output 있음)만 내보냄
+    - 증분: 같은 출력 폴더로 다시 실행하면 manifest 의 last_log_seq 이후 행만 내보냄
+      (필터/형식이 manifest 와 다르면 중단 → 다른 출력 폴더 사용)
+      아직 처리 중인 행(ai_output 없음) 중 가장 작은 log_seq 바로 앞까지만 내보내므로 워터마크가
+      미완료 행을 건너뛰지 않는다. --incomplete-grace-hours 보다 오래된 미완료 행은 실패한 작업으로 보고 무시.
+    - 이미 내보낸 행 중 user_decision 이 바뀐 행(decided_at > manifest 의 last_decided_at)은
+      "decisions" 샤드로 다시 내보냄 → 소비 측은 log_seq 별로 마지막 샤드의 행을 사용
+
+샤드는 임시 파일에 쓴 뒤 이름을 바꾸고, 샤드가 끝날 때마다 manifest 를 갱신하므로
+중간에 중단돼도 manifest 에 기록된 샤드까지는 온전하다.
+
+실행 (backend 폴더 기준):
+    PYTHONPATH=. python jobs/export_model_logs.py --out ./exports/doc_index \
+        --task-type DOC_INDEX --date-from 2026-01-01 --with-decision --format jsonl
+Parquet 는 pyarrow 가 설치되어 있어야 한다.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from common.core.codes import LlmTaskType
+from common.core.config import settings
+from common.index_output import expand_index_output
+from common.repositories.model_logs_repo import ModelLogsRepository
+
+MANIFEST_NAME = "manifest.json"
+JSON_COLUMNS = ("input_data", "ai_output", "user_decision")
+
+
+class JsonlShardWriter:
+    suffix = ".jsonl.gz"
+
+    def __init__(self, path: str):
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def write(self, record: dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write("\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetShardWriter:
+    """JSONB 컬럼은 JSON 문자열로 저장 (샤드 간 스키마 고정)"""
+
+    suffix = ".parquet"
+
+    def __init__(self, path: str, row_group_rows: int = 10_000):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [
+                ("log_seq", pa.int64()),
+                ("operator_seq", pa.int64()),
+                ("team_seq", pa.int64()),
+                ("task_type_code", pa.string()),
+                ("task_id", pa.string()),
+                ("input_data", pa.string()),
+                ("ai_output", pa.string()),
+                ("user_decision", pa.string()),
+                ("created_at", pa.timestamp("us")),
+            ]
+        )
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+        self._row_group_rows = row_group_rows
+        self._buffer: list[dict[str, Any]] = []
+
+    def write(self, record: dict[str, Any]):
+        row = dict(record)
+        row["task_id"] = str(row["task_id"]) if row["task_id"] is not None else None
+        for column in JSON_COLUMNS:
+            if row[column] is not None:
+                row[column] = json.dumps(row[column], ensure_ascii=False)
+        self._buffer.append(row)
+        if len(self._buffer) >= self._row_group_rows:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._writer.write_table(self._pa.Table.from_pylist(self._buffer, schema=self._schema))
+            self._buffer.clear()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+WRITERS = {"jsonl": JsonlShardWriter, "parquet": ParquetShardWriter}
+
+
+def _load_manifest(out_dir: str, filters: dict[str, Any], fmt: str) -> dict[str, Any]:
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {
+            "format": fmt,
+            "filters": filters,
+            "last_log_seq": 0,
+            "last_decided_at": None,
+            "total_rows": 0,
+            "shards": [],
+        }
+
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != fmt or manifest.get("filters") != filters:
+        raise SystemExit(
+            f"{path} 의 형식/필터가 이번 요청과 다릅니다. 다른 출력 폴더를 사용하세요.\n"
+            f"  manifest: format={manifest.get('format')} filters={manifest.get('filters')}\n"
+            f"  요청    : format={fmt} filters={filters}"
+        )
+    # decided_at 도입 전 manifest → 이미 내보낸 행 중 user_decision 이 있는 행을 한 번 다시 내보냄
+    manifest.setdefault("last_decided_at", None)
+    return manifest
+
+
+def _save_manifest(out_dir: str, manifest: dict[str, Any]):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+async def export(args):
+    filters = {
+        "task_type": args.task_type,
+        "date_from": args.date_from,
+        "date_to": args.date_to,
+        "has_user_decision": args.has_user_decision,
+        "expand_text": args.expand_text,
+    }
+    os.makedirs(args.out, exist_ok=True)
+    manifest = _load_manifest(args.out, filters, args.format)
+    writer_cls = WRITERS[args.format]
+    query = {
+        "task_type_code": args.task_type,
+        "created_from": _parse_date(args.date_from),
+        "created_to": _parse_date(args.date_to),
+    }
+    last_decided_at = _parse_date(manifest["last_decided_at"])
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    tmp_path = os.path.join(args.out, "shard.tmp")
+
+    async def write_shards(rows, kind: str, run_tag: str):
+        writer, shard = None, None
+
+        def finish_shard():
+            writer.close()
+            if kind == "rows":
+                name = f"model_logs-{shard['min_log_seq']:012d}-{shard['max_log_seq']:012d}{writer_cls.suffix}"
+            else:
+                name = f"model_logs-decisions-{run_tag}-{shard['min_log_seq']:012d}{writer_cls.suffix}"
+            path = os.path.join(args.out, name)
+            os.replace(tmp_path, path)
+            shard.update(kind=kind, file=name, bytes=os.path.getsize(path))
+            shard["exported_at"] = datetime.now(timezone.utc).isoformat()
+
+            manifest["shards"].append(shard)
+            if kind == "rows":
+                manifest["last_log_seq"] = shard["max_log_seq"]
+            manifest["total_rows"] += shard["rows"]
+            _save_manifest(args.out, manifest)
+            print(f"   샤드 {name}: {shard['rows']}행")
+
+        async for row in rows:
+            if (
+                args.expand_text
+                and row["task_type_code"] == LlmTaskType.DOC_INDEX.value
+                and isinstance(row["ai_output"], list)
+                and isinstance(row["input_data"], str)
+            ):
+                row["ai_output"] = expand_index_output(row["ai_output"], row["input_data"])
+
+            if writer is None:
+                writer = writer_cls(tmp_path)
+                shard = {"rows": 0, "min_log_seq": row["log_seq"], "max_log_seq": row["log_seq"]}
+            writer.write(row)
+            shard["rows"] += 1
+            shard["max_log_seq"] = row["log_seq"]
+
+            if shard["rows"] >= args.shard_rows:
+                finish_shard()
+                writer, shard = None, None
+
+        if writer is not None:
+            finish_shard()
+
+    try:
+        async with session_factory() as db:
+            repo = ModelLogsRepository(db)
+            first_incomplete, started_at = await repo.export_bounds(
+                after_log_seq=manifest["last_log_seq"],
+                incomplete_grace_hours=args.incomplete_grace_hours,
+                **query,
+            )
+            print(
+                f"내보내기 시작 | out={args.out} | after log_seq={manifest['last_log_seq']} "
+                f"| 미완료 log_seq={first_incomplete} | decided after={manifest['last_decided_at']}"
+            )
+            run_tag = started_at.strftime("%Y%m%d%H%M%S")
+
+            # 1) 이미 내보낸 범위에서 user_decision 이 바뀐 행
+            if manifest["last_log_seq"] > 0:
+                await write_shards(
+                    repo.stream_for_export(
+                        before_log_seq=manifest["last_log_seq"] + 1,
+                        decided_after=last_decided_at,
+                        decided_until=started_at,
+                        has_user_decision=args.has_user_decision,
+                        batch_size=args.batch_size,
+                        **query,
+                    ),
+                    "decisions",
+                    run_tag,
+                )
+
+            # 2) 새로 완료된 행 (첫 미완료 행 앞까지)
+            await write_shards(
+                repo.stream_for_export(
+                    after_log_seq=manifest["last_log_seq"],
+                    before_log_seq=first_incomplete,
+                    has_user_decision=args.has_user_decision,
+                    batch_size=args.batch_size,
+                    **query,
+                ),
+                "rows",
+                run_tag,
+            )
+
+        # started_at 이후의 user_decision 변경은 다음 실행의 1) 에서 다시 내보냄
+        manifest["last_decided_at"] = started_at.isoformat()
+        _save_manifest(args.out, manifest)
+    finally:
+        await engine.dispose()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    print(
+        f"내보내기 완료 | last_log_seq={manifest['last_log_seq']} | last_decided_at={manifest['last_decided_at']} "
+        f"| total_rows={manifest['total_rows']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True, help="출력 폴더 (manifest.json 으로 증분 관리)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--task-type", choices=[t.value for t in LlmTaskType], default=None)
+    parser.add_argument("--date-from", default=None, help="created_at 시작 (포함, ISO 형식)")
+    parser.add_argument("--date-to", default=None, help="created_at 끝 (미포함, ISO 형식)")
+    decision = parser.add_mutually_exclusive_group()
+    decision.add_argument("--with-decision", dest="has_user_decision", action="store_const", const=True)
+    decision.add_argument("--without-decision", dest="has_user_decision", action="store_const", const=False)
+    parser.add_argument("--expand-text", action="store_true", help="DOC_INDEX 섹션에 original_text 복원")
+    parser.add_argument("--shard-rows", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=1_000, help="서버 측 커서 fetch 크기")
+    parser.add_argument(
+        "--incomplete-grace-hours",
+        type=float,
+        default=24,
+        help="이 시간보다 오래된 미완료 행은 워터마크 계산에서 제외 (실패/중단된 작업)",
+    )
+    asyncio.run(export(parser.parse_args()))
@@ -0,0 +1,128 @@
+"""
+model_logs 파티션 관리 / 보존 기간 정리 작업
+
+    1. 현재 + MODEL_LOGS_PARTITION_MONTHS_AHEAD 개월까지 월별 파티션 미리 생성
+       (default 파티션에 데이터가 쌓이면 해당 월 파티션을 만들 수 없으므로 미리 만들어 둔다)
+    2. MODEL_LOGS_RETENTION_MONTHS 보다 오래된 월 파티션을 MODEL_LOGS_ARCHIVE_DIR 가 있으면
+       {파티션명}.jsonl.gz 로 보관 (파티션이 붙어 있는 상태에서)
+    3. 보관이 끝나면 DETACH + DROP 을 한 트랜잭션으로 실행
+       → 보관 중 실패해도 파티션은 그대로 남아 다음 실행에서 다시 처리된다
+       (이전 버전이 DETACH 후 실패해 떨어져 남은 model_logs_pYYYYMM 테이블도 찾아 같은 방식으로 정리)
+
+database/migrations/001_model_logs_indexes_partitioning.sql 적용 후 사용한다.
+하루 1회 cron 등으로 실행:
+    PYTHONPATH=. python jobs/model_logs_retention.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import gzip
+import os
+import re
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from common.core.config import settings
+
+PARTITION_NAME = re.compile(r"^model_logs_p(\d{4})(\d{2})$")
+
+
+def _months_ago(today: date, months: int) -> date:
+    """today 가 속한 달의 months 개월 전 1일"""
+    index = today.year * 12 + (today.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def _list_month_partitions(engine: AsyncEngine) -> list[tuple[str, date, bool]]:
+    """model_logs_pYYYYMM 테이블 (이름, 월, 파티션으로 붙어 있는지) - 떨어져 남은 테이블 포함"""
+    stmt = text(
+        """
+        SELECT child.relname,
+               EXISTS (
+                   SELECT 1
+                   FROM pg_inherits
+                   JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                   WHERE pg_inherits.inhrelid = child.oid AND parent.relname = 'model_logs'
+               ) AS attached
+        FROM pg_class child
+        JOIN pg_namespace ns ON ns.oid = child.relnamespace
+        WHERE child.relkind IN ('r', 'p')
+          AND ns.nspname = current_schema()
+          AND child.relname LIKE 'model_logs\\_p%'
+        """
+    )
+    async with engine.connect() as conn:
+        rows = (await conn.execute(stmt)).all()
+
+    partitions = []
+    for name, attached in rows:
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1), attached))
+    return sorted(partitions, key=lambda item: item[1])
+
+
+async def _archive_partition(engine: AsyncEngine, name: str, archive_dir: str) -> int:
+    """파티션 행을 서버 측 커서로 읽어 gzip JSONL 로 저장. 저장한 행 수 반환."""
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.jsonl.gz")
+    tmp_path = f"{path}.tmp"
+
+    rows = 0
+    async with engine.connect() as conn:
+        result = await conn.stream(
+            text(f'SELECT to_jsonb(t)::text FROM "{name}" AS t ORDER BY log_seq')
+        )
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            async for (line,) in result:
+                f.write(line)
+                f.write("\n")
+                rows += 1
+    os.replace(tmp_path, path)
+    return rows
+
+
+async def run(dry_run: bool = False):
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        today = date.today()
+
+        # 1. 미래 파티션 생성
+        if not dry_run:
+            async with engine.begin() as conn:
+                created = await conn.scalar(
+                    text("SELECT model_logs_ensure_partitions(CAST(:today AS DATE), :ahead)"),
+                    {"today": today, "ahead": settings.MODEL_LOGS_PARTITION_MONTHS_AHEAD},
+                )
+            print(f"파티션 생성: {created}개")
+
+        # 2. 보존 기간이 지난 파티션 정리 (보관 → DETACH + DROP)
+        cutoff = _months_ago(today, settings.MODEL_LOGS_RETENTION_MONTHS)
+        expired = [item for item in await _list_month_partitions(engine) if item[1] < cutoff]
+        print(f"보존 기준: {cutoff} 이전 파티션 {len(expired)}개 정리 대상")
+
+        for name, _, attached in expired:
+            if dry_run:
+                print(f"   [dry-run] {name}{'' if attached else ' (떨어져 남은 테이블)'}")
+                continue
+
+            if settings.MODEL_LOGS_ARCHIVE_DIR:
+                rows = await _archive_partition(engine, name, settings.MODEL_LOGS_ARCHIVE_DIR)
+                print(f"   {name}: {rows}행 보관 → {settings.MODEL_LOGS_ARCHIVE_DIR}")
+
+            async with engine.begin() as conn:
+                if attached:
+                    await conn.execute(text(f'ALTER TABLE model_logs DETACH PARTITION "{name}"'))
+                await conn.execute(text(f'DROP TABLE "{name}"'))
+            print(f"   {name}: 삭제 완료")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true", help="정리 대상만 출력")
+    args = parser.parse_args()
+    asyncio.run(run(dry_run=args.dry_run))
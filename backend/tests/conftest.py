@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# backend 폴더 기준 import (common.*) - 다른 위치에서 pytest 를 실행해도 동일
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
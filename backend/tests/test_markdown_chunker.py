@@ -0,0 +1,64 @@
+import random
+import re
+
+import pytest
+
+from common.markdown_chunker import chunk_markdown, fit_spans_to_budget
+
+_WORD_OR_SPACE = re.compile(r"\S+|\s")
+
+
+def count_words(text: str) -> int:
+    # 공백 문자 하나하나도 토큰 (공백뿐인 조각도 예산을 차지)
+    return len(_WORD_OR_SPACE.findall(text))
+
+
+def count_chars(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def random_markdown(rng: random.Random) -> str:
+    blocks = []
+    for _ in range(rng.randint(1, 12)):
+        kind = rng.random()
+        if kind < 0.2:
+            blocks.append("#" * rng.randint(1, 4) + " 제목" + str(rng.randint(0, 99)))
+        elif kind < 0.35:
+            # 빈 줄/공백 줄 묶음
+            blocks.append("\n".join(" " * rng.randint(0, 4) for _ in range(rng.randint(1, 30))))
+        elif kind < 0.45:
+            blocks.append("```\n# 코드 안 주석\n" + "x = 1\n" * rng.randint(1, 5) + "```")
+        elif kind < 0.55:
+            blocks.append("가" * rng.randint(50, 400))
+        else:
+            words = ["단어", "word", "문장.", "a", "bb"]
+            blocks.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 80))))
+    return "\n\n".join(blocks) + rng.choice(["", "\n", "\n\n   \n"])
+
+
+@pytest.mark.parametrize("count_tokens", [count_words, count_chars])
+def test_fit_spans_respects_max_tokens(count_tokens):
+    rng = random.Random(1234)
+    for _ in range(2000):
+        text = random_markdown(rng)
+        max_tokens = rng.randint(4, 60)
+        min_tokens = rng.randint(0, max_tokens)
+
+        fitted = fit_spans_to_budget(text, chunk_markdown(text), count_tokens, min_tokens, max_tokens)
+
+        for _, start, end, _ in fitted:
+            assert count_tokens(text[start:end]) <= max_tokens, (text, max_tokens, start, end)
+        # 이어 붙이면 원문 (공백뿐인 문서는 청크 없음)
+        if fitted:
+            assert "".join(text[start:end] for _, start, end, _ in fitted) == text
+            assert [seq for seq, _, _, _ in fitted] == list(range(len(fitted)))
+            assert all(a[2] == b[1] for a, b in zip(fitted, fitted[1:]))
+
+
+def test_blank_lines_count_against_budget():
+    text = "# 제목\n\n" + "본문 " * 5 + "\n" + "\n" * 40 + "끝"
+
+    fitted = fit_spans_to_budget(text, chunk_markdown(text), count_words, 0, 12)
+
+    assert all(count_words(text[start:end]) <= 12 for _, start, end, _ in fitted)
+    assert "".join(text[start:end] for _, start, end, _ in fitted) == text
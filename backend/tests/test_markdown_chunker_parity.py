@@ -0,0 +1,61 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+from common import markdown_chunker
+
+# data/ 파이프라인의 복사본 (data/modules/markdown_chunker.py) - data 패키지 없이 파일로 로드
+_DATA_CHUNKER = Path(__file__).resolve().parents[2] / "data" / "modules" / "markdown_chunker.py"
+_spec = importlib.util.spec_from_file_location("data_markdown_chunker", _DATA_CHUNKER)
+data_chunker = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(data_chunker)
+
+SAMPLES = [
+    "",
+    "본문만 있는 문서",
+    "\n\n  \n# 제목\n본문",
+    "# A\n내용\n## B\n내용\n### C\n# D\n끝",
+    "<h2 class='x'>**굵은** 제목</h2>\n본문\n## _기울임_ 제목\n",
+    "# 코드\n```\n# 코드 안 주석\n```\n## 다음\n",
+    "  ## 들여쓴 헤더\n####### 헤더 아님\n#해시태그\n",
+]
+
+
+def random_markdown(rng: random.Random) -> str:
+    lines = []
+    for _ in range(rng.randint(0, 40)):
+        kind = rng.random()
+        if kind < 0.25:
+            lines.append(" " * rng.randint(0, 2) + "#" * rng.randint(1, 7) + rng.choice([" ", ""]) + "제목")
+        elif kind < 0.35:
+            lines.append(f"<h{rng.randint(1, 6)}>*제목*</h{rng.randint(1, 6)}>")
+        elif kind < 0.45:
+            lines.append("```")
+        elif kind < 0.6:
+            lines.append(" " * rng.randint(0, 3))
+        else:
+            lines.append("본문 " * rng.randint(1, 5))
+    return "\n".join(lines)
+
+
+def test_data_copy_exports_same_functions():
+    for name in ("clean_header_text", "parse_markdown_header", "iter_markdown_spans"):
+        assert callable(getattr(data_chunker, name))
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_data_copy_matches_backend_samples(text):
+    assert list(data_chunker.iter_markdown_spans(text)) == list(markdown_chunker.iter_markdown_spans(text))
+    for line in text.splitlines():
+        assert data_chunker.parse_markdown_header(line) == markdown_chunker.parse_markdown_header(line)
+
+
+def test_data_copy_matches_backend_random():
+    rng = random.Random(42)
+    for _ in range(500):
+        text = random_markdown(rng)
+        assert list(data_chunker.iter_markdown_spans(text)) == list(markdown_chunker.iter_markdown_spans(text))
+        for line in text.splitlines():
+            assert data_chunker.parse_markdown_header(line) == markdown_chunker.parse_markdown_header(line)
@@ -0,0 +1,76 @@
+"""
+로컬 경계 분류기 학습 + 처리량 / 일치율 벤치마크
+
+embedding_*.jsonl 로 BoundaryClassifier 를 학습하고 held-out 쌍에 대해
+- 처리량 (pairs/sec, CPU 배치 추론)
+- 전체 일치율 (threshold 0.5)
+- threshold 별 로컬 결정 비율(coverage)과 결정된 쌍의 일치율
+을 출력한다. (일치율 기준 라벨 = 데이터셋의 GPT 섹션 분할 결과)
+
+사용법:
+    python benchmark_boundary_model.py docs_data/embedding_data --save docs_data/boundary_model.npz
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from modules.boundary_model import BoundaryClassifier, load_pair_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dataset", help="embedding_*.jsonl 파일 또는 폴더")
+    parser.add_argument("--test-ratio", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.7, 0.8, 0.9, 0.95])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", default=None, help="학습된 헤드 저장 경로 (.npz)")
+    args = parser.parse_args()
+
+    dataset = Path(args.dataset)
+    files = sorted(dataset.glob("embedding_*.jsonl")) if dataset.is_dir() else [dataset]
+    texts_a, texts_b, breaks = load_pair_dataset(files)
+
+    rng = np.random.default_rng(args.seed)
+    order = rng.permutation(len(breaks))
+    n_test = int(len(order) * args.test_ratio)
+    test_idx, train_idx = order[:n_test], order[n_test:]
+
+    def pick(idx):
+        return [texts_a[i] for i in idx], [texts_b[i] for i in idx], breaks[idx]
+
+    train_a, train_b, train_y = pick(train_idx)
+    test_a, test_b, test_y = pick(test_idx)
+
+    model = BoundaryClassifier(batch_size=args.batch_size)
+
+    started = time.perf_counter()
+    model.fit(train_a, train_b, train_y)
+    train_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    probs = model.predict_proba(test_a, test_b)
+    infer_sec = time.perf_counter() - started
+
+    print(f"files={len(files)} pairs={len(breaks)} (train={len(train_y)}, test={len(test_y)}) "
+          f"break_ratio={breaks.mean():.3f}")
+    print(f"train      : {train_sec:.2f}s")
+    print(f"throughput : {len(test_y) / infer_sec:.1f} pairs/sec (batch_size={args.batch_size}, cpu)")
+    print(f"agreement  : {((probs >= 0.5) == test_y).mean():.3f} (threshold=0.5, 전체)")
+    print("-" * 60)
+    print(f"{'threshold':>9} | {'coverage':>8} | {'agreement':>9} | {'llm calls':>9}")
+    for threshold in args.thresholds:
+        decided = (probs >= threshold) | (probs <= 1 - threshold)
+        coverage = decided.mean() if len(decided) else 0.0
+        agreement = ((probs[decided] >= 0.5) == test_y[decided]).mean() if decided.any() else float("nan")
+        print(f"{threshold:>9.2f} | {coverage:>8.3f} | {agreement:>9.3f} | {int((~decided).sum()):>9}")
+
+    if args.save:
+        model.save(args.save)
+        print(f"saved → {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+색인 프롬프트 크기 벤치마크 (카테고리 수 증가에 따른 섹션당 프롬프트 토큰)
+
+비교 대상:
+    full      : 기존 방식 (모든 depth 의 모든 카테고리를 나열)
+    scoped    : CategoryRegistry.render(scope) (직전 색인 주변 subtree)
+    retrieval : CategoryRetriever.render_shortlist (depth 별 top-k, sentence-transformers 필요)
+
+사용법:
+    python benchmark_category_prompt.py --sizes 100 1000 5000 --top-k 10
+"""
+import argparse
+import time
+
+from benchmark_labeling import get_token_counter
+from modules.data_categorize import CategoryRegistry, build_user_prompt
+
+SAMPLE_SECTION = {
+    "header_path": "/AJC 프로젝트 기획서/기능 소개/문서 등록",
+    "text": "사용자가 마크다운 문서를 업로드하면 섹션 단위로 분할하고 각 섹션에 색인을 부여한다.\n",
+}
+
+
+def build_synthetic_registry(size: int) -> CategoryRegistry:
+    """약 size 개의 카테고리를 가진 3단계 registry 생성"""
+    registry = CategoryRegistry()
+    roots = max(1, size // 100)
+    topics = max(1, size // 10)
+    i = 0
+    while len(registry) < size:
+        registry.add_path([f"문서{i % roots}", f"주제{i % topics}", f"항목{i}"])
+        i += 1
+    return registry
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    count_tokens, tokenizer_name = get_token_counter()
+
+    try:
+        import sentence_transformers  # noqa: F401
+        from modules.category_retrieval import CategoryRetriever
+
+        retriever_cls = CategoryRetriever
+    except ImportError:
+        retriever_cls = None
+        print("sentence-transformers 미설치 → retrieval 생략")
+
+    scope = ["문서0", "주제0"]
+
+    print(f"tokenizer={tokenizer_name} top_k={args.top_k}")
+    print(f"{'categories':>10} | {'full':>8} | {'scoped':>8} | {'retrieval':>9} | {'sync(s)':>8}")
+    for size in args.sizes:
+        registry = build_synthetic_registry(size)
+
+        full = count_tokens(build_user_prompt(registry.to_legacy(), SAMPLE_SECTION))
+        scoped = count_tokens(build_user_prompt(registry, SAMPLE_SECTION, scope=scope))
+
+        retrieval, sync_sec = "-", "-"
+        if retriever_cls is not None:
+            retriever = retriever_cls()
+            started = time.perf_counter()
+            retriever.sync(registry)
+            sync_sec = f"{time.perf_counter() - started:.2f}"
+            retrieval = count_tokens(
+                build_user_prompt(registry, SAMPLE_SECTION, retriever=retriever, top_k=args.top_k)
+            )
+
+        print(f"{len(registry):>10} | {full:>8} | {scoped:>8} | {retrieval:>9} | {sync_sec:>8}")
+
+
+if __name__ == "__main__":
+    main()
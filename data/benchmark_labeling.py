@@ -0,0 +1,96 @@
+"""
+경계 라벨링 요청 수 / 프롬프트 토큰 비교 (단건 모드 vs sliding-block 모드)
+
+같은 코퍼스에 대해 두 모드가 LLM 에 보내게 될 프롬프트를 그대로 만들어서
+요청 수와 프롬프트 토큰 수를 센다. (LLM 호출 없음)
+
+사용법:
+    python benchmark_labeling.py docs_data/raw_file --block-size 8 --overlap 1
+"""
+import argparse
+import json
+from pathlib import Path
+
+from modules.data_parsing import parsing_md_sentence
+from modules.data_labeling import (
+    SYSTEM_PROMPT,
+    BLOCK_SYSTEM_PROMPT,
+    build_context,
+    build_block_payload,
+    heuristic_label,
+    iter_blocks,
+)
+
+
+def get_token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")  # gpt-4o-mini
+        return lambda text: len(encoding.encode(text)), "tiktoken(o200k_base)"
+    except ImportError:
+        # tiktoken 이 없으면 utf-8 바이트 / 4 로 근사
+        return lambda text: len(text.encode("utf-8")) // 4, "approx(bytes/4)"
+
+
+def count_per_element(data, window, count_tokens):
+    requests, tokens = 0, 0
+    for i in range(len(data)):
+        if heuristic_label(data, i) is not None:
+            continue
+        user_payload = {"context": build_context(data, i, window=window), "target_pos": 0}
+        requests += 1
+        tokens += count_tokens(SYSTEM_PROMPT) + count_tokens(json.dumps(user_payload, ensure_ascii=False))
+    return requests, tokens
+
+
+def count_block(data, window, block_size, overlap, count_tokens):
+    pending = {i for i in range(len(data)) if heuristic_label(data, i) is None}
+    requests, tokens = 0, 0
+    for block_start, block_end in iter_blocks(len(data), block_size, overlap):
+        targets = [i for i in range(block_start, block_end) if i in pending]
+        if not targets:
+            continue
+        payload = build_block_payload(data, block_start, block_end, targets, window=window)
+        requests += 1
+        tokens += count_tokens(BLOCK_SYSTEM_PROMPT) + count_tokens(json.dumps(payload, ensure_ascii=False))
+    return requests, tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", help="마크다운(.md) 파일 또는 폴더")
+    parser.add_argument("--window", type=int, default=2)
+    parser.add_argument("--block-size", type=int, default=8)
+    parser.add_argument("--overlap", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = Path(args.corpus)
+    files = sorted(corpus.glob("*.md")) if corpus.is_dir() else [corpus]
+    count_tokens, tokenizer_name = get_token_counter()
+
+    total = {"element": [0, 0], "block": [0, 0]}
+    for md_path in files:
+        data = parsing_md_sentence(md_path.read_text(encoding="utf-8"))
+
+        e_req, e_tok = count_per_element(data, args.window, count_tokens)
+        b_req, b_tok = count_block(data, args.window, args.block_size, args.overlap, count_tokens)
+
+        total["element"][0] += e_req
+        total["element"][1] += e_tok
+        total["block"][0] += b_req
+        total["block"][1] += b_tok
+
+        print(f"{md_path.name:<30} elements={len(data):>5} | "
+              f"per-element req={e_req:>5} tok={e_tok:>8} | block req={b_req:>5} tok={b_tok:>8}")
+
+    e_req, e_tok = total["element"]
+    b_req, b_tok = total["block"]
+    print("-" * 100)
+    print(f"tokenizer={tokenizer_name} window={args.window} block_size={args.block_size} overlap={args.overlap}")
+    print(f"requests      : {e_req} → {b_req} ({(1 - b_req / e_req) * 100 if e_req else 0:.1f}% 감소)")
+    print(f"prompt tokens : {e_tok} → {b_tok} ({(1 - b_tok / e_tok) * 100 if e_tok else 0:.1f}% 감소)")
+
+
+if __name__ == "__main__":
+    main()
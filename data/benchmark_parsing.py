@@ -0,0 +1,74 @@
+"""
+parsing_md_sentence 스캐너 벤치마크 (regex vs linear)
+
+- 실제 문서 : 인자로 받은 .md 파일/폴더
+- 적대적 문서 : 종결 부호 없는 긴 줄, 닫히지 않은 ``` 반복, '>' 없는 <h1 반복, 긴 공백/<br 반복
+각 문서에 대해 두 스캐너의 청크 결과가 같은지 검증하고 소요 시간을 출력한다.
+regex 가 --regex-limit 초를 넘긴 종류는 더 큰 크기에서 regex 측정을 생략한다.
+
+사용법:
+    python benchmark_parsing.py docs_data/raw_file --sizes 1000 4000 16000 64000
+"""
+import argparse
+import time
+from pathlib import Path
+
+from modules.data_parsing import parsing_md_sentence
+
+ADVERSARIAL = {
+    "long_line_no_punct": lambda n: "가" * n,
+    "long_words_no_punct": lambda n: "word " * (n // 5),
+    "unclosed_fences": lambda n: "\n```" * (n // 4),
+    "unclosed_html_header": lambda n: "<h1 title\n" * (n // 10),
+    "html_header_no_close": lambda n: "<h1>" + "x" * n,
+    "br_whitespace": lambda n: "<br" + " " * n,
+    "many_short_lines": lambda n: "문장입니다\n" * (n // 6),
+    "mixed": lambda n: ("# 제목\n- 항목\n본문 문장입니다. 다음 문장!\n```py\nprint(1)\n```\n" * (n // 50 + 1))[:n],
+}
+
+
+def timed(md: str, scanner: str):
+    started = time.perf_counter()
+    chunks = parsing_md_sentence(md, scanner=scanner)
+    return chunks, time.perf_counter() - started
+
+
+def run(name: str, md: str, measure_regex: bool):
+    linear_chunks, linear_sec = timed(md, "linear")
+    if not measure_regex:
+        print(f"{name:<40} {len(md):>9} | regex {'skip':>9} | linear {linear_sec:>8.4f}s |")
+        return None
+
+    regex_chunks, regex_sec = timed(md, "regex")
+    same = "OK" if regex_chunks == linear_chunks else "MISMATCH"
+    print(f"{name:<40} {len(md):>9} | regex {regex_sec:>8.4f}s | linear {linear_sec:>8.4f}s | "
+          f"x{regex_sec / max(linear_sec, 1e-9):>7.1f} | {same}")
+    if same != "OK":
+        raise SystemExit(f"chunk mismatch: {name}")
+    return regex_sec
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?", help="실제 마크다운(.md) 파일 또는 폴더")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000, 64000])
+    parser.add_argument("--regex-limit", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'document':<40} {'chars':>9} |")
+    if args.corpus:
+        corpus = Path(args.corpus)
+        files = sorted(corpus.glob("*.md")) if corpus.is_dir() else [corpus]
+        for md_path in files:
+            run(md_path.name, md_path.read_text(encoding="utf-8"), measure_regex=True)
+
+    for kind, make in ADVERSARIAL.items():
+        measure_regex = True
+        for size in args.sizes:
+            regex_sec = run(f"{kind}[{size}]", make(size), measure_regex)
+            if regex_sec is not None and regex_sec > args.regex_limit:
+                measure_regex = False
+
+
+if __name__ == "__main__":
+    main()
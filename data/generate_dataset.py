@@ -5,16 +5,16 @@ from dotenv import load_dotenv
 from pathlib import Path
 from modules.data_parsing import mask_links
 from modules.data_parsing import parsing_md_sentence
-from modules.data_categorize import update_category_from_prompt
+from modules.data_categorize import update_category_from_prompt, CategoryRegistry
 
 load_dotenv()
 
 output_path = Path("docs_data/category_list.json")
 
-with output_path.open("r", encoding="utf-8") as f:
-    category_list = json.load(f)
+# 기존 list[list[str]] 형식도 그대로 로드됨
+category_list = CategoryRegistry.load(output_path)
 
-print("category list : ", category_list)
+print("category count : ", len(category_list))
 
 folder_path = Path("docs_data/before_raw_file/")
 
@@ -44,16 +44,9 @@ def convert_to_jsonl(doc):
     
     return response.choices[0].message.content
 
-def create_index(file_name, section, category_list) :
-    category = ""
-    for i, depth_category in enumerate(category_list):
-        category += f"\tdepth_{i} : "
-        if len(depth_category) < 1 :
-            category += "카테고리 생성 필요"
-            continue
-        for s in depth_category:
-            category += (s+", ")
-        category += "\n"
+def create_index(file_name, section, category_list, scope=None) :
+    # 직전 색인(scope) 주변 subtree 만 포함
+    category = category_list.render(scope)
 
     section_summary = section["summary"]
     section_text = section["text"]
@@ -223,9 +216,11 @@ for FILE_NAME in file_names:
     OUTPUT_PATH = f"docs_data/indexing_data/index_data_{FILE_NAME}.jsonl"
 
     with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        scope = None
         for section in sections:
 
-            index, category_list = create_index(FILE_NAME, section, category_list)
+            index, category_list = create_index(FILE_NAME, section, category_list, scope)
+            scope = index.splitlines()[0].split(".") if index.strip() else None
 
             record = {
                 "text" : section["text"],
@@ -239,5 +234,4 @@ for FILE_NAME in file_names:
 
     output_path = Path("docs_data/category_list.json")
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(category_list, f, ensure_ascii=False, indent=2)
+    category_list.save(output_path)
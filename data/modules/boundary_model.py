@@ -0,0 +1,150 @@
+"""
+로컬 CPU 경계 분류기
+
+generate_dataset.py 가 만드는 embedding_*.jsonl ({"text_a", "text_b", "label"}) 으로 학습한다.
+label 은 "같은 청크로 이어지는지" (1 = 이어짐, 0 = 경계) 이므로 break = 1 - label.
+
+구조:
+    MiniLM 임베딩(a, b) → [a, b, |a-b|, a*b] → 로지스틱 회귀 → P(break)
+
+labeling_md_sentence(boundary_model=...) 에서 확신도가 높은 경우만 로컬로 결정하고
+나머지만 LLM 에 넘기는 cascade 로 사용한다.
+"""
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def load_pair_dataset(paths: Iterable[str]) -> Tuple[List[str], List[str], np.ndarray]:
+    """embedding_*.jsonl 파일들을 읽어 (text_a 목록, text_b 목록, break 라벨) 반환"""
+    texts_a, texts_b, breaks = [], [], []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                obj = json.loads(line)
+                texts_a.append(obj["text_a"])
+                texts_b.append(obj["text_b"])
+                breaks.append(1 - int(obj["label"]))
+
+    return texts_a, texts_b, np.array(breaks, dtype=np.float32)
+
+
+class BoundaryClassifier:
+    """MiniLM 임베딩 + 로지스틱 회귀 헤드 (CPU 배치 추론)"""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL_NAME, batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.encoder = SentenceTransformer(model_name, device="cpu")
+        self.weights = None
+        self.bias = 0.0
+
+    # -----------------------------
+    # 특징 추출
+    # -----------------------------
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.encoder.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        )
+
+    def featurize(self, texts_a: List[str], texts_b: List[str]) -> np.ndarray:
+        # 중복 텍스트는 한 번만 임베딩 (연속 쌍은 text_b 가 다음 쌍의 text_a)
+        unique = list(dict.fromkeys(texts_a + texts_b))
+        vectors = self._encode(unique)
+        lookup = {text: vectors[i] for i, text in enumerate(unique)}
+
+        a = np.stack([lookup[t] for t in texts_a])
+        b = np.stack([lookup[t] for t in texts_b])
+        return np.hstack([a, b, np.abs(a - b), a * b]).astype(np.float32)
+
+    # -----------------------------
+    # 학습 / 추론
+    # -----------------------------
+    def fit(
+        self,
+        texts_a: List[str],
+        texts_b: List[str],
+        breaks: np.ndarray,
+        epochs: int = 300,
+        lr: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "BoundaryClassifier":
+        x = self.featurize(texts_a, texts_b)
+        y = breaks.astype(np.float32)
+
+        # 클래스 불균형 보정 (경계는 소수 클래스)
+        pos = max(float(y.sum()), 1.0)
+        neg = max(float(len(y) - y.sum()), 1.0)
+        sample_weight = np.where(y == 1, len(y) / (2 * pos), len(y) / (2 * neg))
+
+        self.weights = np.zeros(x.shape[1], dtype=np.float32)
+        self.bias = 0.0
+        for _ in range(epochs):
+            p = self._sigmoid(x @ self.weights + self.bias)
+            grad = (p - y) * sample_weight
+            self.weights -= lr * (x.T @ grad / len(y) + l2 * self.weights)
+            self.bias -= lr * float(grad.mean())
+
+        return self
+
+    def predict_proba(self, texts_a: List[str], texts_b: List[str]) -> np.ndarray:
+        """각 쌍에 대해 P(break) 반환"""
+        if self.weights is None:
+            raise ValueError("BoundaryClassifier is not trained. call fit() or load() first")
+        if not texts_a:
+            return np.zeros(0, dtype=np.float32)
+        return self._sigmoid(self.featurize(texts_a, texts_b) @ self.weights + self.bias)
+
+    def decide(
+        self,
+        data: List[Dict[str, Any]],
+        indices: List[int],
+        threshold: float = 0.9,
+    ) -> Dict[int, int]:
+        """
+        data[i] 뒤의 경계 여부를 확신도 threshold 이상인 경우만 결정
+        반환 : {index: label} (불확실하거나 다음 요소가 없는 index 는 포함되지 않음 → LLM 대상)
+        """
+        candidates = [i for i in indices if i + 1 < len(data)]
+        probs = self.predict_proba(
+            [data[i]["text"] for i in candidates],
+            [data[i + 1]["text"] for i in candidates],
+        )
+
+        decided = {}
+        for i, p in zip(candidates, probs):
+            if p >= threshold:
+                decided[i] = 1
+            elif p <= 1 - threshold:
+                decided[i] = 0
+        return decided
+
+    @staticmethod
+    def _sigmoid(z: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+    # -----------------------------
+    # 저장 / 로드
+    # -----------------------------
+    def save(self, path: str):
+        np.savez(Path(path), weights=self.weights, bias=self.bias, model_name=self.model_name)
+
+    @classmethod
+    def load(cls, path: str, batch_size: int = 64) -> "BoundaryClassifier":
+        saved = np.load(Path(path))
+        model = cls(model_name=str(saved["model_name"]), batch_size=batch_size)
+        model.weights = saved["weights"]
+        model.bias = float(saved["bias"])
+        return model
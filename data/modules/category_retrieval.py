@@ -0,0 +1,232 @@
+"""
+색인 프롬프트용 카테고리 shortlist 검색
+
+카테고리 이름을 한 번만 임베딩해서 캐시하고, 섹션마다 depth 별 top-k 카테고리만
+프롬프트에 넣는다. 새 카테고리는 sync() 호출 시 그것만 추가 임베딩한다
+(CategoryRegistry 는 등록 기록(added_since)으로 마지막 sync 이후 추가분만 확인).
+
+CategoryRegistry 를 sync 했으면 depth 1 이상은 상위 카테고리(scope 경로, 없으면 직전 depth 에서
+가장 가까운 카테고리)의 하위 카테고리 + 상위 미지정 카테고리 중에서만 고른다.
+
+사용 예:
+    retriever = CategoryRetriever(cache_path="docs_data/category_vectors.npz")
+    retriever.sync(category_registry)
+    text = retriever.render_shortlist(section["text"], top_k=10, scope=["문서", "주제"])
+    retriever.save()
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.data_categorize import CategoryRegistry, clean_category_name
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class CategoryRetriever:
+    """depth 별 카테고리 임베딩 캐시 + top-k 검색"""
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        cache_path: Optional[str] = None,
+        max_query_chars: int = 1000,
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.encoder = SentenceTransformer(model_name, device="cpu")
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_query_chars = max_query_chars
+
+        # depth → (이름 목록, 정규화된 벡터 행렬, 이름 → 행 번호)
+        self._names: Dict[int, List[str]] = {}
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._rows: Dict[int, Dict[str, int]] = {}
+        self._known: set = set()
+
+        # 마지막으로 sync 한 registry 와 그 등록 기록 위치
+        self._registry: Optional[CategoryRegistry] = None
+        self._synced = 0
+
+        if self.cache_path and self.cache_path.exists():
+            self._load_cache()
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.encoder.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32)
+
+    # -----------------------------
+    # 증분 임베딩
+    # -----------------------------
+    def sync(self, category) -> int:
+        """
+        registry(또는 list[list[str]]) 에서 아직 임베딩되지 않은 카테고리만 임베딩
+        반환 : 새로 임베딩한 카테고리 수
+        """
+        if isinstance(category, CategoryRegistry):
+            if category is not self._registry:
+                self._registry, self._synced = category, 0
+            candidates = category.added_since(self._synced)
+            self._synced += len(candidates)
+        else:
+            # 기존 형식은 부모 정보가 없으므로 depth 제한 없이 검색
+            self._registry = None
+            candidates = [(depth, name) for depth, names in enumerate(category or []) for name in names]
+
+        new_items: List[Tuple[int, str]] = []
+        for item in candidates:
+            if item not in self._known:
+                self._known.add(item)
+                new_items.append(item)
+
+        if not new_items:
+            return 0
+
+        vectors = self._encode([name for _, name in new_items])
+        for depth, name in new_items:
+            rows = self._rows.setdefault(depth, {})
+            rows[name] = len(rows)
+            self._names.setdefault(depth, []).append(name)
+
+        # depth 별로 한 번에 행렬 확장
+        for depth in {depth for depth, _ in new_items}:
+            rows = [vector for (d, _), vector in zip(new_items, vectors) if d == depth]
+            stacked = np.vstack(rows)
+            if depth in self._vectors:
+                stacked = np.vstack([self._vectors[depth], stacked])
+            self._vectors[depth] = stacked
+
+        return len(new_items)
+
+    # -----------------------------
+    # 검색 / 렌더링
+    # -----------------------------
+    def _top(self, depth: int, scores: np.ndarray, allowed: Optional[List[int]], top_k: int) -> List[str]:
+        """depth 의 후보(allowed 행 번호, None 이면 전체) 중 점수 상위 top_k 이름"""
+        names = self._names[depth]
+        if allowed is None:
+            candidates = scores
+        elif not allowed:
+            return []
+        else:
+            allowed = np.array(allowed)
+            candidates = scores[allowed]
+
+        k = min(top_k, len(candidates))
+        top = np.argpartition(-candidates, k - 1)[:k]
+        top = top[np.argsort(-candidates[top])]
+        if allowed is not None:
+            top = allowed[top]
+        return [names[i] for i in top]
+
+    def shortlist(
+        self, query: str, top_k: int = 10, scope: Optional[List[str]] = None
+    ) -> List[Tuple[Optional[List[str]], List[str]]]:
+        """
+        query 와 가까운 카테고리를 depth 별로 최대 top_k 개 반환 : [(상위 경로, 이름 목록), ...]
+
+        CategoryRegistry 를 sync 했으면 depth 1 이상은 상위 경로의 하위 카테고리 + 상위 미지정 카테고리만 후보.
+        상위 경로는 scope 를 따르고, scope 가 끝나거나 registry 에 없으면 직전 depth 의 1순위 카테고리로 이어간다.
+        (상위 경로를 더 이어갈 수 없으면 상위 미지정 카테고리만, 상위 경로는 None)
+        sync 한 것이 list[list[str]] 이면 depth 제한 없이 전체에서 고름 (상위 경로 None)
+        """
+        if not self._names:
+            return []
+
+        query_vector = self._encode([query[: self.max_query_chars]])[0]
+        registry = self._registry
+        scope = [clean_category_name(name) for name in scope or []]
+        path: Optional[List[str]] = []
+
+        result = []
+        for depth in range(max(self._names) + 1):
+            rows = self._rows.get(depth, {})
+            if not rows:
+                result.append((path if registry is not None else None, []))
+                path = None
+                continue
+
+            if registry is None:
+                result.append((None, self._top(depth, self._vectors[depth] @ query_vector, None, top_k)))
+                continue
+
+            children = set(registry.iter_children(path)) if path is not None else set()
+            allowed_names = children | registry.unparented.get(depth, set())
+            allowed = [rows[name] for name in allowed_names if name in rows]
+            names = self._top(depth, self._vectors[depth] @ query_vector, allowed, top_k) if allowed else []
+            result.append((path, names))
+
+            # 다음 depth 의 상위 경로
+            if path is None:
+                continue
+            if depth < len(scope) and scope[depth] in children:
+                path = path + [scope[depth]]
+            else:
+                best = next((name for name in names if name in children), None)
+                path = path + [best] if best is not None else None
+
+        return result
+
+    def render_shortlist(self, query: str, top_k: int = 10, scope: Optional[List[str]] = None) -> str:
+        shortlist = self.shortlist(query, top_k=top_k, scope=scope)
+        if not shortlist:
+            return "\tdepth_0 : 카테고리 생성 필요"
+
+        lines = []
+        for depth, (parent, names) in enumerate(shortlist):
+            shown = ", ".join(names) if names else "카테고리 생성 필요"
+            if self._registry is None:
+                lines.append(f"\tdepth_{depth} : {shown}")
+            else:
+                parent = (".".join(parent) or "(root)") if parent is not None else "(상위 미지정)"
+                lines.append(f"\tdepth_{depth} | {parent} : {shown}")
+        return "\n".join(lines)
+
+    # -----------------------------
+    # 캐시 저장 / 로드
+    # -----------------------------
+    def save(self, path: Optional[str] = None):
+        path = Path(path) if path else self.cache_path
+        if path is None:
+            raise ValueError("cache_path is not set")
+
+        depths, names, vectors = [], [], []
+        for depth in sorted(self._names):
+            depths.extend([depth] * len(self._names[depth]))
+            names.extend(self._names[depth])
+            vectors.append(self._vectors[depth])
+
+        np.savez(
+            path,
+            model_name=self.model_name,
+            depths=np.array(depths, dtype=np.int32),
+            names=np.array(names, dtype=str),
+            vectors=np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32),
+        )
+
+    def _load_cache(self):
+        saved = np.load(self.cache_path)
+        if str(saved["model_name"]) != self.model_name:
+            # 다른 모델로 만든 벡터는 재사용 불가
+            print(f"category vector cache model mismatch → ignore ({self.cache_path})")
+            return
+
+        for depth, name in zip(saved["depths"], saved["names"]):
+            depth, name = int(depth), str(name)
+            rows = self._rows.setdefault(depth, {})
+            rows[name] = len(rows)
+            self._names.setdefault(depth, []).append(name)
+            self._known.add((depth, name))
+
+        for depth in self._names:
+            mask = saved["depths"] == depth
+            self._vectors[depth] = saved["vectors"][mask]
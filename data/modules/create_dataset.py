@@ -1,15 +1,15 @@
 import json
 from modules.data_parsing import parsing_md_sentence
 from modules.data_labeling import labeling_md_sentence, labeling_md_sentence_with_boundary
-from modules.data_categorize import build_sections, build_context, build_index_prompt, build_user_prompt, generate_index, update_category_from_prompt
+from modules.data_categorize import build_sections, build_context, build_index_prompt, build_user_prompt, generate_index, update_category_from_prompt, CategoryRegistry
 import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def create_embedding_dataset(data: str, output_path):
+def create_embedding_dataset(data: str, output_path, boundary_model=None):
     parsed_data = parsing_md_sentence(data)
-    labeled_data = labeling_md_sentence(parsed_data, window=5)
+    labeled_data = labeling_md_sentence(parsed_data, window=5, boundary_model=boundary_model)
 
     with open(output_path, "w", encoding="utf-8") as f:
         for i in range(len(labeled_data) - 1):
@@ -23,7 +23,7 @@ def create_embedding_dataset(data: str, output_path):
             }
             f.write(json.dumps(record, ensure_ascii=False) + "\n")
 
-def create_category_dataset(data: str, output_path, category, model="gpt-4o-mini", section_boudary=False, masking_path=None) :
+def create_category_dataset(data: str, output_path, category, model="gpt-4o-mini", section_boudary=False, masking_path=None, retriever=None, top_k=10, save_every=20) :
     parsed_data = parsing_md_sentence(data, masking_path)
     if section_boudary is True:
         labeled_data = labeling_md_sentence_with_boundary(parsed_data)
@@ -33,7 +33,10 @@ def create_category_dataset(data: str, output_path, category, model="gpt-4o-mini
 
     results = []
 
+    # list[list[str]] 로 넘어와도 registry 로 변환 (프롬프트에는 직전 색인 주변 subtree 만 포함)
+    category = CategoryRegistry.from_data(category)
     updated_category = category
+    scope = None
 
     for i, item in enumerate(sections):
         # 프롬프트용 맥락
@@ -41,11 +44,15 @@ def create_category_dataset(data: str, output_path, category, model="gpt-4o-mini
 
         # 색인 생성
         system_prompt = build_index_prompt(context_text)
-        user_prompt = build_user_prompt(category, item)
+        if retriever is not None:
+            # 직전 섹션에서 추가된 카테고리만 증분 임베딩
+            retriever.sync(category)
+        user_prompt = build_user_prompt(category, item, scope=scope, retriever=retriever, top_k=top_k)
         index = generate_index(system_prompt, user_prompt, model_name=model)
         time.sleep(0.5)
 
         final_index, category = update_category_from_prompt(index, category)
+        scope = final_index.splitlines()[0].split(".") if final_index.strip() else None
         print(item["header_path"])
         print(final_index)
         
@@ -55,6 +62,15 @@ def create_category_dataset(data: str, output_path, category, model="gpt-4o-mini
             "index": final_index,
             "header_path": item["header_path"]
         })
+
+        # 임베딩 캐시는 save_every 섹션마다 저장 (중간에 중단돼도 다음 실행에서 재사용)
+        if retriever is not None and retriever.cache_path is not None and (i + 1) % save_every == 0:
+            retriever.sync(category)
+            retriever.save()
+
+    if retriever is not None and retriever.cache_path is not None:
+        retriever.sync(category)
+        retriever.save()
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
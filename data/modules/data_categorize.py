@@ -1,54 +1,15 @@
 from openai import OpenAI
 from dotenv import load_dotenv
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+import json
 import re
 
+# 헤더 파싱 / 청킹은 backend/common/markdown_chunker 와 같은 결과 (modules/markdown_chunker 복사본)
+from modules.markdown_chunker import clean_header_text, parse_markdown_header, iter_markdown_spans
+
 load_dotenv()
 client = OpenAI()
 
-def clean_header_text(text: str) -> str:
-    # HTML 태그 제거
-    text = re.sub(r"<[^>]+>", "", text)
-
-    # Markdown 강조 제거
-    text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
-    text = re.sub(r"\*(.*?)\*", r"\1", text)
-    text = re.sub(r"__(.*?)__", r"\1", text)
-    text = re.sub(r"_(.*?)_", r"\1", text)
-
-    return text.strip()
-
-def parse_markdown_header(text: str) -> Optional[Tuple[int, str]]:
-    """
-    마크다운 헤더(#, ##, ### ...)를 파싱
-    반환:
-      - (depth, header_text)
-      - 헤더가 아니면 None
-    """
-    text = text.strip()
-
-    md_match = re.match(r"^(#{1,6})\s+(.*)", text)
-    if md_match:
-        depth = len(md_match.group(1))
-        header_text = md_match.group(2)
-
-        header_text = clean_header_text(header_text)
-        return depth, header_text
-    
-    html_match = re.match(
-        r"^<h([1-6])[^>]*>(.*?)</h\1>",
-        text,
-        flags=re.IGNORECASE
-    )
-    if html_match:
-        depth = int(html_match.group(1))
-        header_text = html_match.group(2)
-
-        header_text = clean_header_text(header_text)
-        return depth, header_text
-
-    return None
-
 def build_sections(data: Dict):
     """
     label=1을 기준으로 섹션 단위 텍스트를 생성
@@ -100,6 +61,15 @@ def build_sections(data: Dict):
 
     return sections
 
+def build_sections_from_markdown(md: str):
+    """
+    라벨링 없이 원문 마크다운을 헤더 단위 섹션으로 분할 (build_sections 와 같은 header_path)
+    """
+    return [
+        {"text": md[start:end], "header_path": header_path}
+        for _, start, end, header_path in iter_markdown_spans(md)
+    ]
+
 def build_context(sections, idx, window=5):
     start = max(0, idx - window)
     end = min(len(sections), idx + window + 1)
@@ -110,8 +80,19 @@ def build_context(sections, idx, window=5):
 
     return "\n\n".join(parts)
 
-def build_user_prompt(category, sections):
+def build_user_prompt(category, sections, scope=None, retriever=None, top_k=10):
     prompt = "header_path : " + sections["header_path"] + "\n" + "text : " + sections["text"] + "\n"
+
+    # retriever(modules.category_retrieval.CategoryRetriever) 가 있으면 섹션과 가까운 depth 별 top_k 만 포함
+    # (depth 1 이상은 scope 또는 가장 가까운 상위 카테고리의 하위 카테고리 중에서만 선택)
+    if retriever is not None:
+        query = sections["header_path"] + "\n" + sections["text"]
+        return prompt + "categories: \n" + retriever.render_shortlist(query, top_k=top_k, scope=scope) + "\n"
+
+    # CategoryRegistry 면 scope 주변 subtree 만 포함 (전체 카테고리 수와 무관한 프롬프트 크기)
+    if isinstance(category, CategoryRegistry):
+        return prompt + "categories: \n" + category.render(scope) + "\n"
+
     str = "categories: \n"
     for i, depth_category in enumerate(category):
         str += f"\tdepth_{i} : "
@@ -158,13 +139,228 @@ def generate_index(system_prompt: str, user_prompt: dict, model_name) -> str:
 
     return response.choices[0].message.content.strip()
 
+def clean_category_name(raw: str) -> str:
+    # "_" 와 공백 제거
+    return raw.replace("_", "").replace(" ", "").strip()
+
+class CategoryRegistry:
+    """
+    계층형 카테고리 저장소
+
+    - 카테고리는 부모 경로 아래에만 존재 (tree: {name: {child: {...}}})
+    - 경로/depth 멤버십 확인 O(1) (depth 별 이름 카운트 dict 유지)
+    - JSON 저장은 키 정렬로 항상 같은 결과 (diff 안정)
+    - render(scope) 는 scope 경로 주변 subtree 만 출력 → 프롬프트 크기가 전체 카테고리 수에 비례하지 않음
+    - 기존 list[list[str]] 형식의 depth 1 이상 이름은 부모를 알 수 없으므로 unparented 에 depth 별로 보관
+      (저장/로드/렌더링에 포함, 이후 add_path 로 부모 아래 등록되면 unparented 에서 빠짐)
+    """
+
+    FORMAT = "category_registry"
+    VERSION = 1
+
+    def __init__(self):
+        self.tree: Dict[str, dict] = {}
+        self.unparented: Dict[int, set] = {}
+        self._depth_names: List[Dict[str, int]] = []
+        # depth 에 처음 등장한 (depth, name) 순서 기록 (CategoryRetriever 증분 임베딩용)
+        self._added: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return sum(len(names) for names in self._depth_names)
+
+    # -----------------------------
+    # 추가 / 조회
+    # -----------------------------
+    def add_path(self, parts: List[str]) -> List[str]:
+        """경로를 등록하고 정제된 경로를 반환 (빈 이름은 건너뜀)"""
+        node = self.tree
+        path = []
+        for raw in parts:
+            name = clean_category_name(raw)
+            if not name:
+                continue
+
+            depth = len(path)
+            if name not in node:
+                node[name] = {}
+                while depth >= len(self._depth_names):
+                    self._depth_names.append({})
+                names = self._depth_names[depth]
+                if name not in names:
+                    self._added.append((depth, name))
+                names[name] = names.get(name, 0) + 1
+                self.unparented.get(depth, set()).discard(name)
+
+            node = node[name]
+            path.append(name)
+
+        return path
+
+    def add_unparented(self, name: str, depth: int) -> bool:
+        """부모를 알 수 없는 depth 의 이름 등록 (이미 그 depth 에 있으면 무시)"""
+        name = clean_category_name(name)
+        if not name or self.exists_at_depth(name, depth):
+            return False
+        while depth >= len(self._depth_names):
+            self._depth_names.append({})
+        self._depth_names[depth][name] = 0
+        self._added.append((depth, name))
+        self.unparented.setdefault(depth, set()).add(name)
+        return True
+
+    def added_since(self, position: int = 0) -> List[Tuple[int, str]]:
+        """position 번째 이후 새로 등록된 (depth, name) 목록 (position 은 이전 호출까지 받은 개수)"""
+        return self._added[position:]
+
+    def contains(self, parts: List[str]) -> bool:
+        node = self.tree
+        for name in parts:
+            if name not in node:
+                return False
+            node = node[name]
+        return True
+
+    def exists_at_depth(self, name: str, depth: int) -> bool:
+        return depth < len(self._depth_names) and name in self._depth_names[depth]
+
+    def children(self, parts: List[str]) -> List[str]:
+        node = self.tree
+        for name in parts:
+            node = node.get(name)
+            if node is None:
+                return []
+        return sorted(node)
+
+    def iter_children(self, parts: List[str]):
+        """children 과 같지만 정렬하지 않음 (경로가 없으면 빈 결과)"""
+        node = self.tree
+        for name in parts:
+            node = node.get(name)
+            if node is None:
+                return iter(())
+        return iter(node)
+
+    # -----------------------------
+    # 프롬프트 렌더링
+    # -----------------------------
+    def render(self, scope: Optional[List[str]] = None, max_depth: int = 2, max_siblings: int = 30) -> str:
+        """
+        scope 경로 주변만 렌더링
+
+        - scope 경로를 따라 각 단계의 형제 카테고리 (최대 max_siblings 개)
+        - scope 가 끝나는 노드 아래 max_depth 단계의 subtree
+        scope 가 없으면 최상위 카테고리 + max_depth 단계
+        """
+        if not self.tree:
+            return "\tdepth_0 : 카테고리 생성 필요"
+
+        lines = []
+        node = self.tree
+        prefix: List[str] = []
+
+        for raw in scope or []:
+            name = clean_category_name(raw)
+            if name not in node:
+                break
+            lines.append(self._render_level(prefix, node, max_siblings))
+            node = node[name]
+            prefix = prefix + [name]
+
+        self._render_subtree(prefix, node, max_depth, max_siblings, lines)
+        for depth in sorted(self.unparented):
+            names = sorted(self.unparented[depth])
+            if not names:
+                continue
+            shown = ", ".join(names[:max_siblings])
+            if len(names) > max_siblings:
+                shown += f", ... (+{len(names) - max_siblings})"
+            lines.append(f"\tdepth_{depth} | (상위 미지정) : {shown}")
+        return "\n".join(line for line in lines if line)
+
+    @staticmethod
+    def _render_level(prefix: List[str], node: dict, max_siblings: int) -> str:
+        names = sorted(node)
+        shown = ", ".join(names[:max_siblings])
+        if len(names) > max_siblings:
+            shown += f", ... (+{len(names) - max_siblings})"
+        parent = ".".join(prefix) if prefix else "(root)"
+        return f"\tdepth_{len(prefix)} | {parent} : {shown}"
+
+    def _render_subtree(self, prefix, node, max_depth, max_siblings, lines):
+        if max_depth <= 0 or not node:
+            return
+        lines.append(self._render_level(prefix, node, max_siblings))
+        for name in sorted(node)[:max_siblings]:
+            self._render_subtree(prefix + [name], node[name], max_depth - 1, max_siblings, lines)
+
+    # -----------------------------
+    # 저장 / 로드
+    # -----------------------------
+    def to_dict(self) -> dict:
+        data = {"format": self.FORMAT, "version": self.VERSION, "tree": self.tree}
+        unparented = {str(depth): sorted(names) for depth, names in self.unparented.items() if names}
+        if unparented:
+            data["unparented"] = unparented
+        return data
+
+    def to_legacy(self) -> List[List[str]]:
+        """기존 list[list[str]] 형식 (depth 별 이름 목록)"""
+        return [sorted(names) for names in self._depth_names]
+
+    @classmethod
+    def from_data(cls, data) -> "CategoryRegistry":
+        """
+        to_dict() 결과 또는 기존 category_list.json (list[list[str]]) 로부터 생성
+        기존 형식은 부모 정보가 없으므로 depth_0 만 tree 로 복원하고
+        하위 depth 이름은 unparented 로 보관 (save 시 함께 저장되어 사라지지 않음)
+        """
+        if isinstance(data, cls):
+            return data
+
+        registry = cls()
+        if isinstance(data, dict) and data.get("format") == cls.FORMAT:
+            registry._load_tree(data.get("tree", {}), [])
+            for depth, names in data.get("unparented", {}).items():
+                for name in names:
+                    registry.add_unparented(name, int(depth))
+            return registry
+
+        for depth, names in enumerate(data or []):
+            for name in names:
+                if depth == 0:
+                    registry.add_path([name])
+                else:
+                    registry.add_unparented(name, depth)
+        return registry
+
+    def _load_tree(self, node: dict, prefix: List[str]):
+        for name, children in node.items():
+            self.add_path(prefix + [name])
+            self._load_tree(children, prefix + [name])
+
+    @classmethod
+    def load(cls, path) -> "CategoryRegistry":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_data(json.load(f))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2, sort_keys=True)
+
 def update_category_from_prompt(
     prompt: str,
-    category: list
+    category
 ):
     lines = prompt.splitlines()
     return_prompt = prompt.replace("_", "").replace(" ", "")
 
+    # CategoryRegistry 는 부모 경로 아래에 등록 (O(1) 멤버십)
+    if isinstance(category, CategoryRegistry):
+        for line in lines:
+            if line.strip():
+                category.add_path(line.split("."))
+        return return_prompt, category
+
     for line in lines:
         if not line.strip():
             continue
@@ -133,11 +133,239 @@ def predict_boundary_with_llm(context: List[Dict[str, Any]]) -> int:
 
     return int(result["break"])
 
+BLOCK_SYSTEM_PROMPT = SYSTEM_PROMPT.replace(
+    """    Your task is to decide whether a logical chunk boundary should occur
+    AFTER the element at position pos = 0.""",
+    """    Your task is to decide, for EACH position listed in target_pos,
+    whether a logical chunk boundary should occur AFTER that element.
+    Elements outside target_pos are context only.""",
+).replace(
+    """    Required output format:
+    {
+    "break": 0 or 1
+    }""",
+    """    - "breaks" MUST have exactly one value per target_pos, in the same order.
+
+    Required output format:
+    {
+    "breaks": [0 or 1, ...]
+    }""",
+)
+
+"""
+    블록 단위 라벨링 (요청 1회 = 연속된 N개 요소 라벨링)
+    block_start, block_end : 라벨링할 요소 범위 [block_start, block_end)
+    targets : 범위 내에서 LLM 판단이 필요한 인덱스 (휴리스틱으로 결정된 요소 제외)
+"""
+def build_block_context(
+    data: List[Dict[str, Any]],
+    block_start: int,
+    block_end: int,
+    window: int = 2,
+    max_text_len: int = 240,
+) -> List[Dict[str, Any]]:
+
+    context = []
+
+    for i in range(max(0, block_start - window), min(len(data), block_end + window)):
+        text = data[i]["text"]
+        if text is not None and len(text) > max_text_len:
+            text = text[:max_text_len] + "…"
+
+        context.append({
+            "pos": i - block_start,
+            "type": data[i]["type"],
+            "text": text
+        })
+
+    return context
+
+def build_block_payload(
+    data: List[Dict[str, Any]],
+    block_start: int,
+    block_end: int,
+    targets: List[int],
+    window: int = 2,
+) -> Dict[str, Any]:
+    return {
+        "context": build_block_context(data, block_start, block_end, window=window),
+        "target_pos": [i - block_start for i in targets]
+    }
+
+def predict_block_boundaries_with_llm(payload: Dict[str, Any]) -> List[int] | None:
+    """
+    블록 내 target_pos 전체에 대한 break 값을 한 번의 요청으로 예측
+    응답 길이가 맞지 않거나 JSON 파싱에 실패하면 None 반환 (호출부에서 단건 라벨링으로 대체)
+    """
+    response = client.chat.completions.create(
+        model=MODEL_NAME,
+        messages=[
+            {"role": "system", "content": BLOCK_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+        ],
+        temperature=0
+    )
+
+    try:
+        result = json.loads(response.choices[0].message.content)
+        breaks = [int(b) for b in result["breaks"]]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    if len(breaks) != len(payload["target_pos"]):
+        return None
+
+    return breaks
+
+def iter_blocks(length: int, block_size: int, overlap: int):
+    """
+    [start, end) 블록 범위를 생성
+    인접 블록은 overlap 개의 요소를 공유하며, 공유 요소는 reconcile_block_edges 에서 결정
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1")
+    if not 0 <= overlap < block_size:
+        raise ValueError("overlap must be in [0, block_size)")
+
+    stride = block_size - overlap
+    start = 0
+    while start < length:
+        end = min(length, start + block_size)
+        yield start, end
+        if end == length:
+            break
+        start += stride
+
+def reconcile_block_edges(votes: Dict[int, List[tuple]]) -> Dict[int, int]:
+    """
+    블록 경계에서 중복 라벨링된 요소의 최종 label 결정
+
+    votes : {index: [(label, margin), ...]}
+        margin = 해당 블록 요청에서 요소 뒤로 보이는 요소 수
+        (경계는 요소 "뒤"에 대한 판단이므로 뒤쪽 맥락을 더 많이 본 판단을 신뢰)
+
+    규칙:
+    - 판단이 일치하면 그대로 사용
+    - 불일치 시 margin 이 가장 큰 판단 사용
+    - margin 도 같으면 0 (불확실할 때는 경계를 만들지 않는다는 SYSTEM_PROMPT 기본 규칙)
+    """
+    labels = {}
+    for index, candidates in votes.items():
+        values = {label for label, _ in candidates}
+        if len(values) == 1:
+            labels[index] = values.pop()
+            continue
+
+        best_margin = max(margin for _, margin in candidates)
+        best = {label for label, margin in candidates if margin == best_margin}
+        labels[index] = best.pop() if len(best) == 1 else 0
+
+    return labels
+
+def labeling_md_sentence_block(
+    data: List[Dict[str, Any]],
+    window: int = 2,
+    block_size: int = 8,
+    overlap: int = 1,
+    boundary_model=None,
+    threshold: float = 0.9,
+) -> List[Dict[str, Any]]:
+    """
+    sliding-block 라벨링
+    - 휴리스틱으로 결정 가능한 요소는 먼저 라벨링 (LLM 대상에서 제외, 맥락으로만 사용)
+    - boundary_model 이 있으면 확신도 threshold 이상인 요소도 로컬에서 결정
+    - 나머지는 block_size 단위로 한 번에 요청하고 블록 경계(overlap)는 reconcile_block_edges 로 결정
+    - 블록 응답이 잘못되면 해당 블록만 단건(predict_boundary_with_llm) 방식으로 대체
+    """
+    overlap = min(overlap, block_size - 1)
+
+    pending = []
+    for i in range(len(data)):
+        heuristic = heuristic_label(data, i)
+        if heuristic is not None:
+            data[i]["label"] = heuristic
+        else:
+            pending.append(i)
+
+    local_labels = label_with_local_model(data, pending, boundary_model, threshold)
+    pending = [i for i in pending if i not in local_labels]
+
+    pending_set = set(pending)
+    votes: Dict[int, List[tuple]] = {}
+
+    for block_start, block_end in iter_blocks(len(data), block_size, overlap):
+        targets = [i for i in range(block_start, block_end) if i in pending_set]
+        if not targets:
+            continue
+
+        payload = build_block_payload(data, block_start, block_end, targets, window=window)
+        breaks = predict_block_boundaries_with_llm(payload)
+
+        if breaks is None:
+            print(f"[{block_start}:{block_end}] BLOCK | invalid response → per-element fallback")
+            breaks = [
+                predict_boundary_with_llm(build_context(data, i, window=window))
+                for i in targets
+            ]
+
+        context_end = min(len(data), block_end + window)
+        for i, label in zip(targets, breaks):
+            margin = context_end - 1 - i
+            votes.setdefault(i, []).append((label, margin))
+
+    for i, label in reconcile_block_edges(votes).items():
+        data[i]["label"] = label
+
+    for i, curr in enumerate(data):
+        source = "LLM" if i in pending_set else "LOCAL" if i in local_labels else "RULE"
+        print(f"[{i}] {source} | type={curr['type']} | label={curr['label']}")
+        print(repr(curr["text"]))
+        print("-" * 60)
+
+    return data
+
+def label_with_local_model(
+    data: List[Dict[str, Any]],
+    indices: List[int],
+    boundary_model=None,
+    threshold: float = 0.9,
+) -> Dict[int, int]:
+    """
+    로컬 경계 분류기(modules.boundary_model.BoundaryClassifier)로 확신도 높은 요소만 라벨링
+    반환 : {index: label} (여기 없는 index 는 LLM 대상)
+    """
+    if boundary_model is None or not indices:
+        return {}
+
+    decided = boundary_model.decide(data, indices, threshold=threshold)
+    for i, label in decided.items():
+        data[i]["label"] = label
+
+    print(f"LOCAL | {len(decided)}/{len(indices)} decided (threshold={threshold})")
+    return decided
+
 def labeling_md_sentence(
     data: List[Dict[str, Any]],
-    window: int = 2
+    window: int = 2,
+    block_size: int | None = None,
+    boundary_model=None,
+    threshold: float = 0.9,
 ) -> List[Dict[str, Any]]:
 
+    # block_size 지정 시 sliding-block 모드 (요청 1회에 여러 요소 라벨링)
+    if block_size:
+        return labeling_md_sentence_block(
+            data,
+            window=window,
+            block_size=block_size,
+            boundary_model=boundary_model,
+            threshold=threshold,
+        )
+
+    # boundary_model 지정 시 cascade (확신도 높은 경우 로컬 결정, 나머지만 LLM)
+    candidates = [i for i in range(len(data)) if heuristic_label(data, i) is None]
+    local_labels = label_with_local_model(data, candidates, boundary_model, threshold)
+
     for i in range(len(data)):
         heuristic = heuristic_label(data, i)
         if heuristic is not None:
@@ -149,6 +377,14 @@ def labeling_md_sentence(
             print("-" * 60)
             continue
 
+        if i in local_labels:
+            curr = data[i]
+
+            print(f"[{i}] LOCAL | type={curr['type']} | label={curr['label']}")
+            print(repr(curr["text"]))
+            print("-" * 60)
+            continue
+
         context = build_context(data, i, window=window)
 
         label = predict_boundary_with_llm(context)
@@ -120,23 +120,183 @@ FLUSH_TRIGGER_TYPES = {
 }
 
 import re
-from typing import List, Dict
+from typing import List, Dict, Iterator
+
+MD_TOKEN_PATTERNS = [
+    ('code_block', r'\n```[\s\S]*?```'),
+    ('header', r'^(#{1,6}\s[^\n]*|<h[1-6][^>]*>.*?</h[1-6]>)'),
+    ('section_boundary', r'<-SectionBoundary->'),
+    ('list_item', r'^[ \t]*([-*+]|\d+\.)\s[^\n]*'),
+    ('html_br', r'<br\s*/?>'),
+    ('newline', r'\n'),
+    ('sentence', r'[^ \n].*?(?:[.!?]|다\.)(?=\s|$)')
+]
+
+MD_TOKEN_REGEX = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in MD_TOKEN_PATTERNS),
+    re.MULTILINE
+)
+
+def iter_md_tokens_regex(md: str) -> Iterator[Tuple[int, int, str]]:
+    """MD_TOKEN_REGEX 기반 토큰화 (start, end, type)"""
+    for match in MD_TOKEN_REGEX.finditer(md):
+        yield match.start(), match.end(), match.lastgroup
+
+
+SECTION_BOUNDARY_TEXT = '<-SectionBoundary->'
+
+# 선형 스캐너용 보조 패턴 (중첩 수량자 없음 → 역추적 없음)
+_FENCE = re.compile(r'```')
+_TAG_END = re.compile(r'>')
+_HEADER_CLOSE_OR_NEWLINE = re.compile(r'</h[1-6]>|\n')
+_TERMINATOR_OR_NEWLINE = re.compile(r'[.!?](?=\s|\Z)|\n')
+_MIDLINE_CANDIDATE = re.compile(r'[<\n]')
+
+
+class _ForwardSearch:
+    """
+    시작 위치가 단조 증가하는 검색의 결과 캐시
+    search(i) 결과가 위치 stop 의 매치라면 [i, stop] 구간의 어떤 시작 위치로 검색해도 같은 결과이므로
+    같은 구간을 다시 훑지 않는다. (닫히지 않은 ``` 등이 반복될 때 O(n^2) 방지)
+    """
+
+    def __init__(self, md: str, pattern: re.Pattern):
+        self.md = md
+        self.pattern = pattern
+        self.start, self.stop = 1, 0
+        self.match = None
+
+    def search(self, i: int):
+        if not (self.start <= i <= self.stop):
+            self.match = self.pattern.search(self.md, i)
+            self.start = i
+            self.stop = self.match.start() if self.match else len(self.md)
+        return self.match
+
+
+def iter_md_tokens_linear(md: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    MD_TOKEN_REGEX 와 같은 토큰을 선형 시간에 생성 (start, end, type)
+
+    각 위치에서 MD_TOKEN_PATTERNS 순서대로 시도하는 것은 동일하고,
+    실패하는 시도가 텍스트를 다시 훑지 않도록 _ForwardSearch 로 검색 결과를 재사용한다.
+    - \s / \d 는 re 와 같은 str.isspace() / str.isdecimal() 기준
+    - sentence 의 `다\.` 는 `[.!?]` 로 끝나는 위치가 같으므로 별도 처리 불필요
+    """
+    n = len(md)
+    fence = _ForwardSearch(md, _FENCE)
+    tag_end = _ForwardSearch(md, _TAG_END)
+    header_close = _ForwardSearch(md, _HEADER_CLOSE_OR_NEWLINE)
+    terminator = _ForwardSearch(md, _TERMINATOR_OR_NEWLINE)
+
+    def line_end(i: int) -> int:
+        nl = md.find('\n', i)
+        return n if nl == -1 else nl
+
+    def match_header(p: int) -> int:
+        ch = md[p]
+        if ch == '#':
+            k = 0
+            while p + k < n and md[p + k] == '#' and k < 7:
+                k += 1
+            if k <= 6 and p + k < n and md[p + k].isspace():
+                return line_end(p + k + 1)
+        elif ch == '<' and md.startswith('<h', p) and p + 2 < n and md[p + 2] in '123456':
+            gt = tag_end.search(p + 3)
+            if gt:
+                close = header_close.search(gt.end())
+                if close and close.group() != '\n':
+                    return close.end()
+        return -1
+
+    def match_list_item(p: int) -> int:
+        q = p
+        while q < n and md[q] in ' \t':
+            q += 1
+        if q >= n:
+            return -1
+        if md[q] in '-*+':
+            r = q + 1
+        elif md[q].isdecimal():
+            r = q
+            while r < n and md[r].isdecimal():
+                r += 1
+            if r >= n or md[r] != '.':
+                return -1
+            r += 1
+        else:
+            return -1
+        if r < n and md[r].isspace():
+            return line_end(r + 1)
+        return -1
+
+    def match_html_br(p: int) -> int:
+        q = p + 3
+        while q < n and md[q].isspace():
+            q += 1
+        if q < n and md[q] == '>':
+            return q + 1
+        if q + 1 < n and md[q] == '/' and md[q + 1] == '>':
+            return q + 2
+        return -1
+
+    p = 0
+    while p < n:
+        ch = md[p]
+        at_line_start = p == 0 or md[p - 1] == '\n'
+        end, group = -1, None
+
+        if ch == '\n' and md.startswith('```', p + 1):
+            close = fence.search(p + 4)
+            if close:
+                end, group = close.end(), 'code_block'
+
+        if end == -1 and at_line_start:
+            end, group = match_header(p), 'header'
+
+        if end == -1 and md.startswith(SECTION_BOUNDARY_TEXT, p):
+            end, group = p + len(SECTION_BOUNDARY_TEXT), 'section_boundary'
+
+        if end == -1 and at_line_start:
+            end, group = match_list_item(p), 'list_item'
+
+        if end == -1 and md.startswith('<br', p):
+            end, group = match_html_br(p), 'html_br'
+
+        if end == -1 and ch == '\n':
+            end, group = p + 1, 'newline'
+
+        if end == -1 and ch != ' ':
+            term = terminator.search(p + 1)
+            if term and term.group() != '\n':
+                end, group = term.end(), 'sentence'
+            else:
+                # 줄 끝까지 종결 부호가 없으므로 sentence 는 이 줄 어디서도 실패
+                # → 줄 중간에서 매치 가능한 '<'(section_boundary, html_br) 또는 줄바꿈까지 건너뜀
+                nxt = _MIDLINE_CANDIDATE.search(md, p + 1)
+                p = nxt.start() if nxt else n
+                continue
+
+        if end == -1:
+            p += 1
+            continue
+
+        yield p, end, group
+        p = end
+
+
+MD_SCANNERS = {
+    "regex": iter_md_tokens_regex,
+    "linear": iter_md_tokens_linear,
+}
 
-def parsing_md_sentence(md: str, masking_path=None) -> List[Dict]:
-    patterns = [
-        ('code_block', r'\n```[\s\S]*?```'),
-        ('header', r'^(#{1,6}\s[^\n]*|<h[1-6][^>]*>.*?</h[1-6]>)'),
-        ('section_boundary', r'<-SectionBoundary->'),
-        ('list_item', r'^[ \t]*([-*+]|\d+\.)\s[^\n]*'),
-        ('html_br', r'<br\s*/?>'),
-        ('newline', r'\n'),
-        ('sentence', r'[^ \n].*?(?:[.!?]|다\.)(?=\s|$)')
-    ]
-
-    master_regex = re.compile(
-        '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns),
-        re.MULTILINE
-    )
+def parsing_md_sentence(md: str, masking_path=None, scanner: str = "linear") -> List[Dict]:
+    """
+    scanner : "linear" (기본, 역추적 없는 스캐너) | "regex" (기존 MD_TOKEN_REGEX)
+    두 스캐너는 같은 청크를 생성한다 (benchmark_parsing.py 로 검증)
+    """
+    if scanner not in MD_SCANNERS:
+        raise ValueError(f"unknown scanner: {scanner} (choose from {list(MD_SCANNERS)})")
 
     chunks = []
     buffer_text = []
@@ -168,8 +328,7 @@ def parsing_md_sentence(md: str, masking_path=None) -> List[Dict]:
         buffer_text.clear()
         buffer_links.clear()
 
-    for match in master_regex.finditer(md):
-        start, end = match.span()
+    for start, end, group in MD_SCANNERS[scanner](md):
 
         # 패턴 사이 일반 텍스트
         if start > last_idx:
@@ -180,8 +339,7 @@ def parsing_md_sentence(md: str, masking_path=None) -> List[Dict]:
             buffer_text.append(masked)
             buffer_links.extend(links)
 
-        group = match.lastgroup
-        raw = match.group(group)
+        raw = md[start:end]
 
         masked, links, url_counter = mask_links(
             raw, url_registry, url_counter, masking_path
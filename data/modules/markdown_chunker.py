@@ -0,0 +1,138 @@
+"""
+사용법 참고:
+
+backend/common/markdown_chunker.py 의 헤더 파싱 / 헤더 단위 span 생성 부분 복사본.
+data/ 파이프라인은 backend 없이 단독으로 실행되므로 sys.path 조작 대신 필요한 부분만 둔다.
+    (seq, start, end, header_path) - text[start:end] 가 청크 내용
+
+원본과 결과가 같아야 한다 (backend/tests/test_markdown_chunker_parity.py 가 비교).
+원본을 수정하면 이 파일도 함께 수정한다.
+"""
+
+import re
+from typing import Iterator, Optional
+
+# (seq, start, end, header_path)
+Span = tuple[int, int, int, str]
+
+# 헤더/코드 펜스 후보 줄 (줄 앞 공백 허용, 줄바꿈은 넘지 않음)
+_CANDIDATE_LINE = re.compile(r"^[^\S\n]*(?:#{1,6}\s|<h[1-6]|```)", re.MULTILINE | re.IGNORECASE)
+_NON_SPACE = re.compile(r"\S")
+
+
+def clean_header_text(text: str) -> str:
+    # HTML 태그 제거
+    text = re.sub(r"<[^>]+>", "", text)
+
+    # Markdown 강조 제거
+    text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+    text = re.sub(r"\*(.*?)\*", r"\1", text)
+    text = re.sub(r"__(.*?)__", r"\1", text)
+    text = re.sub(r"_(.*?)_", r"\1", text)
+
+    return text.strip()
+
+
+def parse_markdown_header(text: str) -> Optional[tuple[int, str]]:
+    """
+    마크다운 헤더(#, ##, ### ...)를 파싱
+    반환:
+      - (depth, header_text)
+      - 헤더가 아니면 None
+    """
+    text = text.strip()
+
+    md_match = re.match(r"^(#{1,6})\s+(.*)", text)
+    if md_match:
+        depth = len(md_match.group(1))
+        header_text = md_match.group(2)
+
+        header_text = clean_header_text(header_text)
+        return depth, header_text
+
+    html_match = re.match(
+        r"^<h([1-6])[^>]*>(.*?)</h\1>",
+        text,
+        flags=re.IGNORECASE
+    )
+    if html_match:
+        depth = int(html_match.group(1))
+        header_text = html_match.group(2)
+
+        header_text = clean_header_text(header_text)
+        return depth, header_text
+
+    return None
+
+
+def format_header_path(headers: dict[int, str]) -> str:
+    return "/" + "/".join(headers[d] for d in sorted(headers))
+
+
+def _apply_header(headers: dict[int, str], depth: int, header_text: str):
+    # 현재 depth 의 헤더 갱신 후 하위 depth 제거
+    headers[depth] = header_text
+    for d in list(headers.keys()):
+        if d > depth:
+            del headers[d]
+
+
+def _iter_header_lines(text: str, start: int, end: int) -> Iterator[tuple[int, int, str]]:
+    """[start, end) 에서 코드 블록 밖의 헤더 줄 (line_start, depth, header_text)"""
+    in_code_block = False
+    for match in _CANDIDATE_LINE.finditer(text, start, end):
+        line_start = match.start()
+        line_end = text.find("\n", line_start, end)
+        line = text[line_start: end if line_end == -1 else line_end]
+
+        if line.lstrip().startswith("```"):
+            in_code_block = not in_code_block
+            continue
+        if in_code_block:
+            continue
+
+        parsed = parse_markdown_header(line)
+        if parsed:
+            yield line_start, parsed[0], parsed[1]
+
+
+def _iter_spans_with_state(
+    text: str,
+    start: int,
+    end: int,
+    headers: dict[int, str],
+    seq_start: int,
+) -> Iterator[tuple[Span, dict[int, str]]]:
+    """(span, span 끝 시점의 헤더 상태) - 상태 dict 는 갱신되므로 필요하면 복사해서 사용"""
+    seq = seq_start
+    chunk_start = start
+
+    for line_start, depth, header_text in _iter_header_lines(text, start, end):
+        # 공백뿐인 머리말은 별도 청크로 만들지 않음
+        if line_start > chunk_start and _NON_SPACE.search(text, chunk_start, line_start):
+            yield (seq, chunk_start, line_start, format_header_path(headers)), headers
+            seq += 1
+            chunk_start = line_start
+
+        _apply_header(headers, depth, header_text)
+
+    if end > chunk_start and _NON_SPACE.search(text, chunk_start, end):
+        yield (seq, chunk_start, end, format_header_path(headers)), headers
+
+
+def iter_markdown_spans(
+    text: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    headers: Optional[dict[int, str]] = None,
+    seq_start: int = 0,
+) -> Iterator[Span]:
+    """
+    text[start:end] 를 헤더 단위로 나눈 span 을 순서대로 생성
+
+    start 는 청크 경계(헤더 줄 시작 또는 문서 시작)여야 하며,
+    headers 로 start 이전의 헤더 상태를 넘기면 header_path 가 이어진다.
+    """
+    end = len(text) if end is None else end
+    for span, _ in _iter_spans_with_state(text, start, end, dict(headers or {}), seq_start):
+        yield span
@@ -0,0 +1,100 @@
+-- =================================================================
+-- model_logs : task_id / (task_type_code, created_at) 인덱스 + created_at 월별 range 파티션
+--
+-- 1) 기존 model_logs 를 model_logs_legacy 로 이름 변경
+-- 2) 같은 컬럼의 파티션 테이블 생성 (PK 는 파티션 키 포함 (log_seq, created_at))
+-- 3) 기존 데이터 기간 ~ 현재 + 3개월 월별 파티션 + default 파티션 생성
+-- 4) 인덱스 생성 (부모 테이블 인덱스 → 모든 파티션에 자동 생성)
+-- 5) 데이터 복사, 시퀀스 소유권 이전
+--
+-- 실행: psql -v ON_ERROR_STOP=1 -f database/migrations/001_model_logs_indexes_partitioning.sql
+-- 검증 후 model_logs_legacy 삭제 (맨 아래 주석)
+-- 이후 파티션 생성/보존 기간 정리는 backend/jobs/model_logs_retention.py 가 담당
+-- =================================================================
+
+BEGIN;
+
+ALTER TABLE model_logs RENAME TO model_logs_legacy;
+ALTER INDEX IF EXISTS model_logs_pkey RENAME TO model_logs_legacy_pkey;
+ALTER INDEX IF EXISTS ix_model_logs_log_seq RENAME TO ix_model_logs_legacy_log_seq;
+
+CREATE TABLE model_logs (
+    log_seq        INTEGER     NOT NULL DEFAULT nextval('model_logs_log_seq_seq'),
+    operator_seq   INTEGER     REFERENCES users (user_seq),
+    team_seq       INTEGER     REFERENCES teams (team_seq),
+    task_type_code VARCHAR(50) NOT NULL,
+    task_id        UUID,
+    input_data     JSONB,
+    ai_output      JSONB,
+    user_decision  JSONB,
+    created_at     TIMESTAMP   NOT NULL DEFAULT now(),
+    PRIMARY KEY (log_seq, created_at)
+) PARTITION BY RANGE (created_at);
+
+COMMENT ON TABLE model_logs IS 'sLLM 파인튜닝을 위한 AI-사용자 상호작용 로그';
+-- 테이블을 새로 만들었으므로 기존 컬럼 설명도 다시 적용 (common/models.py ModelLog 와 동일)
+COMMENT ON COLUMN model_logs.log_seq IS '로그 고유 식별자 (Sequence)';
+COMMENT ON COLUMN model_logs.operator_seq IS '작업을 수행한 사용자 식별자';
+COMMENT ON COLUMN model_logs.team_seq IS '작업이 수행된 팀 식별자';
+COMMENT ON COLUMN model_logs.task_type_code IS '작업 유형 common_code code_group llm_task_type';
+COMMENT ON COLUMN model_logs.task_id IS 'task_id (uuid)';
+COMMENT ON COLUMN model_logs.input_data IS 'AI 모델에 입력된 프롬프트 또는 데이터 (JSON)';
+COMMENT ON COLUMN model_logs.ai_output IS 'AI 모델이 반환한 결과 데이터 (JSON)';
+COMMENT ON COLUMN model_logs.user_decision IS '사용자의 최종 수정/승인 데이터 (학습 레이블용)';
+
+-- 월별 파티션 model_logs_pYYYYMM 생성 (from_month ~ 현재 + months_ahead 개월, 이미 있으면 건너뜀)
+CREATE OR REPLACE FUNCTION model_logs_ensure_partitions(from_month DATE, months_ahead INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::DATE;
+    last_month  DATE := (date_trunc('month', now()) + make_interval(months => months_ahead))::DATE;
+    part_name   TEXT;
+    created     INTEGER := 0;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        part_name := 'model_logs_p' || to_char(month_start, 'YYYYMM');
+        IF to_regclass(part_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF model_logs FOR VALUES FROM (%L) TO (%L)',
+                part_name, month_start, (month_start + INTERVAL '1 month')::DATE
+            );
+            created := created + 1;
+        END IF;
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT model_logs_ensure_partitions(
+    COALESCE((SELECT min(created_at) FROM model_logs_legacy), now())::DATE,
+    3
+);
+
+-- 범위 밖(미래 파티션 미생성 등) 데이터 수용
+CREATE TABLE model_logs_default PARTITION OF model_logs DEFAULT;
+
+-- /tasks/{id}/detail, 워커의 get_by_task_id
+CREATE INDEX ix_model_logs_task_id ON model_logs (task_id);
+-- 작업 유형별 기간 조회 (내보내기/통계)
+CREATE INDEX ix_model_logs_task_type_created_at ON model_logs (task_type_code, created_at);
+
+INSERT INTO model_logs (
+    log_seq, operator_seq, team_seq, task_type_code, task_id,
+    input_data, ai_output, user_decision, created_at
+)
+SELECT
+    log_seq, operator_seq, team_seq, task_type_code, task_id,
+    input_data, ai_output, user_decision, created_at
+FROM model_logs_legacy;
+
+ALTER TABLE model_logs_legacy ALTER COLUMN log_seq DROP DEFAULT;
+ALTER SEQUENCE model_logs_log_seq_seq OWNED BY model_logs.log_seq;
+
+COMMIT;
+
+ANALYZE model_logs;
+
+-- 건수/샘플 비교 후 삭제
+-- SELECT (SELECT count(*) FROM model_logs) AS new_rows, (SELECT count(*) FROM model_logs_legacy) AS legacy_rows;
+-- DROP TABLE model_logs_legacy;
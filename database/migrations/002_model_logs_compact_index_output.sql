@@ -0,0 +1,160 @@
+-- =================================================================
+-- model_logs DOC_INDEX 결과 compact 형식 backfill
+--
+-- ai_output 섹션의 original_text 를 제거하고 input_data(원문) 의 (start, end) 오프셋만 남긴다.
+-- 조회 시 /tasks/{id}/detail?include_text=true 로 복원 (common/index_output.py).
+--
+-- 이전 형식 섹션(seq/index/essence/original_text/reasoning, 오프셋 없음)은 섹션 순서대로
+-- 원문에서 original_text 를 찾아(strpos, 앞 섹션이 끝난 위치부터) start/end 를 만든다.
+--   - 이미 start/end 가 있고 원문 부분 문자열과 같으면 그 오프셋 사용
+--   - start/end 가 있지만 원문과 맞지 않으면 섹션을 그대로 둠 (오프셋을 덮어쓰지 않음)
+--   - 원문에서 정확히 같은 문자열을 찾지 못한 섹션은 original_text 를 그대로 둠
+-- 마지막으로 expand_index_output 과 같은 규칙(0 <= start <= end <= 길이, 부분 문자열 완전 일치)으로
+-- 행 전체를 복원해 보고, 원래 섹션과 하나라도 다르면 그 행은 바꾸지 않는다.
+--
+-- log_seq 1000 건 단위로 나눠 커밋 (긴 트랜잭션/WAL 급증 방지)
+-- 실행: psql -v ON_ERROR_STOP=1 -f database/migrations/002_model_logs_compact_index_output.sql
+--       (DO 블록 안에서 COMMIT 하므로 트랜잭션 블록 밖에서 실행)
+-- =================================================================
+
+-- 섹션 하나의 오프셋이 원문과 정확히 일치하는지 (common/index_output.py _restorable 과 같은 규칙)
+CREATE OR REPLACE FUNCTION model_logs_offsets_match(section JSONB, source TEXT, piece TEXT)
+RETURNS BOOLEAN AS $$
+    -- AND 는 평가 순서가 보장되지 않으므로 형식 검사 후 CASE 안에서 변환
+    SELECT CASE
+        WHEN jsonb_typeof(section -> 'start') = 'number'
+            AND jsonb_typeof(section -> 'end') = 'number'
+            AND (section ->> 'start') ~ '^\d{1,9}$'
+            AND (section ->> 'end') ~ '^\d{1,9}$'
+        THEN (section ->> 'start')::INTEGER <= (section ->> 'end')::INTEGER
+            AND (section ->> 'end')::INTEGER <= length(source)
+            AND substr(
+                source,
+                (section ->> 'start')::INTEGER + 1,
+                (section ->> 'end')::INTEGER - (section ->> 'start')::INTEGER
+            ) = piece
+        ELSE FALSE
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION model_logs_compact_sections(sections JSONB, source TEXT)
+RETURNS JSONB AS $$
+DECLARE
+    compacted  JSONB := '[]'::JSONB;
+    section    JSONB;
+    piece      TEXT;
+    search_pos INTEGER := 1;  -- 다음 섹션을 찾기 시작할 위치 (1부터)
+    found      INTEGER;
+    s_start    INTEGER;
+    s_end      INTEGER;
+BEGIN
+    FOR section IN
+        SELECT item FROM jsonb_array_elements(sections) WITH ORDINALITY AS t(item, position) ORDER BY position
+    LOOP
+        IF jsonb_typeof(section) <> 'object' OR jsonb_typeof(section -> 'original_text') IS DISTINCT FROM 'string' THEN
+            compacted := compacted || jsonb_build_array(section);
+            CONTINUE;
+        END IF;
+        piece := section ->> 'original_text';
+
+        IF model_logs_offsets_match(section, source, piece) THEN
+            -- 이미 올바른 오프셋이 있는 섹션
+            search_pos := (section ->> 'end')::INTEGER + 1;
+            compacted := compacted || jsonb_build_array(section - 'original_text');
+            CONTINUE;
+        END IF;
+        IF section ? 'start' OR section ? 'end' THEN
+            -- 원문과 맞지 않는 오프셋은 덮어쓰지 않음 (증분 청킹이 사용하는 값)
+            compacted := compacted || jsonb_build_array(section);
+            CONTINUE;
+        END IF;
+
+        found := strpos(substr(source, search_pos), piece);
+        IF piece = '' OR found = 0 THEN
+            -- 원문에서 찾지 못함 → original_text 유지
+            compacted := compacted || jsonb_build_array(section);
+            CONTINUE;
+        END IF;
+
+        s_start := search_pos + found - 2;  -- 0부터 시작하는 오프셋
+        s_end := s_start + length(piece);
+        search_pos := s_end + 1;
+        compacted := compacted || jsonb_build_array(
+            (section - 'original_text') || jsonb_build_object('start', s_start, 'end', s_end)
+        );
+    END LOOP;
+    RETURN compacted;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- compact 섹션을 expand_index_output 과 같은 규칙으로 복원했을 때 원래 섹션과 같은지
+-- (원래 오프셋이 없던 섹션은 새로 붙인 start/end 를 빼고 비교)
+CREATE OR REPLACE FUNCTION model_logs_compact_verified(original JSONB, compacted JSONB, source TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT jsonb_array_length(original) = jsonb_array_length(compacted)
+        AND NOT EXISTS (
+            SELECT 1
+            FROM jsonb_array_elements(original) WITH ORDINALITY AS o(section, position)
+            JOIN jsonb_array_elements(compacted) WITH ORDINALITY AS c(section, position) USING (position)
+            WHERE CASE
+                WHEN jsonb_typeof(c.section) = 'object'
+                    AND NOT c.section ? 'original_text'
+                    AND jsonb_typeof(o.section) = 'object'
+                    AND jsonb_typeof(o.section -> 'original_text') = 'string'
+                THEN NOT (
+                    model_logs_offsets_match(c.section, source, o.section ->> 'original_text')
+                    AND CASE
+                        WHEN o.section ? 'start' OR o.section ? 'end'
+                        THEN o.section = (c.section || jsonb_build_object('original_text', o.section -> 'original_text'))
+                        ELSE o.section = ((c.section - 'start' - 'end')
+                            || jsonb_build_object('original_text', o.section -> 'original_text'))
+                    END
+                )
+                ELSE o.section IS DISTINCT FROM c.section
+            END
+        );
+$$ LANGUAGE sql IMMUTABLE;
+
+DO $$
+DECLARE
+    batch_size CONSTANT INTEGER := 1000;
+    last_seq   INTEGER := 0;
+    max_seq    INTEGER;
+    updated    INTEGER;
+    total      INTEGER := 0;
+BEGIN
+    SELECT COALESCE(max(log_seq), 0) INTO max_seq FROM model_logs WHERE task_type_code = 'DOC_INDEX';
+
+    WHILE last_seq < max_seq LOOP
+        UPDATE model_logs AS m
+        SET ai_output = c.compacted
+        FROM (
+            SELECT log_seq, created_at, ai_output,
+                   model_logs_compact_sections(ai_output, input_data #>> '{}') AS compacted,
+                   input_data #>> '{}' AS source
+            FROM model_logs
+            WHERE task_type_code = 'DOC_INDEX'
+              AND log_seq > last_seq
+              AND log_seq <= last_seq + batch_size
+              AND jsonb_typeof(ai_output) = 'array'
+              AND jsonb_typeof(input_data) = 'string'
+              AND jsonb_path_exists(ai_output, '$[*].original_text')
+        ) AS c
+        WHERE m.log_seq = c.log_seq
+          AND m.created_at = c.created_at
+          AND c.compacted IS DISTINCT FROM c.ai_output
+          AND model_logs_compact_verified(c.ai_output, c.compacted, c.source);
+        GET DIAGNOSTICS updated = ROW_COUNT;
+
+        total := total + updated;
+        last_seq := last_seq + batch_size;
+        COMMIT;
+    END LOOP;
+
+    RAISE NOTICE 'compact backfill: % rows', total;
+END;
+$$;
+
+DROP FUNCTION model_logs_compact_verified(JSONB, JSONB, TEXT);
+DROP FUNCTION model_logs_compact_sections(JSONB, TEXT);
+DROP FUNCTION model_logs_offsets_match(JSONB, TEXT, TEXT);
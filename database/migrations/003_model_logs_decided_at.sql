@@ -0,0 +1,43 @@
+-- =================================================================
+-- model_logs.decided_at : user_decision 이 마지막으로 바뀐 시각
+--
+-- 증분 내보내기(backend/jobs/export_model_logs.py)가 이미 내보낸 행(log_seq <= last_log_seq) 중
+-- 이후에 user_decision 이 저장/수정된 행을 다시 내보내는 데 사용한다.
+--   - INSERT/UPDATE 시 user_decision 이 바뀌면 트리거가 decided_at = now() 로 설정
+--   - 기존에 user_decision 이 있는 행은 마이그레이션 시각으로 채움
+--     → 다음 내보내기에서 한 번 다시 내보내짐 (소비 측은 log_seq 별 마지막 행 사용)
+--
+-- 파티션 테이블의 BEFORE ROW 트리거는 PostgreSQL 13 이상 필요
+-- 실행: psql -v ON_ERROR_STOP=1 -f database/migrations/003_model_logs_decided_at.sql
+-- =================================================================
+
+BEGIN;
+
+ALTER TABLE model_logs ADD COLUMN IF NOT EXISTS decided_at TIMESTAMP;
+COMMENT ON COLUMN model_logs.decided_at IS 'user_decision 최종 변경 시각 (증분 내보내기용)';
+
+CREATE OR REPLACE FUNCTION model_logs_set_decided_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.user_decision IS NOT NULL THEN
+            NEW.decided_at := now();
+        END IF;
+    ELSIF NEW.user_decision IS DISTINCT FROM OLD.user_decision THEN
+        NEW.decided_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_model_logs_decided_at ON model_logs;
+CREATE TRIGGER trg_model_logs_decided_at
+    BEFORE INSERT OR UPDATE OF user_decision ON model_logs
+    FOR EACH ROW EXECUTE FUNCTION model_logs_set_decided_at();
+
+UPDATE model_logs SET decided_at = now() WHERE user_decision IS NOT NULL AND decided_at IS NULL;
+
+-- 부모 테이블 인덱스 → 모든 파티션에 자동 생성
+CREATE INDEX IF NOT EXISTS ix_model_logs_decided_at ON model_logs (decided_at) WHERE decided_at IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,115 @@
+"""
+OpenAI 호환 추론 서버 스텁 (vLLM/TGI 대용, 개발·테스트용)
+
+AI 서버를 INFERENCE_BACKEND=openai 로 띄울 때 실제 모델 서버 없이 연결/동시성/스트리밍을 확인한다.
+    GET  /v1/models
+    POST /v1/completions   (prompt: str | list[str], stream 지원)
+    POST /v1/embeddings    (input: str | list[str], 텍스트 해시 기반 384차원 벡터)
+
+응답 텍스트는 고정 JSON 이며, --delay 로 요청당 지연(모델 추론 시간)을 흉내낸다.
+
+실행:
+    python vLLM/stub_server.py --port 8001 --delay 0.05
+    # AI 서버 .env
+    INFERENCE_BACKEND=openai
+    INFERENCE_BASE_URL=http://localhost:8001/v1
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI(title="OpenAI-compatible stub")
+app.state.delay = 0.0
+
+EMBEDDING_DIM = 384
+
+
+def _completion_text(prompt: str) -> str:
+    if prompt.rstrip().endswith("JSON:"):
+        return json.dumps(
+            {"index": "스텁.색인", "essence": "스텁 요약", "reasoning": "스텁 응답"},
+            ensure_ascii=False,
+        )
+    return json.dumps({"title": "stub", "content": prompt[-40:]}, ensure_ascii=False)
+
+
+def _embedding(text: str) -> list[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [(digest[i % len(digest)] - 128) / 128 for i in range(EMBEDDING_DIM)]
+
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+
+
+@app.post("/v1/completions")
+async def completions(request: Request):
+    body = await request.json()
+    prompts = body.get("prompt") or ""
+    prompts = prompts if isinstance(prompts, list) else [prompts]
+    max_tokens = int(body.get("max_tokens") or 16)
+    created = int(time.time())
+
+    texts = []
+    for prompt in prompts:
+        words = _completion_text(prompt).split(" ")
+        texts.append(" ".join(words[:max_tokens]))
+
+    if body.get("stream"):
+        async def events():
+            for word_index, word in enumerate(texts[0].split(" ")):
+                await asyncio.sleep(app.state.delay / 10)
+                piece = word if word_index == 0 else " " + word
+                chunk = {"object": "text_completion", "created": created,
+                         "choices": [{"index": 0, "text": piece, "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    await asyncio.sleep(app.state.delay)
+    completion_tokens = sum(len(text.split(" ")) for text in texts)
+    return {
+        "object": "text_completion",
+        "created": created,
+        "model": body.get("model"),
+        "choices": [
+            {"index": i, "text": text, "finish_reason": "stop"} for i, text in enumerate(texts)
+        ],
+        "usage": {"completion_tokens": completion_tokens},
+    }
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    inputs = body.get("input") or []
+    inputs = inputs if isinstance(inputs, list) else [inputs]
+    await asyncio.sleep(app.state.delay)
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": _embedding(text)}
+            for i, text in enumerate(inputs)
+        ],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--delay", type=float, default=0.0, help="요청당 지연(초)")
+    args = parser.parse_args()
+
+    app.state.delay = args.delay
+    uvicorn.run(app, host=args.host, port=args.port)